@@ -3,19 +3,37 @@ import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
 
+from app.services.instrumentation import statement_metric, timed
+
 DB_ENV = "HYDROX_DB_PATH"
 DEFAULT_DB = "/data/hydrox.db"
+SCHEMA_VERSION = 2
 
 
 def db_path() -> str:
     return os.getenv(DB_ENV, DEFAULT_DB)
 
 
+class InstrumentedConnection(sqlite3.Connection):
+    def execute(self, sql, parameters=()):
+        with timed(statement_metric(sql)):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        with timed(statement_metric(sql)):
+            return super().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        with timed("db.commit"):
+            super().commit()
+
+
 @contextmanager
 def get_connection():
     path = db_path()
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(path)
+    with timed("db.connect"):
+        conn = sqlite3.connect(path, factory=InstrumentedConnection)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -25,6 +43,8 @@ def get_connection():
 
 def init_db() -> None:
     with get_connection() as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS metrics (
@@ -157,6 +177,49 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS host_readings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                series TEXT NOT NULL,
+                value REAL NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_series (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                last_value REAL,
+                last_seen_at TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_readings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                series_id INTEGER NOT NULL,
+                value REAL NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fan_calibration (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel_index INTEGER NOT NULL,
+                duty INTEGER NOT NULL,
+                rpm INTEGER NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(channel_index, duty)
+            )
+            """
+        )
         _ensure_column(conn, "fan_channels", "active", "INTEGER NOT NULL DEFAULT 1")
         _ensure_column(conn, "fan_channels", "max_rpm", "INTEGER")
         _ensure_column(conn, "screens", "title_template", "TEXT")
@@ -167,6 +230,22 @@ def init_db() -> None:
         _ensure_column(conn, "screens", "value_font_size", "INTEGER")
         _ensure_column(conn, "sensors", "unit", "TEXT NOT NULL DEFAULT 'C'")
         _ensure_column(conn, "sensors", "active", "INTEGER NOT NULL DEFAULT 1")
+        _ensure_column(conn, "profiles", "revision", "INTEGER NOT NULL DEFAULT 1")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_created_at ON metrics(created_at)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fan_readings_channel_created ON fan_readings(channel_index, created_at)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cpu_fan_readings_created_at ON cpu_fan_readings(created_at)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sensor_readings_sensor_created ON sensor_readings(sensor_id, created_at)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_host_readings_series_created ON host_readings(series, created_at)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingest_readings_series_created ON ingest_readings(series_id, created_at)"
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
 
 
@@ -1,20 +1,22 @@
-import json
+import sys
 import threading
 import time
+from typing import TYPE_CHECKING
 
 from fastapi import FastAPI, Form, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
 from app.db import get_connection, init_db
+from app.services.assets import AssetFiles, CompressionMiddleware, asset_url, build_assets
 from app.services.fan_metrics import (
     latest_fan_readings,
     recent_cpu_fan_readings,
-    recent_fan_readings,
 )
 from app.services.fans import (
     list_fans,
+    replace_fan_calibration,
     reset_fan_name_to_default,
     seed_fans_if_empty,
     set_fan_name_by_channel,
@@ -22,43 +24,69 @@ from app.services.fans import (
     update_fan_settings,
 )
 from app.services.git_info import get_git_status
-from app.services.liquidctl import has_liquidctl_devices, set_fan_speed
+from app.services.governor import governor_status, shutdown_governor, start_governor, under_pressure
+from app.services.host_metrics import recent_host_readings, shutdown_host_metrics
+from app.services.ingest import MAX_BODY_BYTES, body_format, ingest_body, list_ingest_series, recent_ingest_readings
+from app.services.instrumentation import snapshot as performance_snapshot
+from app.services.control import (
+    PUMP_MAX_RPM,
+    PUMP_MIN_RPM,
+    get_control_engine,
+    pump_min_percent,
+    shutdown_control_engine,
+    start_control_engine,
+)
+from app.services.curves import available_inputs
+from app.services.liquidctl import get_fan_rpms, set_fan_speed
 from app.services.logger import get_logger, now_local
 from app.services.metrics import (
+    insert_metrics,
     latest_metrics,
     recent_metrics,
     seed_metrics_if_empty,
 )
-from app.services.oled import ensure_web_fonts, list_font_choices, list_oled_channels
-from app.services.oled_manager import PlaylistScreen, list_token_definitions, start_oled_job, stop_oled_job
+from app.services.oled_config import ensure_web_fonts, list_font_choices, list_oled_channels
+from app.services.oled_templates import compile_template, known_tokens, template_error
+from app.services.profiles import insert_profile, list_profiles, update_profile, validate_profile_json
+from app.services.replay import replay_status, shutdown_replay, submit_replay
+from app.services.schedule import get_schedule_engine, shutdown_schedule_engine, start_schedule_engine
 from app.services.sensors import (
     format_temp,
     latest_sensor_readings,
     list_sensors,
-    recent_sensor_readings,
     seed_sensors_if_empty,
     update_sensor_settings,
 )
 from app.services.settings import (
     get_active_profile_id,
+    get_base_profile_id,
     get_fan_pwm,
     get_fan_count,
     get_pump_channel,
     seed_settings_if_empty,
-    set_active_profile_id,
+    set_base_profile_id,
     set_fan_pwm,
     set_fan_count,
     set_pump_channel,
 )
-from app.services.daemon import start_daemon
-from app.services.system_status import get_status_payload, get_wifi_strength, set_image_start_time
+from app.services.daemon import shutdown_daemon, start_daemon
+from app.services.dashboard import cpu_fan_percent, dashboard_snapshot, fan_percent_history, temperature_history
+from app.services.startup import mark_first_response, mark_ready, run_warmup, startup_phase, startup_report
+from app.services.stream import shutdown_stream, stream_events, stream_status
+from app.services.system_status import (
+    get_status_payload,
+    set_image_start_time,
+    shutdown_status_collector,
+    start_status_collector,
+)
+
+if TYPE_CHECKING:
+    from app.services.oled_manager import PlaylistScreen
 
 app = FastAPI(title="Hydrox Command Center")
 
 _cpu_fan_missing_logged = False
 _ADMIN_PASSWORD = "admin"
-_PUMP_MIN_RPM = 800
-_PUMP_MAX_RPM = 4800
 _calibration_lock = threading.Lock()
 _calibration_state = {
     "running": False,
@@ -67,18 +95,24 @@ _calibration_state = {
     "restore_started_at": 0.0,
     "completed_at": 0.0,
 }
-_CALIBRATION_SECONDS = 20
+_CALIBRATION_DUTIES = (100, 80, 60, 45, 30, 20)
+_CALIBRATION_STEP_SECONDS = 6
+_CALIBRATION_SECONDS = _CALIBRATION_STEP_SECONDS * len(_CALIBRATION_DUTIES)
 _RESTORE_GRACE_SECONDS = 5
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", AssetFiles(directory="app/static"), name="static")
+app.add_middleware(CompressionMiddleware)
 
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
 
 
 @app.middleware("http")
 async def log_exceptions(request: Request, call_next):
     try:
-        return await call_next(request)
+        response = await call_next(request)
+        mark_first_response()
+        return response
     except Exception:
         get_logger().exception("unhandled exception on %s %s", request.method, request.url.path)
         raise
@@ -87,13 +121,15 @@ async def log_exceptions(request: Request, call_next):
 @app.on_event("startup")
 def startup() -> None:
     set_image_start_time(time.time())
-    init_db()
-    seed_settings_if_empty()
-    seed_metrics_if_empty()
-    seed_fans_if_empty()
-    seed_sensors_if_empty()
-    ensure_web_fonts()
-    branch, _ = get_git_status()
+    with startup_phase("init_db"):
+        init_db()
+    with startup_phase("seed"):
+        seed_settings_if_empty()
+        seed_metrics_if_empty()
+        seed_fans_if_empty()
+        seed_sensors_if_empty()
+    with startup_phase("git_status"):
+        branch, _ = get_git_status()
     logger = get_logger()
     logger.info("#######")
     logger.info(
@@ -102,7 +138,34 @@ def startup() -> None:
         branch,
     )
     logger.info("#######")
-    start_daemon()
+    with startup_phase("services"):
+        start_daemon()
+        start_governor()
+        start_status_collector()
+        start_control_engine()
+        start_schedule_engine()
+    mark_ready()
+    run_warmup(
+        [
+            ("web_fonts", ensure_web_fonts),
+            ("assets", build_assets),
+        ]
+    )
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    shutdown_schedule_engine()
+    shutdown_control_engine()
+    shutdown_daemon()
+    shutdown_replay()
+    oled_manager = sys.modules.get("app.services.oled_manager")
+    if oled_manager is not None:
+        oled_manager.shutdown_oled()
+    shutdown_stream()
+    shutdown_status_collector()
+    shutdown_host_metrics()
+    shutdown_governor()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -112,99 +175,106 @@ def root() -> RedirectResponse:
 
 @app.get("/dashboard", response_class=HTMLResponse)
 def dashboard(request: Request):
-    metrics = latest_metrics()
-    cpu_fan_percent = None
-    cpu_fan_rows = recent_cpu_fan_readings(limit=1)
-    if cpu_fan_rows:
-        rpm = cpu_fan_rows[0]["rpm"]
-        cpu_fan_percent = int(max(0, min(100, round(rpm / 8000 * 100))))
-    fans = list_fans(active_only=True)
-    pump_channel = get_pump_channel()
-    if pump_channel is None and metrics:
-        metrics["pump_percent"] = None
-    liquidctl_status = "Connected" if has_liquidctl_devices() else "Not connected"
-    wifi_status = get_wifi_strength()
-    sensors = list_sensors()
-    readings = latest_sensor_readings()
-    sensor_cards = []
-    for sensor in sensors:
-        temp_c = readings.get(sensor["id"])
-        display = format_temp(temp_c, sensor["unit"]) if temp_c is not None else "--"
-        sensor_cards.append(
-            {
-                **sensor,
-                "display": display,
-            }
-        )
     return templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
-            "metrics": metrics,
-            "cpu_fan_percent": cpu_fan_percent,
-            "fans": fans,
-            "pump_channel": pump_channel,
-            "sensors": sensor_cards,
-            "liquidctl_status": liquidctl_status,
-            "wifi_status": wifi_status,
+            "fans": list_fans(active_only=True),
+            "pump_channel": get_pump_channel(),
+            "sensors": list_sensors(),
         },
     )
 
 
+@app.get("/api/dashboard/snapshot")
+def get_dashboard_snapshot(request: Request):
+    etag, body = dashboard_snapshot()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
 @app.get("/profiles", response_class=HTMLResponse)
 def profiles(request: Request):
-    rows = _load_profiles()
-    active_profile_id = get_active_profile_id()
-    return templates.TemplateResponse(
-        "profiles.html",
-        {
-            "request": request,
-            "profiles": [dict(row) for row in rows],
-            "active_profile_id": active_profile_id,
-            "error": None,
-        },
-    )
+    return _profiles_response(request, None)
 
 
 @app.post("/profiles")
 def create_profile(
+    request: Request,
     name: str = Form(...),
     curve_json: str = Form(...),
     schedule_json: str = Form(""),
 ):
-    error = _validate_profile_json(curve_json, schedule_json)
+    error = validate_profile_json(curve_json, schedule_json)
     if error:
-        rows = _load_profiles()
-        active_profile_id = get_active_profile_id()
-        return templates.TemplateResponse(
-            "profiles.html",
-            {
-                "request": request,
-                "profiles": [dict(row) for row in rows],
-                "active_profile_id": active_profile_id,
-                "error": error,
-            },
-        )
-    with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO profiles (name, curve_json, schedule_json)
-            VALUES (?, ?, ?)
-            """,
-            (name, curve_json, schedule_json or None),
-        )
-        conn.commit()
+        return _profiles_response(request, error)
+    insert_profile(name, curve_json, schedule_json)
+    get_schedule_engine().reload()
+    return RedirectResponse("/profiles", status_code=303)
+
+
+@app.post("/profiles/update")
+def update_profile_route(
+    request: Request,
+    profile_id: int = Form(...),
+    name: str = Form(...),
+    curve_json: str = Form(...),
+    schedule_json: str = Form(""),
+):
+    error = validate_profile_json(curve_json, schedule_json)
+    if error:
+        return _profiles_response(request, error)
+    if update_profile(profile_id, name, curve_json, schedule_json) is None:
+        return _profiles_response(request, "Profile not found.")
+    get_schedule_engine().reload()
+    if get_active_profile_id() == profile_id:
+        get_control_engine().reload()
     return RedirectResponse("/profiles", status_code=303)
 
 
 @app.post("/profiles/apply")
 def apply_profile(profile_id: int = Form(...)):
-    set_active_profile_id(profile_id)
+    set_base_profile_id(profile_id)
+    get_schedule_engine().reload(override=profile_id)
     return RedirectResponse("/profiles", status_code=303)
 
 
+@app.get("/api/schedule/upcoming")
+def get_schedule_upcoming(limit: int = 5):
+    engine = get_schedule_engine()
+    return JSONResponse({"current": engine.current(), "upcoming": engine.upcoming(max(1, min(limit, 50)))})
+
+
+@app.post("/api/replay")
+def start_replay(profile_id: int = Form(...), start: str = Form(""), end: str = Form("")):
+    if under_pressure():
+        return JSONResponse(
+            {"ok": False, "error": "Replays are paused while the Pi is under load. Try again shortly."},
+            status_code=503,
+        )
+    try:
+        job_id = submit_replay(profile_id, start, end)
+    except ValueError as exc:
+        return JSONResponse({"ok": False, "error": str(exc)}, status_code=400)
+    return JSONResponse({"ok": True, "job_id": job_id})
+
+
+@app.get("/api/replay/{job_id}")
+def get_replay(job_id: str):
+    status = replay_status(job_id)
+    if status is None:
+        return JSONResponse({"ok": False, "error": "Replay not found."}, status_code=404)
+    return JSONResponse(status)
+
+
 @app.get("/screens", response_class=HTMLResponse)
 def screens(request: Request):
+    return _screens_response(request, None)
+
+
+def _screens_response(request: Request, error: str | None):
     with get_connection() as conn:
         rows = conn.execute(
             """
@@ -244,6 +314,8 @@ def screens(request: Request):
         }
         chains.setdefault(channel, []).append(item)
         chain_ids.setdefault(channel, []).append(row["screen_id"])
+    from app.services.oled_manager import list_token_definitions
+
     return templates.TemplateResponse(
         "screens.html",
         {
@@ -255,6 +327,7 @@ def screens(request: Request):
             "chains": chains,
             "chain_ids": chain_ids,
             "oled_brightness": oled_brightness,
+            "error": error,
         },
     )
 
@@ -302,7 +375,7 @@ def _save_oled_chain(conn, oled_channel: int, screen_ids: list[int]) -> list[int
     return valid_ids
 
 
-def _load_oled_chain(conn, oled_channel: int) -> list[PlaylistScreen]:
+def _load_oled_chain(conn, oled_channel: int) -> "list[PlaylistScreen]":
     rows = conn.execute(
         """
         SELECT s.name, s.title_template, s.value_template, s.message_template,
@@ -315,20 +388,40 @@ def _load_oled_chain(conn, oled_channel: int) -> list[PlaylistScreen]:
         """,
         (oled_channel,),
     ).fetchall()
-    screens: list[PlaylistScreen] = []
-    for row in rows:
-        screens.append(
-            PlaylistScreen(
-                title_template=row["title_template"] or row["name"] or "",
-                value_template=row["value_template"] or row["message_template"] or "",
-                title_font=row["title_font_family"] or row["font_family"] or "DejaVu Sans Mono",
-                value_font=row["value_font_family"] or row["font_family"] or "DejaVu Sans Mono",
-                title_size=int(row["title_font_size"] or 16),
-                value_size=int(row["value_font_size"] or row["font_size"] or 22),
-                rotation_seconds=int(row["rotation_seconds"] or 15),
-            )
-        )
-    return screens
+    return [_playlist_screen(row) for row in rows]
+
+
+def _load_screen(conn, screen_id: int) -> "PlaylistScreen | None":
+    row = conn.execute(
+        """
+        SELECT name, title_template, value_template, message_template,
+               font_family, font_size, title_font_family, value_font_family,
+               title_font_size, value_font_size, rotation_seconds
+        FROM screens
+        WHERE id = ?
+        """,
+        (screen_id,),
+    ).fetchone()
+    return _playlist_screen(row) if row else None
+
+
+def _playlist_screen(row) -> "PlaylistScreen":
+    from app.services.oled_manager import PlaylistScreen
+
+    return PlaylistScreen(
+        title=compile_template(row["title_template"] or row["name"] or ""),
+        value=compile_template(row["value_template"] or row["message_template"] or ""),
+        title_font=row["title_font_family"] or row["font_family"] or "DejaVu Sans Mono",
+        value_font=row["value_font_family"] or row["font_family"] or "DejaVu Sans Mono",
+        title_size=int(row["title_font_size"] or 16),
+        value_size=int(row["value_font_size"] or row["font_size"] or 22),
+        rotation_seconds=int(row["rotation_seconds"] or 15),
+    )
+
+
+def _screen_template_error(title_template: str, value_template: str) -> str | None:
+    known = known_tokens()
+    return template_error(title_template, known) or template_error(value_template, known)
 
 
 def _save_oled_brightness(conn, oled_channel: int, brightness_percent: int) -> None:
@@ -362,6 +455,7 @@ def _load_oled_brightness(conn, oled_channel: int) -> int:
 
 @app.post("/screens")
 def create_screen(
+    request: Request,
     name: str = Form(...),
     title_template: str = Form(...),
     value_template: str = Form(...),
@@ -372,6 +466,9 @@ def create_screen(
     rotation_seconds: int = Form(15),
     tag: str = Form(""),
 ):
+    error = _screen_template_error(title_template, value_template)
+    if error:
+        return _screens_response(request, error)
     with get_connection() as conn:
         conn.execute(
             """
@@ -414,6 +511,8 @@ def publish_oled_chain(
         conn.commit()
         screens = _load_oled_chain(conn, oled_channel)
         brightness = _load_oled_brightness(conn, oled_channel)
+    from app.services.oled_manager import start_oled_job, stop_oled_job
+
     if not screens:
         stop_oled_job(int(oled_channel))
         return RedirectResponse("/screens", status_code=303)
@@ -442,6 +541,7 @@ def update_oled_chain(
 
 @app.post("/screens/update")
 def update_screen(
+    request: Request,
     screen_id: int = Form(...),
     name: str = Form(...),
     title_template: str = Form(...),
@@ -453,6 +553,9 @@ def update_screen(
     rotation_seconds: int = Form(...),
     tag: str = Form(""),
 ):
+    error = _screen_template_error(title_template, value_template)
+    if error:
+        return _screens_response(request, error)
     with get_connection() as conn:
         conn.execute(
             """
@@ -484,6 +587,34 @@ def update_screen(
     return RedirectResponse("/screens", status_code=303)
 
 
+@app.get("/api/screens/{screen_id}/preview.png")
+def screen_preview_png(screen_id: int):
+    with get_connection() as conn:
+        screen = _load_screen(conn, screen_id)
+    if screen is None:
+        return JSONResponse({"ok": False, "error": "Screen not found."}, status_code=404)
+    from app.services.oled_manager import screen_preview
+
+    return Response(screen_preview(screen), media_type="image/png", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/api/oled/{channel}/preview.png")
+def oled_preview_png(channel: int):
+    from app.services.oled_manager import oled_preview
+
+    png = oled_preview(channel)
+    if png is None:
+        return JSONResponse({"ok": False, "error": "Nothing has been drawn on this panel yet."}, status_code=404)
+    return Response(png, media_type="image/png", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/api/oled/status")
+def oled_status_api():
+    from app.services.oled_manager import oled_status
+
+    return JSONResponse({"panels": oled_status()})
+
+
 @app.post("/screens/delete")
 def delete_screen(screen_id: int = Form(...)):
     with get_connection() as conn:
@@ -495,6 +626,8 @@ def delete_screen(screen_id: int = Form(...)):
 
 @app.post("/screens/off")
 def turn_off_oled(oled_channel: int = Form(...)):
+    from app.services.oled_manager import stop_oled_job
+
     stop_oled_job(int(oled_channel))
     return RedirectResponse("/screens", status_code=303)
 
@@ -510,15 +643,37 @@ def admin(request: Request):
             "branch": branch,
             "commit_date": commit_date,
             "status": status,
+            "governor": governor_status(),
+            "control": get_control_engine().status(),
         },
     )
 
 
+@app.get("/api/admin/startup")
+def admin_startup():
+    return JSONResponse(startup_report())
+
+
+@app.get("/api/admin/control")
+def admin_control():
+    return JSONResponse(get_control_engine().status())
+
+
+@app.get("/api/admin/governor")
+def admin_governor():
+    return JSONResponse(governor_status())
+
+
 @app.get("/api/admin/status")
 def admin_status():
     return JSONResponse(get_status_payload())
 
 
+@app.get("/api/admin/performance")
+def admin_performance():
+    return JSONResponse({**performance_snapshot(), "stream": stream_status()})
+
+
 @app.get("/settings", response_class=HTMLResponse)
 def settings(request: Request):
     fans = list_fans()
@@ -553,6 +708,7 @@ def update_fan(fan_id: int = Form(...), name: str = Form(...), max_rpm: str | No
 def update_fan_count(fan_count: int = Form(...)):
     set_fan_count(fan_count)
     sync_fan_count(get_fan_count())
+    get_control_engine().reload()
     return RedirectResponse("/settings", status_code=303)
 
 
@@ -570,6 +726,7 @@ def update_pump_channel(pump_channel: str = Form("none")):
     if new_channel is not None:
         set_fan_name_by_channel(new_channel, "Pump")
     set_pump_channel(new_channel)
+    get_control_engine().reload()
     return RedirectResponse("/settings", status_code=303)
 
 
@@ -599,17 +756,52 @@ def ingest_metrics(
     return JSONResponse({"status": "ok"})
 
 
+@app.post("/api/ingest")
+async def ingest_points(request: Request):
+    body_type = body_format(request.headers.get("content-type", ""))
+    if body_type is None:
+        return JSONResponse(
+            {"ok": False, "error": "Send application/x-ndjson, application/json or application/msgpack."},
+            status_code=415,
+        )
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > MAX_BODY_BYTES:
+            return JSONResponse({"ok": False, "error": "Request body is too large."}, status_code=413)
+    try:
+        result = await run_in_threadpool(ingest_body, bytes(body), body_type)
+    except ValueError as exc:
+        return JSONResponse({"ok": False, "error": str(exc)}, status_code=400)
+    return JSONResponse({"ok": True, **result.as_dict()})
+
+
+@app.get("/api/ingest/series")
+def get_ingest_series():
+    return JSONResponse({"series": list_ingest_series()})
+
+
+@app.get("/api/ingest/recent")
+def get_recent_ingest(series: str, limit: int = 24):
+    return JSONResponse({"series": series, "readings": recent_ingest_readings(series, limit=max(1, min(limit, 1000)))})
+
+
+@app.get("/api/stream")
+async def telemetry_stream(request: Request):
+    return StreamingResponse(
+        stream_events(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/metrics/latest")
 def get_latest_metrics():
     metrics = latest_metrics() or {}
     if get_pump_channel() is None:
         metrics["pump_percent"] = None
-    cpu_fan_percent = None
     cpu_fan_rows = recent_cpu_fan_readings(limit=1)
-    if cpu_fan_rows:
-        rpm = cpu_fan_rows[0]["rpm"]
-        cpu_fan_percent = int(max(0, min(100, round(rpm / 8000 * 100))))
-    metrics["cpu_fan_percent"] = cpu_fan_percent
+    metrics["cpu_fan_percent"] = cpu_fan_percent(cpu_fan_rows[0]["rpm"]) if cpu_fan_rows else None
     return JSONResponse(metrics)
 
 
@@ -620,30 +812,14 @@ def get_recent_metrics(limit: int = 24):
 
 @app.get("/api/temperature/recent")
 def get_recent_temperatures(limit: int = 24):
-    metrics_rows = recent_metrics(limit=limit)
-    cpu = [row["cpu_temp"] for row in metrics_rows]
-    ambient = [row["ambient_temp"] for row in metrics_rows]
-    sensor_series = recent_sensor_readings(limit=limit)
-    sensors = list_sensors()
-    sensor_map = {sensor["id"]: sensor for sensor in sensors}
-    series = {
-        "cpu": cpu,
-        "ambient": ambient,
-    }
-    for sensor_id, values in sensor_series.items():
-        series[f"sensor_{sensor_id}"] = values
-    labels = [row.get("created_at", "") for row in metrics_rows]
-    return JSONResponse(
-        {
-            "series": series,
-            "labels": labels,
-            "sensors": [
-                {"id": sensor["id"], "name": sensor["name"]}
-                for sensor in sensors
-                if sensor["id"] in sensor_map
-            ],
-        }
-    )
+    return JSONResponse(temperature_history(limit, list_sensors()))
+
+
+@app.get("/api/host/recent")
+def get_recent_host(limit: int = 24, series: str | None = None):
+    names = [name.strip() for name in series.split(",") if name.strip()] if series else None
+    return JSONResponse({"series": recent_host_readings(limit=limit, series=names)})
+
 
 @app.get("/api/sensors/latest")
 def get_latest_sensors():
@@ -665,20 +841,7 @@ def get_latest_sensors():
 
 @app.get("/api/fans/percent")
 def get_fan_percent(limit: int = 24):
-    fans = list_fans(active_only=True)
-    max_rpm_map = {fan["channel_index"]: fan["max_rpm"] for fan in fans if fan["max_rpm"]}
-    fan_series = _fan_series_from_readings(limit, max_rpm_map)
-    cpu_series = _cpu_fan_series(limit, max_rpm=8000)
-    pump_series = _pump_series(limit)
-    return JSONResponse(
-        {
-            "series": {
-                **fan_series,
-                "cpu_fan": cpu_series,
-                "pump": pump_series,
-            }
-        }
-    )
+    return JSONResponse(fan_percent_history(limit, list_fans(active_only=True), get_pump_channel()))
 
 
 @app.get("/api/fans/latest")
@@ -715,7 +878,7 @@ def set_manual_fan_speed(
             return JSONResponse({"ok": False, "error": "Percent must be 0-100."}, status_code=400)
         if value > 0:
             if is_pump:
-                min_percent = min(100, int((_PUMP_MIN_RPM * 100 + _PUMP_MAX_RPM - 1) / _PUMP_MAX_RPM))
+                min_percent = pump_min_percent()
                 if value < min_percent:
                     value = min_percent
             elif fan.get("max_rpm"):
@@ -726,15 +889,15 @@ def set_manual_fan_speed(
                         value = min_percent
         percent = value
     else:
-        max_rpm = _PUMP_MAX_RPM if is_pump else fan.get("max_rpm")
+        max_rpm = PUMP_MAX_RPM if is_pump else fan.get("max_rpm")
         if not max_rpm:
             return JSONResponse(
                 {"ok": False, "error": "RPM control requires a calibrated max RPM."},
                 status_code=400,
             )
         if is_pump:
-            if value > 0 and value < _PUMP_MIN_RPM:
-                value = _PUMP_MIN_RPM
+            if value > 0 and value < PUMP_MIN_RPM:
+                value = PUMP_MIN_RPM
         elif value > 0 and value < min_rpm:
             value = min_rpm
         if value > max_rpm:
@@ -744,7 +907,19 @@ def set_manual_fan_speed(
             )
         if max_rpm <= 0:
             return JSONResponse({"ok": False, "error": "Invalid max RPM."}, status_code=400)
-        percent = max(0, min(100, round(value / max_rpm * 100)))
+        floor = pump_min_percent() if is_pump and value > 0 else 0
+        percent = get_control_engine().hold_rpm(channel_index, value, max_rpm, floor)
+        if percent is None:
+            logger.error("manual rpm hold failed channel=%s value=%s", channel_index, value)
+            return JSONResponse({"ok": False, "error": "Failed to update fan speed."}, status_code=500)
+        logger.info(
+            "manual rpm hold channel=%s rpm=%s feedforward_percent=%s max_rpm=%s",
+            channel_index,
+            value,
+            percent,
+            max_rpm,
+        )
+        return JSONResponse({"ok": True, "percent": percent, "rpm_hold": True})
 
     if not _set_fan_speed(channel_index, int(percent)):
         logger.error(
@@ -755,6 +930,7 @@ def set_manual_fan_speed(
             percent,
         )
         return JSONResponse({"ok": False, "error": "Failed to update fan speed."}, status_code=500)
+    get_control_engine().hold_channel(channel_index)
     logger.info(
         "manual fan override channel=%s mode=%s value=%s percent=%s max_rpm=%s",
         channel_index,
@@ -771,16 +947,21 @@ def get_calibration_status():
     return JSONResponse(_calibration_status_payload())
 
 
-def _load_profiles():
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT id, name, curve_json, schedule_json, created_at
-            FROM profiles
-            ORDER BY created_at DESC
-            """
-        ).fetchall()
-        return rows
+def _profiles_response(request: Request, error: str | None):
+    engine = get_schedule_engine()
+    return templates.TemplateResponse(
+        "profiles.html",
+        {
+            "request": request,
+            "profiles": list_profiles(),
+            "active_profile_id": get_active_profile_id(),
+            "base_profile_id": get_base_profile_id(),
+            "curve_inputs": available_inputs(list_sensors()),
+            "schedule_current": engine.current(),
+            "upcoming": engine.upcoming(),
+            "error": error,
+        },
+    )
 
 
 def _update_fan_max_rpm(channel_index: int, rpm: int) -> None:
@@ -792,36 +973,52 @@ def _update_fan_max_rpm(channel_index: int, rpm: int) -> None:
 def _run_calibration() -> None:
     logger = get_logger()
     fans = list_fans(active_only=True)
-    with _calibration_lock:
-        _calibration_state.update(
-            {
-                "running": True,
-                "phase": "calibrating",
-                "started_at": time.time(),
-                "restore_started_at": 0.0,
-                "completed_at": 0.0,
-            }
-        )
-    for fan in fans:
-        _set_fan_speed(fan["channel_index"], 100)
-    time.sleep(_CALIBRATION_SECONDS)
-    rpms = get_fan_rpms()
-    if not rpms:
-        logger.error("no fan rpms found during calibration")
-    for channel_index, rpm in rpms.items():
-        _update_fan_max_rpm(channel_index, rpm)
-    with _calibration_lock:
-        _calibration_state["phase"] = "restoring"
-        _calibration_state["restore_started_at"] = time.time()
-    _restore_after_calibration(fans)
-    with _calibration_lock:
-        _calibration_state.update(
-            {
-                "running": False,
-                "phase": "complete",
-                "completed_at": time.time(),
+    get_control_engine().pause()
+    try:
+        with _calibration_lock:
+            _calibration_state.update(
+                {
+                    "running": True,
+                    "phase": "calibrating",
+                    "started_at": time.time(),
+                    "restore_started_at": 0.0,
+                    "completed_at": 0.0,
+                }
+            )
+        pump_channel = get_pump_channel()
+        sweeps: dict[int, dict[int, int]] = {}
+        for duty in _CALIBRATION_DUTIES:
+            duties = {
+                fan["channel_index"]: max(duty, pump_min_percent()) if fan["channel_index"] == pump_channel else duty
+                for fan in fans
             }
-        )
+            for channel_index, channel_duty in duties.items():
+                _set_fan_speed(channel_index, channel_duty)
+            time.sleep(_CALIBRATION_STEP_SECONDS)
+            rpms = get_fan_rpms()
+            if not rpms:
+                logger.error("no fan rpms found during calibration at %s%%", duty)
+                continue
+            for channel_index, rpm in rpms.items():
+                if channel_index in duties:
+                    sweeps.setdefault(channel_index, {})[duties[channel_index]] = rpm
+        for channel_index, points in sweeps.items():
+            if 100 in points:
+                _update_fan_max_rpm(channel_index, points[100])
+            replace_fan_calibration(channel_index, points)
+    finally:
+        with _calibration_lock:
+            _calibration_state["phase"] = "restoring"
+            _calibration_state["restore_started_at"] = time.time()
+        _restore_after_calibration(fans)
+        with _calibration_lock:
+            _calibration_state.update(
+                {
+                    "running": False,
+                    "phase": "complete",
+                    "completed_at": time.time(),
+                }
+            )
     logger.info("fan calibration completed")
 
 
@@ -855,87 +1052,14 @@ def _calibration_response(request: Request):
 
 def _restore_after_calibration(fans: list[dict]) -> None:
     logger = get_logger()
-    active_profile_id = get_active_profile_id()
-    if active_profile_id is None:
-        for fan in fans:
-            _set_fan_speed(fan["channel_index"], 20)
-        return
-    profile = _load_profile(active_profile_id)
-    if not profile:
-        logger.error("active profile %s not found, defaulting to 20%%", active_profile_id)
-        for fan in fans:
-            _set_fan_speed(fan["channel_index"], 20)
-        return
-    cpu_temp = read_cpu_temp_vcgencmd()
-    if cpu_temp is None:
-        logger.error("cpu temp unavailable, defaulting to 20%%")
-        for fan in fans:
-            _set_fan_speed(fan["channel_index"], 20)
+    engine = get_control_engine()
+    engine.reload()
+    if engine.resume():
         return
-    speeds = _fan_speeds_from_profile(profile["curve_json"], cpu_temp, fans)
+    if get_active_profile_id() is not None:
+        logger.error("active profile unavailable after calibration, defaulting to 20%%")
     for fan in fans:
-        speed = speeds.get(fan["channel_index"], 20)
-        _set_fan_speed(fan["channel_index"], speed)
-
-
-def _load_profile(profile_id: int):
-    with get_connection() as conn:
-        row = conn.execute(
-            """
-            SELECT id, name, curve_json
-            FROM profiles
-            WHERE id = ?
-            """,
-            (profile_id,),
-        ).fetchone()
-        return dict(row) if row else None
-
-
-def _fan_speeds_from_profile(curve_json: str, temp: float, fans: list[dict]) -> dict[int, int]:
-    logger = get_logger()
-    try:
-        curve = json.loads(curve_json)
-    except json.JSONDecodeError:
-        logger.error("invalid profile curve json")
-        return {}
-    speeds = {}
-    for fan in fans:
-        key = f"fan_{fan['channel_index']}"
-        points = curve.get(key)
-        if not points:
-            continue
-        points = sorted(points, key=lambda item: item["temp"])
-        speeds[fan["channel_index"]] = int(_interpolate(points, temp))
-    return speeds
-
-
-def _interpolate(points: list[dict], temp: float) -> float:
-    if temp <= points[0]["temp"]:
-        return points[0]["fan"]
-    if temp >= points[-1]["temp"]:
-        return points[-1]["fan"]
-    for lower, upper in zip(points, points[1:]):
-        if lower["temp"] <= temp <= upper["temp"]:
-            span = upper["temp"] - lower["temp"]
-            if span <= 0:
-                return lower["fan"]
-            ratio = (temp - lower["temp"]) / span
-            return lower["fan"] + ratio * (upper["fan"] - lower["fan"])
-    return points[-1]["fan"]
-
-
-def _fan_series_from_readings(limit: int, max_rpm_map: dict[int, int]) -> dict[str, list[float]]:
-    readings = recent_fan_readings(limit)
-    grouped: dict[int, list[int]] = {}
-    for row in reversed(readings):
-        grouped.setdefault(row["channel_index"], []).append(row["rpm"])
-    series: dict[str, list[float]] = {}
-    for channel_index, max_rpm in max_rpm_map.items():
-        rpms = grouped.get(channel_index, [])[-limit:]
-        if not rpms:
-            continue
-        series[f"fan_{channel_index}"] = [min((rpm / max_rpm) * 100, 100) for rpm in rpms]
-    return series
+        _set_fan_speed(fan["channel_index"], 20)
 
 
 def _set_fan_speed(channel_index: int, percent: int) -> bool:
@@ -945,61 +1069,8 @@ def _set_fan_speed(channel_index: int, percent: int) -> bool:
     return True
 
 
-def _cpu_fan_series(limit: int, max_rpm: int) -> list[float]:
-    readings = recent_cpu_fan_readings(limit)
-    rpms = [row["rpm"] for row in reversed(readings)]
-    return [min((rpm / max_rpm) * 100, 100) for rpm in rpms]
-
-
-def _pump_series(limit: int) -> list[float]:
-    if get_pump_channel() is None:
-        return []
-    rows = recent_metrics(limit=limit)
-    return [row["pump_percent"] for row in rows if row["pump_percent"] is not None]
-
-
-def _validate_profile_json(curve_json: str, schedule_json: str) -> str | None:
-    try:
-        curve = json.loads(curve_json)
-    except json.JSONDecodeError:
-        return "Curve JSON must be valid JSON."
-
-    if not isinstance(curve, dict) or not curve:
-        return "Curve JSON must be an object with per-fan entries."
-
-    for channel, points in curve.items():
-        if not isinstance(points, list) or not points:
-            return f"Curve for {channel} must be a non-empty list."
-        for point in points:
-            if not isinstance(point, dict):
-                return f"Curve point for {channel} must be an object."
-            if "temp" not in point or "fan" not in point:
-                return f"Curve point for {channel} must include temp and fan."
-            if not isinstance(point["temp"], (int, float)):
-                return f"Curve temp for {channel} must be a number."
-            if not isinstance(point["fan"], (int, float)):
-                return f"Curve fan for {channel} must be a number."
-            if not 0 <= float(point["fan"]) <= 100:
-                return f"Curve fan for {channel} must be 0-100."
-
-    if schedule_json:
-        try:
-            schedule = json.loads(schedule_json)
-        except json.JSONDecodeError:
-            return "Schedule JSON must be valid JSON."
-        if not isinstance(schedule, dict):
-            return "Schedule JSON must be an object."
-        if "cron" in schedule and not isinstance(schedule["cron"], str):
-            return "Schedule cron must be a string."
-        if "window" in schedule:
-            window = schedule["window"]
-            if not isinstance(window, dict):
-                return "Schedule window must be an object."
-            if "days" in window and not isinstance(window["days"], list):
-                return "Schedule window days must be a list."
-            if "start" in window and not isinstance(window["start"], str):
-                return "Schedule window start must be a string."
-            if "end" in window and not isinstance(window["end"], str):
-                return "Schedule window end must be a string."
-
-    return None
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
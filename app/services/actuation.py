@@ -0,0 +1,111 @@
+import threading
+from dataclasses import dataclass
+
+from app.services.env import env_float
+from app.services.instrumentation import increment
+
+HYSTERESIS_ENV = "HYDROX_ACTUATION_HYSTERESIS_PERCENT"
+DWELL_ENV = "HYDROX_ACTUATION_DWELL_SECONDS"
+SLEW_ENV = "HYDROX_ACTUATION_SLEW_PERCENT_PER_SECOND"
+
+DEFAULT_HYSTERESIS_PERCENT = 2.0
+DEFAULT_DWELL_SECONDS = 3.0
+DEFAULT_SLEW_PERCENT_PER_SECOND = 10.0
+
+
+@dataclass(frozen=True)
+class ActuationLimits:
+    hysteresis: float
+    dwell_seconds: float
+    slew_per_second: float
+
+
+@dataclass
+class ChannelState:
+    duty: int
+    commanded_at: float
+    target: int
+    suppressed: int = 0
+
+
+def actuation_limits() -> ActuationLimits:
+    return ActuationLimits(
+        hysteresis=max(0.0, env_float(HYSTERESIS_ENV, DEFAULT_HYSTERESIS_PERCENT)),
+        dwell_seconds=max(0.0, env_float(DWELL_ENV, DEFAULT_DWELL_SECONDS)),
+        slew_per_second=max(0.0, env_float(SLEW_ENV, DEFAULT_SLEW_PERCENT_PER_SECOND)),
+    )
+
+
+class Actuator:
+    def __init__(self, limits: ActuationLimits | None = None) -> None:
+        self._lock = threading.Lock()
+        self._limits = limits or actuation_limits()
+        self._channels: dict[int, ChannelState] = {}
+
+    def next_duty(self, channel_index: int, target: int, now: float) -> int | None:
+        limits = self._limits
+        with self._lock:
+            state = self._channels.get(channel_index)
+            if state is None:
+                return target
+            state.target = target
+            if target == state.duty:
+                return None
+            if abs(target - state.duty) < limits.hysteresis and target not in (0, 100):
+                return self._suppress(channel_index, state, "hysteresis")
+            elapsed = now - state.commanded_at
+            if elapsed < limits.dwell_seconds:
+                return self._suppress(channel_index, state, "dwell")
+            duty = target
+            if limits.slew_per_second > 0:
+                window = min(elapsed, max(limits.dwell_seconds, 1.0))
+                step = max(1, int(limits.slew_per_second * window))
+                duty = max(state.duty - step, min(state.duty + step, target))
+                if abs(target - duty) < limits.hysteresis:
+                    duty = target
+            return duty
+
+    def commanded(self, channel_index: int, duty: int, now: float) -> None:
+        with self._lock:
+            state = self._channels.get(channel_index)
+            if state is None:
+                self._channels[channel_index] = ChannelState(duty, now, duty)
+                return
+            state.duty = duty
+            state.commanded_at = now
+
+    def forget(self, channel_index: int) -> None:
+        with self._lock:
+            self._channels.pop(channel_index, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._channels.clear()
+            self._limits = actuation_limits()
+
+    def duties(self) -> dict[int, int]:
+        with self._lock:
+            return {channel_index: state.duty for channel_index, state in self._channels.items()}
+
+    def status(self) -> dict:
+        with self._lock:
+            limits = self._limits
+            return {
+                "hysteresis": limits.hysteresis,
+                "dwell_seconds": limits.dwell_seconds,
+                "slew_per_second": limits.slew_per_second,
+                "channels": {
+                    channel_index: {
+                        "duty": state.duty,
+                        "target": state.target,
+                        "suppressed": state.suppressed,
+                    }
+                    for channel_index, state in sorted(self._channels.items())
+                },
+            }
+
+    def _suppress(self, channel_index: int, state: ChannelState, reason: str) -> None:
+        state.suppressed += 1
+        increment(f"actuation.suppressed.fan_{channel_index}")
+        increment(f"actuation.{reason}")
+        return None
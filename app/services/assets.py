@@ -0,0 +1,248 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.instrumentation import increment, timed
+from app.services.logger import get_logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "app/static"
+STATIC_URL = "/static"
+BUILD_DIRNAME = "build"
+HASH_LENGTH = 12
+COMPRESS_MIN_BYTES = 1024
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_lock = threading.Lock()
+_manifest: dict[str, str] = {}
+_assets: dict[str, "Asset"] = {}
+_COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".ttf", ".otf", ".json", ".txt", ".html"}
+_COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+_STATIC_ENCODINGS = {"br": ".br", "gzip": ".gz"}
+_MIN_SAVING = 0.9
+_CSS_URL = re.compile(rb"""url\((['"]?)/static/([^'")]+)\1\)""")
+
+
+@dataclass(frozen=True)
+class Asset:
+    path: str
+    media_type: str
+    encodings: tuple[str, ...]
+
+
+class AssetFiles(StaticFiles):
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        with _lock:
+            asset = _assets.get(path)
+        if asset is None:
+            response = await super().get_response(path, scope)
+            response.headers.setdefault("Cache-Control", REVALIDATE_CACHE_CONTROL)
+            return response
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""), asset.encodings)
+        if encoding is None:
+            return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
+        increment(f"assets.{encoding}")
+        headers["Content-Encoding"] = encoding
+        return FileResponse(asset.path + _STATIC_ENCODINGS[encoding], media_type=asset.media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESS_MIN_BYTES) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""), _dynamic_encodings())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start: Message | None = None
+        buffering = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start, buffering
+            if message["type"] == "http.response.start":
+                buffering = _compressible(Headers(raw=message["headers"]))
+                if buffering:
+                    start = message
+                    return
+                await send(message)
+                return
+            if not buffering or message["type"] != "http.response.body":
+                await send(message)
+                return
+            buffering = False
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+            compressed = _compress(encoding, body)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            increment(f"http.{encoding}")
+            increment("http.compressed_bytes_saved", len(body) - len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
+
+
+def build_assets(static_dir: str = STATIC_DIR) -> None:
+    global _manifest, _assets
+    build_dir = os.path.join(static_dir, BUILD_DIRNAME)
+    manifest: dict[str, str] = {}
+    assets: dict[str, Asset] = {}
+    with timed("assets.build"):
+        try:
+            _build(static_dir, build_dir, manifest, assets)
+        except OSError:
+            get_logger().exception("static asset build failed, serving unhashed files")
+            return
+    with _lock:
+        _manifest, _assets = manifest, assets
+    get_logger().info("built %d static assets into %s", len(assets), build_dir)
+
+
+def asset_url(path: str) -> str:
+    with _lock:
+        hashed = _manifest.get(path)
+    return f"{STATIC_URL}/{hashed or path}"
+
+
+def accepted_encoding(header: str, available) -> str | None:
+    offered = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in available and offered.get(encoding, 0) > 0:
+            return encoding
+    return None
+
+
+def _dynamic_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return media_type in _COMPRESSIBLE_TYPES
+
+
+def _compress(encoding: str, data: bytes, static: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if static else 4)
+    return gzip.compress(data, compresslevel=9 if static else 5, mtime=0)
+
+
+def _build(static_dir: str, build_dir: str, manifest: dict[str, str], assets: dict[str, Asset]) -> None:
+    keep: set[str] = set()
+    for relative in _asset_sources(static_dir):
+        with open(os.path.join(static_dir, relative), "rb") as handle:
+            data = handle.read()
+        if relative.endswith(".css"):
+            data = _CSS_URL.sub(lambda match: _hashed_css_url(match, manifest), data)
+        stem, suffix = os.path.splitext(relative)
+        hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{suffix}"
+        target = os.path.join(build_dir, hashed)
+        _write_once(target, data)
+        keep.add(target)
+        encodings = []
+        if suffix in _COMPRESSIBLE_SUFFIXES:
+            for encoding, extension in _STATIC_ENCODINGS.items():
+                if encoding == "br" and brotli is None:
+                    continue
+                if not os.path.exists(target + extension):
+                    compressed = _compress(encoding, data, static=True)
+                    if len(compressed) >= len(data) * _MIN_SAVING:
+                        continue
+                    _write_once(target + extension, compressed)
+                keep.add(target + extension)
+                encodings.append(encoding)
+        media_type = mimetypes.guess_type(relative)[0] or "application/octet-stream"
+        manifest[relative] = hashed
+        assets[hashed] = Asset(target, media_type, tuple(encodings))
+    _remove_stale(build_dir, keep)
+
+
+def _asset_sources(static_dir: str) -> list[str]:
+    sources = []
+    for root, directories, files in os.walk(static_dir):
+        if root == static_dir:
+            directories[:] = [name for name in directories if name != BUILD_DIRNAME]
+        for name in files:
+            if not name.startswith("."):
+                sources.append(os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, "/"))
+    return sorted(sources, key=lambda relative: (relative.endswith(".css"), relative))
+
+
+def _hashed_css_url(match: re.Match, manifest: dict[str, str]) -> bytes:
+    quote, path = match.group(1), match.group(2).decode()
+    hashed = manifest.get(path)
+    if hashed is None:
+        return match.group(0)
+    return b"url(" + quote + f"{STATIC_URL}/{hashed}".encode() + quote + b")"
+
+
+def _write_once(path: str, data: bytes) -> None:
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(data)
+    os.replace(temporary, path)
+
+
+def _remove_stale(build_dir: str, keep: set[str]) -> None:
+    for root, _, files in os.walk(build_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    get_logger().warning("could not remove stale asset %s", path)
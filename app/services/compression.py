@@ -0,0 +1,326 @@
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from calendar import timegm
+from dataclasses import dataclass, field
+
+from app.services.env import env_float
+from app.services.instrumentation import increment
+from app.services.logger import get_logger
+
+COMPRESSION_ENV = "HYDROX_COMPRESSION"
+HEARTBEAT_ENV = "HYDROX_COMPRESSION_HEARTBEAT_SECONDS"
+TEMP_TOLERANCE_ENV = "HYDROX_COMPRESSION_TEMP_C"
+RPM_TOLERANCE_ENV = "HYDROX_COMPRESSION_RPM"
+PERCENT_TOLERANCE_ENV = "HYDROX_COMPRESSION_PERCENT"
+COMPRESSION_MODES = ("off", "deadband", "swinging_door")
+
+DEFAULT_MODE = "deadband"
+DEFAULT_HEARTBEAT_SECONDS = 300.0
+DEFAULT_TOLERANCES = {
+    "temp": 0.25,
+    "rpm": 25.0,
+    "percent": 1.0,
+    "load": 0.05,
+    "megabytes": 8.0,
+    "rate": 32.0,
+    "frequency": 0.0,
+    "flags": 0.0,
+}
+TOLERANCE_ENVS = {"temp": TEMP_TOLERANCE_ENV, "rpm": RPM_TOLERANCE_ENV, "percent": PERCENT_TOLERANCE_ENV}
+
+SAMPLE_SECONDS = 5
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_mode_logged = False
+
+
+@dataclass
+class SeriesState:
+    anchor_at: float
+    anchor: tuple
+    pending_id: int | None = None
+    pending_at: float = 0.0
+    pending: tuple = ()
+    low: list[float | None] = field(default_factory=list)
+    high: list[float | None] = field(default_factory=list)
+
+
+_lock = threading.Lock()
+_states: dict[tuple, SeriesState] = {}
+
+
+def compression_mode() -> str:
+    global _mode_logged
+    mode = os.getenv(COMPRESSION_ENV, DEFAULT_MODE).strip().lower() or DEFAULT_MODE
+    if mode not in COMPRESSION_MODES:
+        if not _mode_logged:
+            get_logger().error("unknown %s=%s, using %s", COMPRESSION_ENV, mode, DEFAULT_MODE)
+            _mode_logged = True
+        return DEFAULT_MODE
+    return mode
+
+
+def heartbeat_seconds() -> float:
+    return env_float(HEARTBEAT_ENV, DEFAULT_HEARTBEAT_SECONDS)
+
+
+def max_gap_seconds() -> float:
+    heartbeat = heartbeat_seconds() if compression_mode() != "off" else 0.0
+    return heartbeat + 3 * SAMPLE_SECONDS
+
+
+def tolerance(kind: str) -> float:
+    env = TOLERANCE_ENVS.get(kind)
+    return max(0.0, env_float(env, DEFAULT_TOLERANCES[kind]) if env else DEFAULT_TOLERANCES[kind])
+
+
+def parse_timestamp(value: str) -> float:
+    return float(timegm(time.strptime(value[:19], TIMESTAMP_FORMAT)))
+
+
+def format_timestamp(value: float) -> str:
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(value))
+
+
+def store_sample(
+    conn: sqlite3.Connection,
+    table: str,
+    key: dict[str, object],
+    values: dict[str, object],
+    kinds: dict[str, str],
+    created_at: str | None = None,
+) -> None:
+    mode = compression_mode()
+    columns = list(key) + list(values)
+    params = list(key.values()) + list(values.values())
+    if mode == "off":
+        _insert(conn, table, columns, params, created_at)
+        return
+    sample_at = parse_timestamp(created_at) if created_at else float(int(time.time()))
+    series = (table,) + tuple(key.values())
+    point = tuple(values.values())
+    tolerances = tuple(tolerance(kinds[column]) for column in values)
+    with _lock:
+        state = _states.get(series)
+        action, next_state, promoted = _offer(state, mode, sample_at, point, tolerances)
+        stamp = format_timestamp(sample_at)
+        if action == "backfill":
+            _insert(conn, table, columns, params, stamp)
+            increment("compression.backfilled")
+            return
+        row_id = state.pending_id if state else None
+        if action == "promote":
+            _update(conn, table, row_id, list(values), list(promoted), None)
+            action = "insert"
+        if action == "update" and not _update(conn, table, row_id, list(values), list(point), stamp):
+            action = "insert"
+        if action == "insert":
+            row_id = _insert(conn, table, columns, params, stamp)
+        else:
+            increment("compression.suppressed")
+        if next_state.pending_at == sample_at:
+            next_state.pending_id = row_id
+        _states[series] = next_state
+
+
+def sample_times(end_at: float, count: int, interval: float = SAMPLE_SECONDS) -> list[float]:
+    return [end_at - (count - 1 - index) * interval for index in range(count)]
+
+
+def window_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: list[str],
+    start_at: float,
+    key: dict[str, object] | None = None,
+) -> list[dict]:
+    where = " AND ".join(f"{column} = ?" for column in key or {})
+    key_params = list((key or {}).values())
+    select = ", ".join(columns + ["created_at"])
+    prefix = f"{where} AND " if where else ""
+    start = format_timestamp(start_at)
+    before = conn.execute(
+        f"SELECT {select} FROM {table} WHERE {prefix}created_at < ? ORDER BY created_at DESC, id DESC LIMIT 1",
+        key_params + [start],
+    ).fetchone()
+    rows = conn.execute(
+        f"SELECT {select} FROM {table} WHERE {prefix}created_at >= ? ORDER BY created_at, id",
+        key_params + [start],
+    ).fetchall()
+    result = [dict(before)] if before else []
+    result.extend(dict(row) for row in rows)
+    return result
+
+
+def latest_timestamp(conn: sqlite3.Connection, table: str, key: dict[str, object] | None = None) -> float | None:
+    where = " AND ".join(f"{column} = ?" for column in key or {})
+    row = conn.execute(
+        f"SELECT MAX(created_at) AS created_at FROM {table}" + (f" WHERE {where}" if where else ""),
+        list((key or {}).values()),
+    ).fetchone()
+    if not row or not row["created_at"]:
+        return None
+    return parse_timestamp(row["created_at"])
+
+
+def distinct_keys(conn: sqlite3.Connection, table: str, column: str) -> list:
+    rows = conn.execute(
+        f"""
+        WITH RECURSIVE keys(value) AS (
+            SELECT MIN({column}) FROM {table}
+            UNION ALL
+            SELECT (SELECT MIN({column}) FROM {table} WHERE {column} > keys.value)
+            FROM keys
+            WHERE keys.value IS NOT NULL
+        )
+        SELECT value FROM keys WHERE value IS NOT NULL
+        """
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def reconstruct(rows: list[dict], fields: list[str], times: list[float], linear: bool) -> list[dict]:
+    if not rows:
+        return []
+    stamps = [parse_timestamp(row["created_at"]) for row in rows]
+    max_gap = max_gap_seconds()
+    result = []
+    for sample_at in times:
+        index = bisect.bisect_right(stamps, sample_at) - 1
+        if index < 0 or sample_at - stamps[index] > max_gap:
+            continue
+        before = rows[index]
+        point = {"created_at": format_timestamp(sample_at)}
+        after = rows[index + 1] if linear and index + 1 < len(rows) else None
+        for name in fields:
+            value = before[name]
+            if after is not None and value is not None and after[name] is not None:
+                span = stamps[index + 1] - stamps[index]
+                if span > 0:
+                    value = value + (after[name] - value) * (sample_at - stamps[index]) / span
+                    if isinstance(before[name], int) and isinstance(after[name], int):
+                        value = int(round(value))
+            point[name] = value
+        result.append(point)
+    return result
+
+
+def reconstructs_linearly() -> bool:
+    return compression_mode() == "swinging_door"
+
+
+def _offer(
+    state: SeriesState | None,
+    mode: str,
+    sample_at: float,
+    point: tuple,
+    tolerances: tuple,
+) -> tuple[str, SeriesState | None, tuple | None]:
+    if state is None:
+        return "insert", SeriesState(anchor_at=sample_at, anchor=point), None
+    latest_at = state.pending_at if state.pending_id is not None else state.anchor_at
+    if sample_at <= latest_at:
+        return "backfill", state, None
+    keep = "update" if state.pending_id is not None else "insert"
+    heartbeat = sample_at - state.anchor_at >= heartbeat_seconds()
+    if mode == "deadband":
+        if heartbeat or not _within_deadband(state.anchor, point, tolerances):
+            return keep, SeriesState(anchor_at=sample_at, anchor=point), None
+        return keep, SeriesState(state.anchor_at, state.anchor, pending_at=sample_at, pending=point), None
+    low, high = _corridor(state.anchor_at, state.anchor, state.low, state.high, sample_at, point, tolerances)
+    if not heartbeat and all(lower is None or lower <= upper for lower, upper in zip(low, high)):
+        return keep, SeriesState(state.anchor_at, state.anchor, None, sample_at, point, low, high), None
+    if state.pending_id is None:
+        return "insert", SeriesState(anchor_at=sample_at, anchor=point), None
+    anchor = _fitted_pending(state)
+    low, high = _corridor(state.pending_at, anchor, [], [], sample_at, point, tolerances)
+    return "promote", SeriesState(state.pending_at, anchor, None, sample_at, point, low, high), anchor
+
+
+def _within_deadband(anchor: tuple, point: tuple, tolerances: tuple) -> bool:
+    for previous, current, allowed in zip(anchor, point, tolerances):
+        if previous is None or current is None:
+            if previous is not current:
+                return False
+            continue
+        if abs(current - previous) > allowed:
+            return False
+    return True
+
+
+def _corridor(
+    anchor_at: float,
+    anchor: tuple,
+    low: list[float | None],
+    high: list[float | None],
+    sample_at: float,
+    point: tuple,
+    tolerances: tuple,
+) -> tuple[list[float | None], list[float | None]]:
+    elapsed = sample_at - anchor_at
+    next_low: list[float | None] = []
+    next_high: list[float | None] = []
+    for index, (origin, current, allowed) in enumerate(zip(anchor, point, tolerances)):
+        if origin is None or current is None:
+            closed = origin is not current
+            next_low.append(1.0 if closed else None)
+            next_high.append(0.0 if closed else None)
+            continue
+        lower = (current - allowed - origin) / elapsed
+        upper = (current + allowed - origin) / elapsed
+        if low and low[index] is not None:
+            lower = max(lower, low[index])
+            upper = min(upper, high[index])
+        next_low.append(lower)
+        next_high.append(upper)
+    return next_low, next_high
+
+
+def _fitted_pending(state: SeriesState) -> tuple:
+    elapsed = state.pending_at - state.anchor_at
+    fitted = []
+    for index, (origin, current) in enumerate(zip(state.anchor, state.pending)):
+        if origin is None or current is None or not state.low or state.low[index] is None:
+            fitted.append(current)
+            continue
+        value = origin + (state.low[index] + state.high[index]) / 2 * elapsed
+        fitted.append(int(round(value)) if isinstance(current, int) else round(value, 4))
+    return tuple(fitted)
+
+
+def _insert(
+    conn: sqlite3.Connection, table: str, columns: list[str], params: list, created_at: str | None
+) -> int:
+    if created_at is not None:
+        columns = columns + ["created_at"]
+        params = params + [created_at]
+    placeholders = ", ".join("?" for _ in columns)
+    cursor = conn.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+        params,
+    )
+    return cursor.lastrowid
+
+
+def _update(
+    conn: sqlite3.Connection,
+    table: str,
+    row_id: int | None,
+    columns: list[str],
+    params: list,
+    created_at: str | None,
+) -> bool:
+    if row_id is None:
+        return False
+    assignments = [f"{column} = ?" for column in columns]
+    if created_at is not None:
+        assignments.append("created_at = ?")
+        params = params + [created_at]
+    cursor = conn.execute(
+        f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?",
+        params + [row_id],
+    )
+    return cursor.rowcount > 0
@@ -0,0 +1,344 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services import telemetry
+from app.services.actuation import Actuator
+from app.services.compression import SAMPLE_SECONDS
+from app.services.curves import parse_curves
+from app.services.env import env_float
+from app.services.fans import get_fan_calibration, list_fans
+from app.services.instrumentation import increment, timed
+from app.services.liquidctl import set_fan_speed
+from app.services.logger import get_logger
+from app.services.profiles import get_profile, profile_revision
+from app.services.rpm_hold import RpmHold, build_rpm_model
+from app.services.settings import get_active_profile_id, get_pump_channel, set_fan_pwm
+
+CONTROL_HZ_ENV = "HYDROX_CONTROL_HZ"
+COMPILE_CACHE_SIZE = 32
+DEFAULT_CONTROL_HZ = 1.0
+MIN_CONTROL_HZ = 0.1
+MAX_CONTROL_HZ = 10.0
+PUMP_MIN_RPM = 800
+PUMP_MAX_RPM = 4800
+STALE_INPUT_DUTY = 100
+STALE_INPUT_SECONDS = 3 * SAMPLE_SECONDS
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    profile_id: int
+    name: str
+    revision: int
+    channels: tuple[int, ...]
+    keys: tuple[str, ...]
+    weights: np.ndarray
+    members: np.ndarray
+    maximum: np.ndarray
+    minimum: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+    shifts: np.ndarray
+    temps: np.ndarray
+    fans: np.ndarray
+    floors: np.ndarray
+
+    def readings(self, values: dict[str, float]) -> np.ndarray:
+        return np.array([[values.get(key, np.nan) for key in self.keys]], dtype=float)
+
+    def inputs(self, readings: np.ndarray) -> np.ndarray:
+        present = ~np.isnan(readings)
+        filled = np.where(present, readings, 0.0)
+        totals = present @ self.weights.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            inputs = (filled @ self.weights.T) / totals
+        for row in np.flatnonzero(self.maximum | self.minimum):
+            members = self.members[row] & present
+            if self.maximum[row]:
+                inputs[:, row] = np.where(members, filled, -np.inf).max(axis=1)
+            else:
+                inputs[:, row] = np.where(members, filled, np.inf).min(axis=1)
+        return np.where(totals > 0, inputs, np.nan)
+
+    def duties(self, readings: np.ndarray) -> np.ndarray:
+        inputs = self.inputs(readings)
+        available = ~np.isnan(inputs)
+        positions = np.clip(np.where(available, inputs, self.lows), self.lows, self.highs) + self.shifts
+        duties = np.interp(positions, self.temps, self.fans).astype(int)
+        duties = np.maximum(self.floors, np.minimum(100, duties))
+        return np.where(available, duties, -1)
+
+    def evaluate(self, values: dict[str, float]) -> dict[int, int]:
+        if not self.channels:
+            return {}
+        duties = self.duties(self.readings(values))[0]
+        return {channel_index: int(duty) for channel_index, duty in zip(self.channels, duties) if duty >= 0}
+
+
+_cache_lock = threading.Lock()
+_compile_cache: OrderedDict[tuple, CompiledProfile] = OrderedDict()
+
+
+def compile_profile(profile: dict, fans: list[dict], pump_channel: int | None) -> CompiledProfile:
+    active = {fan["channel_index"] for fan in fans}
+    specs = [
+        spec
+        for spec in parse_curves(json.loads(profile["curve_json"]), ignore_unknown=True)
+        if spec.channel_index in active
+    ]
+    keys = tuple(dict.fromkeys(key for spec in specs for key in spec.input.keys()))
+    columns = {key: index for index, key in enumerate(keys)}
+    weights = np.zeros((len(specs), len(keys)))
+    temps: list[float] = []
+    curve_fans: list[float] = []
+    lows, highs, shifts = [], [], []
+    for row, spec in enumerate(specs):
+        for key, weight in spec.input.weights:
+            weights[row, columns[key]] = weight
+        shift = (temps[-1] + 1.0 - spec.temps[0]) if temps else 0.0
+        temps.extend(temp + shift for temp in spec.temps)
+        curve_fans.extend(spec.fans)
+        lows.append(spec.temps[0])
+        highs.append(spec.temps[-1])
+        shifts.append(shift)
+    aggregates = [spec.input.aggregate for spec in specs]
+    floors = [pump_min_percent() if spec.channel_index == pump_channel else 0 for spec in specs]
+    return CompiledProfile(
+        profile_id=profile["id"],
+        name=profile["name"],
+        revision=profile.get("revision", 1),
+        channels=tuple(spec.channel_index for spec in specs),
+        keys=keys,
+        weights=weights,
+        members=weights > 0,
+        maximum=np.array([aggregate == "max" for aggregate in aggregates], dtype=bool),
+        minimum=np.array([aggregate == "min" for aggregate in aggregates], dtype=bool),
+        lows=np.array(lows, dtype=float),
+        highs=np.array(highs, dtype=float),
+        shifts=np.array(shifts, dtype=float),
+        temps=np.array(temps, dtype=float),
+        fans=np.array(curve_fans, dtype=float),
+        floors=np.array(floors, dtype=int),
+    )
+
+
+def get_compiled_profile(profile_id: int, fans: list[dict], pump_channel: int | None) -> CompiledProfile | None:
+    revision = profile_revision(profile_id)
+    if revision is None:
+        return None
+    layout = (tuple(fan["channel_index"] for fan in fans), pump_channel)
+    with _cache_lock:
+        compiled = _compile_cache.get((profile_id, revision, layout))
+        if compiled is not None:
+            _compile_cache.move_to_end((profile_id, revision, layout))
+    if compiled is not None:
+        increment("control.compile_cache.hits")
+        return compiled
+    profile = get_profile(profile_id)
+    if not profile:
+        return None
+    compiled = compile_profile(profile, fans, pump_channel)
+    increment("control.compile_cache.misses")
+    with _cache_lock:
+        _compile_cache[(profile_id, compiled.revision, layout)] = compiled
+        while len(_compile_cache) > COMPILE_CACHE_SIZE:
+            _compile_cache.popitem(last=False)
+    return compiled
+
+
+def pump_min_percent() -> int:
+    return min(100, int((PUMP_MIN_RPM * 100 + PUMP_MAX_RPM - 1) / PUMP_MAX_RPM))
+
+
+def control_hz() -> float:
+    hz = env_float(CONTROL_HZ_ENV, DEFAULT_CONTROL_HZ)
+    return max(MIN_CONTROL_HZ, min(MAX_CONTROL_HZ, hz))
+
+
+class ControlEngine:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._compiled: CompiledProfile | None = None
+        self._actuator = Actuator()
+        self._held: set[int] = set()
+        self._rpm_holds: dict[int, RpmHold] = {}
+        self._paused = False
+        self._input_missing_logged = False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.reload()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def reload(self) -> None:
+        logger = get_logger()
+        compiled = None
+        profile_id = get_active_profile_id()
+        if profile_id is not None:
+            try:
+                compiled = get_compiled_profile(profile_id, list_fans(active_only=True), get_pump_channel())
+            except (ValueError, KeyError, TypeError):
+                logger.exception("active profile %s failed to compile", profile_id)
+            else:
+                if compiled is None:
+                    logger.error("active profile %s not found", profile_id)
+        with self._lock:
+            self._compiled = compiled
+            held = list(self._held)
+            self._held.clear()
+            self._rpm_holds.clear()
+        for channel_index in held:
+            self._actuator.forget(channel_index)
+        increment("control.compiles")
+        if compiled:
+            logger.info("control engine running profile %s (%s channels)", compiled.name, len(compiled.channels))
+
+    def pause(self) -> None:
+        with self._lock:
+            self._paused = True
+
+    def resume(self) -> bool:
+        with self._lock:
+            self._paused = False
+            has_profile = self._compiled is not None
+        self._actuator.reset()
+        if not has_profile:
+            return False
+        return self.tick() is not None
+
+    def hold_channel(self, channel_index: int) -> None:
+        with self._lock:
+            self._held.add(channel_index)
+            self._rpm_holds.pop(channel_index, None)
+
+    def hold_rpm(self, channel_index: int, target_rpm: int, max_rpm: int | None, floor: int = 0) -> int | None:
+        model = build_rpm_model(get_fan_calibration(channel_index), max_rpm)
+        if model is None:
+            return None
+        hold = RpmHold(channel_index, target_rpm, model, floor)
+        duty = hold.start()
+        if not set_fan_speed(channel_index, duty):
+            increment("control.command_failures")
+            return None
+        set_fan_pwm(channel_index, duty)
+        hold.commanded(duty, time.time())
+        with self._lock:
+            self._held.add(channel_index)
+            self._rpm_holds[channel_index] = hold
+        self._actuator.forget(channel_index)
+        increment("control.commands")
+        return duty
+
+    def status(self) -> dict:
+        with self._lock:
+            compiled = self._compiled
+            return {
+                "profile_id": compiled.profile_id if compiled else None,
+                "profile_name": compiled.name if compiled else None,
+                "paused": self._paused,
+                "hz": control_hz(),
+                "applied": self._actuator.duties(),
+                "held": sorted(self._held),
+                "rpm_holds": {channel_index: hold.status() for channel_index, hold in self._rpm_holds.items()},
+                "actuation": self._actuator.status(),
+            }
+
+    def tick(self) -> dict[int, int] | None:
+        with self._lock:
+            compiled = self._compiled
+            paused = self._paused
+        if paused:
+            return None
+        self._step_rpm_holds()
+        if compiled is None:
+            return None
+        values = telemetry.snapshot(STALE_INPUT_SECONDS)
+        speeds = compiled.evaluate(values)
+        if len(speeds) < len(compiled.channels):
+            fallback = {
+                channel_index: STALE_INPUT_DUTY for channel_index in compiled.channels if channel_index not in speeds
+            }
+            speeds.update(fallback)
+            increment("control.fallbacks", len(fallback))
+            if not self._input_missing_logged:
+                missing = [key for key in compiled.keys if key not in values]
+                get_logger().error(
+                    "control engine has no reading in the last %ds for %s, running %s",
+                    STALE_INPUT_SECONDS,
+                    ", ".join(missing),
+                    ", ".join(f"fan {channel_index} at {duty}%" for channel_index, duty in fallback.items()),
+                )
+                self._input_missing_logged = True
+        elif self._input_missing_logged:
+            get_logger().info("control engine inputs are fresh again")
+            self._input_missing_logged = False
+        now = time.monotonic()
+        for channel_index, percent in speeds.items():
+            with self._lock:
+                if channel_index in self._held:
+                    continue
+            duty = self._actuator.next_duty(channel_index, percent, now)
+            if duty is None:
+                continue
+            if set_fan_speed(channel_index, duty):
+                set_fan_pwm(channel_index, duty)
+                self._actuator.commanded(channel_index, duty, now)
+                increment("control.commands")
+            else:
+                increment("control.command_failures")
+        return speeds
+
+    def _step_rpm_holds(self) -> None:
+        with self._lock:
+            holds = list(self._rpm_holds.values())
+        for hold in holds:
+            key = f"fan_{hold.channel_index}_rpm"
+            duty = hold.step(telemetry.latest(key), telemetry.updated_at(key))
+            if duty == hold.duty:
+                continue
+            if set_fan_speed(hold.channel_index, duty):
+                set_fan_pwm(hold.channel_index, duty)
+                hold.commanded(duty, time.time())
+                increment("control.rpm_trims")
+            else:
+                increment("control.command_failures")
+
+    def _run(self) -> None:
+        logger = get_logger()
+        while not self._stop_event.is_set():
+            try:
+                with timed("control.tick"):
+                    self.tick()
+            except Exception:
+                logger.exception("control engine tick failed")
+            self._stop_event.wait(1 / control_hz())
+
+
+_engine = ControlEngine()
+
+
+def get_control_engine() -> ControlEngine:
+    return _engine
+
+
+def start_control_engine() -> None:
+    _engine.start()
+
+
+def shutdown_control_engine() -> None:
+    _engine.stop()
@@ -1,15 +1,15 @@
-from glob import glob
 from typing import Optional
 
+from app.services.hardware import glob_paths, read_text
+
 
 def read_cpu_fan_rpm() -> Optional[int]:
-    paths = glob("/sys/devices/platform/cooling_fan/hwmon/*/fan1_input")
+    paths = glob_paths("/sys/devices/platform/cooling_fan/hwmon/*/fan1_input")
     if not paths:
-        paths = glob("/sys/class/hwmon/hwmon*/fan1_input")
+        paths = glob_paths("/sys/class/hwmon/hwmon*/fan1_input")
     for path in paths:
         try:
-            with open(path, "r", encoding="utf-8") as handle:
-                raw = handle.read().strip()
+            raw = read_text(path).strip()
             value = int(raw)
             return value
         except (OSError, ValueError):
@@ -0,0 +1,122 @@
+import re
+from dataclasses import dataclass
+
+DEFAULT_INPUT = "cpu_temp"
+BUILTIN_INPUTS = {"cpu_temp": "CPU temperature", "ambient_temp": "Ambient (NVMe) temperature"}
+AGGREGATES = ("max", "min", "mean", "weighted")
+
+_SENSOR_INPUT = re.compile(r"^sensor_(\d+)$")
+_CHANNEL_KEY = re.compile(r"^fan_(\d+)$")
+
+
+@dataclass(frozen=True)
+class CurveInput:
+    aggregate: str
+    weights: tuple[tuple[str, float], ...]
+
+    def keys(self) -> tuple[str, ...]:
+        return tuple(key for key, _ in self.weights)
+
+
+@dataclass(frozen=True)
+class CurveSpec:
+    channel_index: int
+    input: CurveInput
+    temps: tuple[float, ...]
+    fans: tuple[float, ...]
+
+
+def parse_curves(curve: dict, ignore_unknown: bool = False) -> list[CurveSpec]:
+    if not isinstance(curve, dict) or not curve:
+        raise ValueError("Curve JSON must be an object with per-fan entries.")
+    specs = []
+    for channel, entry in curve.items():
+        match = _CHANNEL_KEY.match(str(channel))
+        if not match:
+            if ignore_unknown:
+                continue
+            raise ValueError(f"Curve key {channel} must look like fan_1.")
+        if isinstance(entry, list):
+            source, points = DEFAULT_INPUT, entry
+        elif isinstance(entry, dict):
+            source, points = entry.get("input", DEFAULT_INPUT), entry.get("points")
+        else:
+            raise ValueError(f"Curve for {channel} must be a list of points or an object with input and points.")
+        temps, fans = _parse_points(channel, points)
+        specs.append(CurveSpec(int(match.group(1)), parse_input(channel, source), temps, fans))
+    return specs
+
+
+def parse_input(channel: str, source) -> CurveInput:
+    if isinstance(source, str):
+        _check_input_key(channel, source)
+        return CurveInput("weighted", ((source, 1.0),))
+    if not isinstance(source, dict) or len(source) != 1:
+        raise ValueError(f"Curve input for {channel} must be a series name or one of {', '.join(AGGREGATES)}.")
+    aggregate, members = next(iter(source.items()))
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Curve input for {channel} must use one of {', '.join(AGGREGATES)}.")
+    if aggregate == "weighted":
+        if not isinstance(members, dict) or not members:
+            raise ValueError(f"Curve weighted input for {channel} must map series names to weights.")
+        weights = []
+        for key, weight in members.items():
+            _check_input_key(channel, key)
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+                raise ValueError(f"Curve weight for {key} in {channel} must be a positive number.")
+            weights.append((key, float(weight)))
+        return CurveInput(aggregate, tuple(weights))
+    if not isinstance(members, list) or not members:
+        raise ValueError(f"Curve {aggregate} input for {channel} must be a non-empty list of series names.")
+    for key in members:
+        _check_input_key(channel, key)
+    return CurveInput(aggregate, tuple((key, 1.0) for key in dict.fromkeys(members)))
+
+
+def input_sensor_ids(specs: list[CurveSpec]) -> set[int]:
+    ids = set()
+    for spec in specs:
+        for key in spec.input.keys():
+            match = _SENSOR_INPUT.match(key)
+            if match:
+                ids.add(int(match.group(1)))
+    return ids
+
+
+def available_inputs(sensors: list[dict]) -> list[dict]:
+    inputs = [{"key": key, "label": label} for key, label in BUILTIN_INPUTS.items()]
+    for sensor in sensors:
+        if sensor.get("active", 1):
+            inputs.append({"key": f"sensor_{sensor['id']}", "label": sensor["name"]})
+    return inputs
+
+
+def _parse_points(channel: str, points) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    if not isinstance(points, list) or not points:
+        raise ValueError(f"Curve for {channel} must be a non-empty list.")
+    for point in points:
+        if not isinstance(point, dict):
+            raise ValueError(f"Curve point for {channel} must be an object.")
+        if "temp" not in point or "fan" not in point:
+            raise ValueError(f"Curve point for {channel} must include temp and fan.")
+        if not isinstance(point["temp"], (int, float)):
+            raise ValueError(f"Curve temp for {channel} must be a number.")
+        if not isinstance(point["fan"], (int, float)):
+            raise ValueError(f"Curve fan for {channel} must be a number.")
+        if not 0 <= float(point["fan"]) <= 100:
+            raise ValueError(f"Curve fan for {channel} must be 0-100.")
+    temps: list[float] = []
+    fans: list[float] = []
+    for point in sorted(points, key=lambda item: item["temp"]):
+        temp = float(point["temp"])
+        if temps and temp == temps[-1]:
+            continue
+        temps.append(temp)
+        fans.append(float(point["fan"]))
+    return tuple(temps), tuple(fans)
+
+
+def _check_input_key(channel: str, key) -> None:
+    if not isinstance(key, str) or not (key in BUILTIN_INPUTS or _SENSOR_INPUT.match(key)):
+        names = ", ".join(BUILTIN_INPUTS)
+        raise ValueError(f"Curve input {key!r} for {channel} must be {names} or sensor_<id>.")
@@ -3,6 +3,9 @@ import time
 
 from app.services.cpu_fan import read_cpu_fan_rpm
 from app.services.fan_metrics import insert_cpu_fan_reading, insert_fan_reading
+from app.services.governor import scaled
+from app.services.host_metrics import HOST_PREFIX, insert_host_readings, sample_host
+from app.services.instrumentation import increment, timed
 from app.services.liquidctl import get_fan_rpms
 from app.services.logger import get_logger
 from app.services.metrics import (
@@ -20,9 +23,14 @@ from app.services.sensors import (
 )
 from app.services.settings import get_fan_pwm, get_pump_channel
 from app.services.system_status import _read_wifi_strength, set_wifi_cache
+from app.services.telemetry import publish
+
+_SAMPLE_SECONDS = 5
 
 _daemon_started = False
 _cpu_fan_missing_logged = False
+_stopping = threading.Event()
+_threads: list[threading.Thread] = []
 
 
 def start_daemon() -> None:
@@ -30,76 +38,145 @@ def start_daemon() -> None:
     if _daemon_started:
         return
     _daemon_started = True
-    threading.Thread(target=_cpu_sampler, daemon=True).start()
-    threading.Thread(target=_fan_sampler, daemon=True).start()
-    threading.Thread(target=_wifi_sampler, daemon=True).start()
-    threading.Thread(target=_sensor_sampler, daemon=True).start()
+    _stopping.clear()
+    for sampler in (_cpu_sampler, _fan_sampler, _wifi_sampler, _sensor_sampler, _host_sampler):
+        thread = threading.Thread(target=sampler, daemon=True)
+        thread.start()
+        _threads.append(thread)
+
+
+def shutdown_daemon() -> None:
+    global _daemon_started
+    _stopping.set()
+    for thread in _threads:
+        thread.join(timeout=2)
+    _threads.clear()
+    _daemon_started = False
+
+
+def run_sampler_tick(loop_index: int = 0) -> None:
+    cpu_tick()
+    fan_tick()
+    wifi_tick()
+    sensor_tick(loop_index)
+    host_tick()
+
+
+def cpu_tick() -> None:
+    cpu_temp = read_cpu_temp_vcgencmd()
+    if cpu_temp is None:
+        return
+    latest = latest_metrics() or {}
+    nvme_temp = read_nvme_temp_sensors()
+    ambient_temp = nvme_temp if nvme_temp is not None else latest.get(
+        "ambient_temp", DEFAULT_METRICS["ambient_temp"]
+    )
+    fan_rpm = latest.get("fan_rpm", DEFAULT_METRICS["fan_rpm"])
+    pump_channel = get_pump_channel()
+    pump_percent = None
+    if pump_channel is not None:
+        pump_percent = get_fan_pwm(pump_channel)
+    publish({"cpu_temp": cpu_temp, "ambient_temp": nvme_temp, "pump_percent": pump_percent})
+    insert_metrics(cpu_temp, ambient_temp, fan_rpm, pump_percent)
+
+
+def fan_tick() -> None:
+    logger = get_logger()
+    global _cpu_fan_missing_logged
+    rpms = get_fan_rpms()
+    publish({f"fan_{channel_index}_rpm": rpm for channel_index, rpm in rpms.items()})
+    for channel_index, rpm in rpms.items():
+        insert_fan_reading(channel_index, rpm)
+    cpu_rpm = read_cpu_fan_rpm()
+    if cpu_rpm is not None:
+        publish({"cpu_fan_rpm": cpu_rpm})
+        insert_cpu_fan_reading(cpu_rpm)
+        _cpu_fan_missing_logged = False
+    else:
+        if not _cpu_fan_missing_logged:
+            logger.error("cpu fan rpm not found in sysfs")
+            _cpu_fan_missing_logged = True
+
+
+def wifi_tick() -> None:
+    set_wifi_cache(_read_wifi_strength())
+
+
+def sensor_tick(loop_index: int) -> None:
+    if loop_index % 12 == 0:
+        sync_ds18b20_sensors()
+    liquid = refresh_liquid_sensors()
+    ds18b20 = read_ds18b20_temps()
+    _store_sensor_readings("liquidctl", liquid)
+    _store_sensor_readings("ds18b20", ds18b20)
+
+
+def host_tick() -> None:
+    values = sample_host()
+    publish({f"{HOST_PREFIX}{series}": value for series, value in values.items()})
+    insert_host_readings(values)
 
 
 def _cpu_sampler() -> None:
     while True:
-        cpu_temp = read_cpu_temp_vcgencmd()
-        if cpu_temp is not None:
-            latest = latest_metrics() or {}
-            nvme_temp = read_nvme_temp_sensors()
-            ambient_temp = nvme_temp if nvme_temp is not None else latest.get(
-                "ambient_temp", DEFAULT_METRICS["ambient_temp"]
-            )
-            fan_rpm = latest.get("fan_rpm", DEFAULT_METRICS["fan_rpm"])
-            pump_channel = get_pump_channel()
-            pump_percent = None
-            if pump_channel is not None:
-                pump_percent = get_fan_pwm(pump_channel)
-            insert_metrics(cpu_temp, ambient_temp, fan_rpm, pump_percent)
-        time.sleep(5)
+        _timed_tick("cpu", cpu_tick)
+        if _stopping.wait(_SAMPLE_SECONDS):
+            return
 
 
 def _fan_sampler() -> None:
-    logger = get_logger()
-    global _cpu_fan_missing_logged
     while True:
-        rpms = get_fan_rpms()
-        for channel_index, rpm in rpms.items():
-            insert_fan_reading(channel_index, rpm)
-        cpu_rpm = read_cpu_fan_rpm()
-        if cpu_rpm is not None:
-            insert_cpu_fan_reading(cpu_rpm)
-            _cpu_fan_missing_logged = False
-        else:
-            if not _cpu_fan_missing_logged:
-                logger.error("cpu fan rpm not found in sysfs")
-                _cpu_fan_missing_logged = True
-        time.sleep(5)
+        _timed_tick("fan", fan_tick)
+        if _stopping.wait(_SAMPLE_SECONDS):
+            return
 
 
 def _wifi_sampler() -> None:
     while True:
-        set_wifi_cache(_read_wifi_strength())
-        time.sleep(5)
+        _timed_tick("wifi", wifi_tick)
+        if _stopping.wait(scaled(_SAMPLE_SECONDS)):
+            return
 
 
 def _sensor_sampler() -> None:
     loops = 0
     while True:
-        if loops % 12 == 0:
-            sync_ds18b20_sensors()
-        liquid = refresh_liquid_sensors()
-        ds18b20 = read_ds18b20_temps()
-        _store_sensor_readings("liquidctl", liquid)
-        _store_sensor_readings("ds18b20", ds18b20)
+        _timed_tick("sensor", sensor_tick, loops)
         loops += 1
-        time.sleep(5)
+        if _stopping.wait(_SAMPLE_SECONDS):
+            return
+
+
+def _host_sampler() -> None:
+    while True:
+        _timed_tick("host", host_tick)
+        if _stopping.wait(scaled(_SAMPLE_SECONDS)):
+            return
+
+
+def _timed_tick(name: str, tick, *args) -> None:
+    started = time.monotonic()
+    try:
+        with timed(f"sampler.{name}"):
+            tick(*args)
+    except Exception:
+        get_logger().exception("%s sampler tick failed", name)
+    if time.monotonic() - started > _SAMPLE_SECONDS:
+        increment(f"sampler.{name}.overrun")
 
 
 def _store_sensor_readings(kind: str, readings: dict[str, float]) -> None:
     if not readings:
         return
     sensor_map = _sensor_id_map(kind)
+    published = {}
     for source_id, value in readings.items():
         sensor_id = sensor_map.get(source_id)
         if sensor_id is None:
             continue
+        published[f"sensor_{sensor_id}"] = value
         insert_sensor_reading(sensor_id, value)
+    publish(published)
 
 
 def _sensor_id_map(kind: str) -> dict[str, int]:
@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+import zlib
+
+from app.services import telemetry
+from app.services.fan_metrics import latest_fan_readings, recent_cpu_fan_readings, recent_fan_readings
+from app.services.fans import list_fans
+from app.services.instrumentation import increment
+from app.services.metrics import latest_metrics, recent_metrics
+from app.services.sensors import latest_sensor_readings, list_sensors, recent_sensor_readings
+from app.services.settings import get_pump_channel
+from app.services.stream import current_status, dashboard_key
+
+HISTORY_LIMIT = 24
+CPU_FAN_MAX_RPM = 8000
+
+_lock = threading.Lock()
+_snapshot: tuple[tuple[int, int, int], str, bytes] | None = None
+_version = 0
+_subscribed = False
+_BOOT_TAG = f"{int(time.time()):x}"
+
+
+def dashboard_snapshot() -> tuple[str, bytes]:
+    global _snapshot
+    _subscribe()
+    status_version, status = current_status()
+    pump_channel = get_pump_channel()
+    fans = list_fans(active_only=True)
+    sensors = list_sensors()
+    layout = zlib.crc32(json.dumps([pump_channel, fans, sensors], sort_keys=True, default=str).encode())
+    with _lock:
+        key = (_version, status_version, layout)
+        if _snapshot is not None and _snapshot[0] == key:
+            increment("dashboard.snapshot.hits")
+            return _snapshot[1], _snapshot[2]
+    increment("dashboard.snapshot.misses")
+    etag = f'"{_BOOT_TAG}-{key[0]}-{key[1]}-{key[2]:08x}"'
+    snapshot = build_snapshot(status, pump_channel, fans, sensors)
+    body = json.dumps({"version": etag.strip('"'), **snapshot}, separators=(",", ":")).encode()
+    with _lock:
+        _snapshot = (key, etag, body)
+    return etag, body
+
+
+def build_snapshot(status: dict, pump_channel: int | None, fans: list[dict], sensors: list[dict]) -> dict:
+    readings = telemetry.snapshot()
+    return {
+        "metrics": _live_metrics(readings, pump_channel),
+        "fans": _live_fans(readings, fans, pump_channel),
+        "sensors": _live_sensors(readings, sensors),
+        "liquidctl": status["liquidctl"],
+        "wifi": status["wifi"],
+        "temperature": temperature_history(HISTORY_LIMIT, sensors),
+        "fan_percent": fan_percent_history(HISTORY_LIMIT, fans, pump_channel),
+    }
+
+
+def temperature_history(limit: int, sensors: list[dict]) -> dict:
+    metrics_rows = recent_metrics(limit=limit)
+    series = {
+        "cpu": [row["cpu_temp"] for row in metrics_rows],
+        "ambient": [row["ambient_temp"] for row in metrics_rows],
+    }
+    for sensor_id, values in recent_sensor_readings(limit=limit).items():
+        series[f"sensor_{sensor_id}"] = values
+    return {
+        "series": series,
+        "labels": [row.get("created_at", "") for row in metrics_rows],
+        "sensors": [{"id": sensor["id"], "name": sensor["name"]} for sensor in sensors],
+    }
+
+
+def fan_percent_history(limit: int, fans: list[dict], pump_channel: int | None) -> dict:
+    grouped: dict[int, list[int]] = {}
+    for row in reversed(recent_fan_readings(limit)):
+        grouped.setdefault(row["channel_index"], []).append(row["rpm"])
+    series: dict[str, list[float]] = {}
+    for fan in fans:
+        rpms = grouped.get(fan["channel_index"], [])[-limit:]
+        if fan["max_rpm"] and rpms:
+            series[f"fan_{fan['channel_index']}"] = [_percent_of(rpm, fan["max_rpm"]) for rpm in rpms]
+    series["cpu_fan"] = [
+        _percent_of(row["rpm"], CPU_FAN_MAX_RPM) for row in reversed(recent_cpu_fan_readings(limit))
+    ]
+    series["pump"] = []
+    if pump_channel is not None:
+        series["pump"] = [row["pump_percent"] for row in recent_metrics(limit=limit) if row["pump_percent"] is not None]
+    return {"series": series}
+
+
+def cpu_fan_percent(rpm: float) -> int:
+    return int(max(0, min(100, round(rpm / CPU_FAN_MAX_RPM * 100))))
+
+
+def _subscribe() -> None:
+    global _subscribed
+    with _lock:
+        if _subscribed:
+            return
+        _subscribed = True
+    telemetry.subscribe(_on_telemetry)
+
+
+def _on_telemetry(changed: set[str]) -> None:
+    global _version
+    if any(dashboard_key(key) for key in changed):
+        with _lock:
+            _version += 1
+
+
+def _live_metrics(readings: dict[str, float], pump_channel: int | None) -> dict:
+    stored = None
+    metrics = {}
+    for key in ("cpu_temp", "ambient_temp", "pump_percent"):
+        value = readings.get(key)
+        if value is None:
+            if stored is None:
+                stored = latest_metrics() or {}
+            value = stored.get(key)
+        metrics[key] = value
+    if pump_channel is None:
+        metrics["pump_percent"] = None
+    rpm = readings.get("cpu_fan_rpm")
+    if rpm is None:
+        rows = recent_cpu_fan_readings(limit=1)
+        rpm = rows[0]["rpm"] if rows else None
+    metrics["cpu_fan_percent"] = cpu_fan_percent(rpm) if rpm is not None else None
+    return metrics
+
+
+def _live_fans(readings: dict[str, float], fans: list[dict], pump_channel: int | None) -> list[dict]:
+    stored = None
+    payload = []
+    for fan in fans:
+        channel = fan["channel_index"]
+        rpm = readings.get(f"fan_{channel}_rpm")
+        if rpm is None:
+            if stored is None:
+                stored = {row["channel_index"]: row["rpm"] for row in latest_fan_readings()}
+            rpm = stored.get(channel)
+        payload.append(
+            {
+                "channel_index": channel,
+                "name": fan["name"],
+                "max_rpm": fan["max_rpm"],
+                "is_pump": channel == pump_channel,
+                "rpm": rpm,
+            }
+        )
+    return payload
+
+
+def _live_sensors(readings: dict[str, float], sensors: list[dict]) -> list[dict]:
+    stored = None
+    payload = []
+    for sensor in sensors:
+        temp_c = readings.get(f"sensor_{sensor['id']}")
+        if temp_c is None:
+            if stored is None:
+                stored = latest_sensor_readings()
+            temp_c = stored.get(sensor["id"])
+        payload.append({"id": sensor["id"], "name": sensor["name"], "unit": sensor["unit"], "temp_c": temp_c})
+    return payload
+
+
+def _percent_of(rpm: float, max_rpm: int) -> float:
+    return min((rpm / max_rpm) * 100, 100)
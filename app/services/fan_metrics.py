@@ -1,32 +1,34 @@
 from app.db import get_connection
+from app.services.compression import (
+    compression_mode,
+    distinct_keys,
+    latest_timestamp,
+    reconstruct,
+    reconstructs_linearly,
+    sample_times,
+    store_sample,
+    window_rows,
+)
 
+RPM_KINDS = {"rpm": "rpm"}
 
-def insert_fan_reading(channel_index: int, rpm: int) -> None:
+
+def insert_fan_reading(channel_index: int, rpm: int, created_at: str | None = None) -> None:
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO fan_readings (channel_index, rpm)
-            VALUES (?, ?)
-            """,
-            (channel_index, rpm),
-        )
+        store_sample(conn, "fan_readings", {"channel_index": channel_index}, {"rpm": rpm}, RPM_KINDS, created_at)
         conn.commit()
 
 
-def insert_cpu_fan_reading(rpm: int) -> None:
+def insert_cpu_fan_reading(rpm: int, created_at: str | None = None) -> None:
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO cpu_fan_readings (rpm)
-            VALUES (?)
-            """,
-            (rpm,),
-        )
+        store_sample(conn, "cpu_fan_readings", {}, {"rpm": rpm}, RPM_KINDS, created_at)
         conn.commit()
 
 
 def recent_fan_readings(limit: int = 24):
     with get_connection() as conn:
+        if compression_mode() != "off":
+            return _reconstructed_fan_readings(conn, limit)
         rows = conn.execute(
             """
             SELECT channel_index, rpm, created_at
@@ -41,6 +43,13 @@ def recent_fan_readings(limit: int = 24):
 
 def recent_cpu_fan_readings(limit: int = 24):
     with get_connection() as conn:
+        if compression_mode() != "off":
+            end_at = latest_timestamp(conn, "cpu_fan_readings")
+            if end_at is None or limit <= 0:
+                return []
+            times = sample_times(end_at, limit)
+            rows = window_rows(conn, "cpu_fan_readings", ["rpm"], times[0])
+            return list(reversed(reconstruct(rows, ["rpm"], times, reconstructs_linearly())))
         rows = conn.execute(
             """
             SELECT rpm, created_at
@@ -63,3 +72,19 @@ def latest_fan_readings():
             """
         ).fetchall()
         return [dict(row) for row in rows]
+
+
+def _reconstructed_fan_readings(conn, limit: int) -> list[dict]:
+    channels = distinct_keys(conn, "fan_readings", "channel_index")
+    ends = [latest_timestamp(conn, "fan_readings", {"channel_index": channel}) for channel in channels]
+    ends = [end_at for end_at in ends if end_at is not None]
+    if not ends or limit <= 0:
+        return []
+    times = sample_times(max(ends), limit)
+    readings = []
+    for channel in channels:
+        rows = window_rows(conn, "fan_readings", ["rpm"], times[0], {"channel_index": channel})
+        for point in reconstruct(rows, ["rpm"], times, reconstructs_linearly()):
+            readings.append({"channel_index": channel, "rpm": point["rpm"], "created_at": point["created_at"]})
+    readings.sort(key=lambda row: (row["created_at"], row["channel_index"]), reverse=True)
+    return readings
@@ -104,6 +104,32 @@ def update_fan_max_rpm(channel_index: int, max_rpm: int) -> None:
         conn.commit()
 
 
+def replace_fan_calibration(channel_index: int, points: dict[int, int]) -> None:
+    with get_connection() as conn:
+        conn.execute("DELETE FROM fan_calibration WHERE channel_index = ?", (channel_index,))
+        conn.executemany(
+            """
+            INSERT INTO fan_calibration (channel_index, duty, rpm)
+            VALUES (?, ?, ?)
+            """,
+            [(channel_index, duty, rpm) for duty, rpm in sorted(points.items())],
+        )
+        conn.commit()
+
+
+def get_fan_calibration(channel_index: int) -> list[tuple[int, int]]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT duty, rpm FROM fan_calibration
+            WHERE channel_index = ?
+            ORDER BY duty ASC
+            """,
+            (channel_index,),
+        ).fetchall()
+        return [(row["duty"], row["rpm"]) for row in rows]
+
+
 def set_fan_name_by_channel(channel_index: int, name: str) -> None:
     with get_connection() as conn:
         conn.execute(
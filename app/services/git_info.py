@@ -1,16 +1,106 @@
 import os
+import re
 import subprocess
-from datetime import datetime
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from zoneinfo import ZoneInfo
 from typing import Tuple
 
 GIT_DIR_ENV = "HYDROX_GIT_DIR"
+DEFAULT_GIT_DIR = ".git"
+
+_git_status: Tuple[str, str] | None = None
+_COMMITTER = re.compile(rb"^committer .* (\d+) ([+-])(\d{2})(\d{2})$", re.MULTILINE)
+
+
+def get_git_status() -> Tuple[str, str]:
+    global _git_status
+    if _git_status is None:
+        _git_status = _read_git_status()
+    return _git_status
+
+
+def _read_git_status() -> Tuple[str, str]:
+    git_dir = _resolve_git_dir(Path(os.getenv(GIT_DIR_ENV) or DEFAULT_GIT_DIR))
+    branch, commit = _read_head(git_dir)
+    commit_date = None
+    if commit:
+        commit_date = _read_commit_date(git_dir, commit)
+    if commit_date is None and branch:
+        commit_date = _parse_iso(_run_git(["show", "-s", "--format=%cI", "HEAD"]))
+    if commit_date is None:
+        return (branch or "unknown"), "unknown"
+    tzinfo = ZoneInfo("America/Chicago")
+    return (branch or "unknown"), commit_date.astimezone(tzinfo).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+
+def _resolve_git_dir(git_dir: Path) -> Path:
+    try:
+        if git_dir.is_file():
+            pointer = git_dir.read_text(encoding="utf-8").strip()
+            if pointer.startswith("gitdir:"):
+                return (git_dir.parent / pointer[len("gitdir:") :].strip()).resolve()
+    except OSError:
+        pass
+    return git_dir
+
+
+def _read_head(git_dir: Path) -> tuple[str | None, str | None]:
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None, None
+    if not head.startswith("ref:"):
+        return "HEAD", head or None
+    ref = head[len("ref:") :].strip()
+    branch = ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else ref
+    return branch, _read_ref(git_dir, ref)
+
+
+def _read_ref(git_dir: Path, ref: str) -> str | None:
+    try:
+        return (git_dir / ref).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        pass
+    try:
+        packed = (git_dir / "packed-refs").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    for line in packed.splitlines():
+        if line.startswith(("#", "^")):
+            continue
+        parts = line.split()
+        if len(parts) == 2 and parts[1] == ref:
+            return parts[0]
+    return None
+
+
+def _read_commit_date(git_dir: Path, commit: str) -> datetime | None:
+    try:
+        data = zlib.decompress((git_dir / "objects" / commit[:2] / commit[2:]).read_bytes())
+    except (OSError, zlib.error):
+        return None
+    match = _COMMITTER.search(data)
+    if match is None:
+        return None
+    sign = -1 if match.group(2) == b"-" else 1
+    offset = timedelta(hours=int(match.group(3)), minutes=int(match.group(4))) * sign
+    return datetime.fromtimestamp(int(match.group(1)), timezone(offset))
+
+
+def _parse_iso(value: str) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
 
 
 def _run_git(args: list[str]) -> str:
     git_dir = os.getenv(GIT_DIR_ENV)
     cmd = ["git"]
-    env = os.environ.copy()
     if git_dir:
         cmd.extend(["--git-dir", git_dir])
     cmd.extend(args)
@@ -21,16 +111,3 @@ def _run_git(args: list[str]) -> str:
     if result.returncode != 0:
         return ""
     return result.stdout.strip()
-
-
-def get_git_status() -> Tuple[str, str]:
-    branch = _run_git(["rev-parse", "--abbrev-ref", "HEAD"])
-    commit_date = _run_git(["show", "-s", "--format=%cI", "HEAD"])
-    if commit_date:
-        try:
-            dt = datetime.fromisoformat(commit_date.replace("Z", "+00:00"))
-            tzinfo = ZoneInfo("America/Chicago")
-            commit_date = dt.astimezone(tzinfo).strftime("%Y-%m-%d %H:%M:%S %Z")
-        except ValueError:
-            pass
-    return (branch or "unknown"), (commit_date or "unknown")
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from app.services import telemetry
+from app.services.compression import SAMPLE_SECONDS
+from app.services.instrumentation import counter_value, increment
+from app.services.logger import get_logger
+
+LEVELS = ("normal", "elevated", "critical")
+MULTIPLIERS = (1, 2, 4)
+ELEVATED_TEMP_C = 75.0
+CRITICAL_TEMP_C = 80.0
+TEMP_HYSTERESIS_C = 3.0
+ELEVATED_LAG_SECONDS = 0.25
+CRITICAL_LAG_SECONDS = 1.0
+RECOVERY_SECONDS = 60
+HISTORY_TRANSITIONS = 20
+STALE_INPUT_SECONDS = 3 * SAMPLE_SECONDS
+
+_lock = threading.Lock()
+_governor: "Governor | None" = None
+_level = 0
+_THROTTLING_NOW = 0x2 | 0x4 | 0x8
+_THROTTLED_NOW = 0x4
+_SAMPLERS = ("cpu", "fan", "sensor", "wifi", "host")
+_EVALUATE_SECONDS = 5
+_LAG_PROBE_SECONDS = 0.5
+
+
+class Governor:
+    def __init__(self) -> None:
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._since = time.time()
+        self._calm_since: float | None = None
+        self._reasons: list[str] = []
+        self._transitions: deque[dict] = deque(maxlen=HISTORY_TRANSITIONS)
+        self._overruns = _overrun_total()
+        self._lag = 0.0
+        self._lag_peak = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        if self._loop is not None:
+            due = time.monotonic() + _LAG_PROBE_SECONDS
+            self._loop.call_later(_LAG_PROBE_SECONDS, self._probe, due)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join(timeout=2)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "level": LEVELS[_level],
+                "multiplier": MULTIPLIERS[_level],
+                "since": self._since,
+                "reasons": list(self._reasons),
+                "loop_lag_ms": round(self._lag * 1000, 1),
+                "transitions": list(reversed(self._transitions)),
+            }
+
+    def evaluate(self) -> None:
+        global _level
+        with self._lock:
+            lag, self._lag_peak = self._lag_peak, 0.0
+            self._lag = lag
+        overruns = _overrun_total()
+        new_overruns, self._overruns = overruns - self._overruns, overruns
+        target, reasons = _pressure(
+            telemetry.latest("cpu_temp", STALE_INPUT_SECONDS),
+            telemetry.latest("host_throttled", scaled(STALE_INPUT_SECONDS)),
+            new_overruns,
+            lag,
+            _level,
+        )
+        now = time.monotonic()
+        level = _level
+        if target > level:
+            level = target
+            self._calm_since = None
+        elif target < level:
+            if self._calm_since is None:
+                self._calm_since = now
+            if now - self._calm_since >= RECOVERY_SECONDS:
+                level -= 1
+                self._calm_since = now if level > target else None
+        else:
+            self._calm_since = None
+        with self._lock:
+            if target > 0:
+                self._reasons = reasons
+            if level == _level:
+                return
+            transition = {"at": time.time(), "from": LEVELS[_level], "to": LEVELS[level], "reasons": reasons}
+            self._transitions.append(transition)
+            self._since = transition["at"]
+            if level == 0:
+                self._reasons = []
+            _level = level
+        increment(f"governor.{LEVELS[level]}")
+        log = get_logger().warning if level > 0 else get_logger().info
+        log(
+            "load governor %s -> %s (%s), non-critical intervals x%d",
+            transition["from"],
+            transition["to"],
+            ", ".join(reasons) or "recovered",
+            MULTIPLIERS[level],
+        )
+
+    def _run(self) -> None:
+        while not self._stopping.wait(_EVALUATE_SECONDS):
+            try:
+                self.evaluate()
+            except Exception:
+                get_logger().exception("load governor tick failed")
+
+    def _probe(self, due: float) -> None:
+        if self._stopping.is_set():
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._lag_peak = max(self._lag_peak, now - due)
+        self._loop.call_later(_LAG_PROBE_SECONDS, self._probe, now + _LAG_PROBE_SECONDS)
+
+
+def scaled(seconds: float) -> float:
+    return seconds * MULTIPLIERS[_level]
+
+
+def under_pressure() -> bool:
+    return _level > 0
+
+
+def governor_status() -> dict:
+    governor = _governor
+    if governor is None:
+        return {
+            "level": LEVELS[_level],
+            "multiplier": MULTIPLIERS[_level],
+            "since": None,
+            "reasons": [],
+            "loop_lag_ms": 0.0,
+            "transitions": [],
+        }
+    return governor.status()
+
+
+def start_governor() -> None:
+    global _governor
+    with _lock:
+        if _governor is None:
+            _governor = Governor()
+            _governor.start()
+
+
+def shutdown_governor() -> None:
+    global _governor, _level
+    with _lock:
+        governor, _governor = _governor, None
+    if governor is not None:
+        governor.stop()
+    _level = 0
+
+
+def _pressure(
+    cpu_temp: float | None, throttled: float | None, overruns: int, lag: float, level: int
+) -> tuple[int, list[str]]:
+    target = 0
+    reasons = []
+    elevated_temp = ELEVATED_TEMP_C - (TEMP_HYSTERESIS_C if level >= 1 else 0)
+    critical_temp = CRITICAL_TEMP_C - (TEMP_HYSTERESIS_C if level >= 2 else 0)
+    if cpu_temp is not None and cpu_temp >= elevated_temp:
+        target = 2 if cpu_temp >= critical_temp else 1
+        reasons.append(f"cpu {cpu_temp:.1f}°C")
+    flags = int(throttled or 0)
+    if flags & _THROTTLING_NOW:
+        target = max(target, 2 if flags & _THROTTLED_NOW else 1)
+        reasons.append(f"throttled 0x{flags:x}")
+    if overruns:
+        target = max(target, 2 if overruns > 1 else 1)
+        reasons.append(f"{overruns} sampler overrun{'s' if overruns > 1 else ''}")
+    if lag >= ELEVATED_LAG_SECONDS:
+        target = max(target, 2 if lag >= CRITICAL_LAG_SECONDS else 1)
+        reasons.append(f"event loop lag {lag * 1000:.0f} ms")
+    return target, reasons
+
+
+def _overrun_total() -> int:
+    return sum(counter_value(f"sampler.{name}.overrun") for name in _SAMPLERS)
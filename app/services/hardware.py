@@ -0,0 +1,255 @@
+import atexit
+import glob
+import json
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from app.services.env import env_float
+from app.services.instrumentation import observe, timed
+from app.services.logger import get_logger
+
+HARDWARE_ENV = "HYDROX_HARDWARE"
+TAPE_ENV = "HYDROX_HARDWARE_TAPE"
+TIMEOUT_ENV = "HYDROX_HARDWARE_TIMEOUT_SECONDS"
+DEFAULT_TAPE = "/data/hardware-tape.json"
+DEFAULT_TIMEOUT_SECONDS = 10.0
+HARDWARE_MODES = ("real", "sim", "record", "replay")
+
+_TAPE_LIMIT = 200
+_TAPE_FLUSH_SECONDS = 5
+
+_tape_lock = threading.Lock()
+_tape: dict | None = None
+_tape_cursors: dict[str, int] = {}
+_tape_flushed_at = 0.0
+_mode_logged = False
+
+
+def hardware_mode() -> str:
+    global _mode_logged
+    mode = os.getenv(HARDWARE_ENV, "real").strip().lower() or "real"
+    if mode not in HARDWARE_MODES:
+        if not _mode_logged:
+            get_logger().error("unknown %s=%s, using real hardware", HARDWARE_ENV, mode)
+            _mode_logged = True
+        return "real"
+    return mode
+
+
+def is_simulated() -> bool:
+    return hardware_mode() in ("sim", "replay")
+
+
+def run_command(cmd: list[str]) -> subprocess.CompletedProcess:
+    metric = _command_metric(cmd)
+    started = time.perf_counter()
+    try:
+        result = _run_command(cmd)
+    except subprocess.TimeoutExpired:
+        elapsed = time.perf_counter() - started
+        observe(metric, elapsed, timeout=True)
+        return subprocess.CompletedProcess(cmd, 124, "", f"timed out after {elapsed:.1f}s")
+    except Exception as exc:
+        observe(metric, time.perf_counter() - started, ok=False, error=str(exc))
+        raise
+    error = None
+    if result.returncode != 0:
+        stderr_lines = (result.stderr or "").strip().splitlines()
+        error = stderr_lines[0] if stderr_lines else f"exit {result.returncode}"
+    observe(metric, time.perf_counter() - started, ok=result.returncode == 0, error=error)
+    return result
+
+
+def _run_command(cmd: list[str]) -> subprocess.CompletedProcess:
+    mode = hardware_mode()
+    if mode == "sim":
+        return _simulator().run_command(cmd)
+    if mode == "replay":
+        recorded = _replay("commands", _command_key(cmd))
+        if recorded is not None:
+            return subprocess.CompletedProcess(
+                cmd, recorded["returncode"], recorded["stdout"], recorded["stderr"]
+            )
+        return _simulator().run_command(cmd)
+    started = time.monotonic()
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=_command_timeout())
+    if mode == "record":
+        _record(
+            "commands",
+            _command_key(cmd),
+            {
+                "returncode": result.returncode,
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+                "latency": round(time.monotonic() - started, 4),
+            },
+        )
+    return result
+
+
+def read_text(path: str | Path) -> str:
+    key = str(path)
+    with timed(_file_metric(key)):
+        return _read_text(key)
+
+
+def _read_text(key: str) -> str:
+    mode = hardware_mode()
+    if mode == "sim":
+        return _simulator().read_text(key)
+    if mode == "replay":
+        recorded = _replay("files", key)
+        if recorded is not None:
+            return recorded
+        return _simulator().read_text(key)
+    content = Path(key).read_text(encoding="utf-8")
+    if mode == "record":
+        _record("files", key, content)
+    return content
+
+
+def glob_paths(pattern: str) -> list[str]:
+    mode = hardware_mode()
+    if mode == "sim":
+        return _simulator().glob(pattern)
+    if mode == "replay":
+        recorded = _replay("globs", pattern)
+        if recorded is not None:
+            return list(recorded)
+        return _simulator().glob(pattern)
+    paths = sorted(glob.glob(pattern))
+    if mode == "record":
+        _record("globs", pattern, paths)
+    return paths
+
+
+def open_smbus(bus: int):
+    if is_simulated():
+        return _simulator().smbus(bus)
+    from smbus2 import SMBus
+
+    return SMBus(bus)
+
+
+def open_oled_device(port: int, address: int, width: int = 128, height: int = 64, bus=None):
+    from luma.core.interface.serial import i2c
+    from luma.oled.device import ssd1306
+
+    if bus is None and is_simulated():
+        bus = _simulator().smbus(port)
+    if bus is not None:
+        serial = i2c(bus=bus, address=address)
+    else:
+        serial = i2c(port=port, address=address)
+    return ssd1306(serial, width=width, height=height)
+
+
+def flush_tape() -> None:
+    with _tape_lock:
+        if _tape is None or hardware_mode() != "record":
+            return
+        _write_tape(_tape)
+
+
+atexit.register(flush_tape)
+
+
+def _simulator():
+    from app.services.simulator import get_simulator
+
+    return get_simulator()
+
+
+def _command_timeout() -> float | None:
+    timeout = env_float(TIMEOUT_ENV, DEFAULT_TIMEOUT_SECONDS)
+    return timeout if timeout > 0 else None
+
+
+def _command_metric(cmd: list[str]) -> str:
+    if not cmd:
+        return "hardware.unknown"
+    name = os.path.basename(cmd[0])
+    if name in ("liquidctl", "vcgencmd"):
+        action = next((arg for arg in cmd[1:] if not arg.startswith("-")), None)
+        if action:
+            return f"hardware.{name}.{action}"
+    return f"hardware.{name}"
+
+
+def _file_metric(path: str) -> str:
+    if path.startswith("/sys/bus/w1/"):
+        return "hardware.w1"
+    if path.startswith("/sys/class/hwmon/"):
+        return "hardware.hwmon"
+    if path.startswith("/sys/class/thermal/"):
+        return "hardware.thermal"
+    return "hardware.file"
+
+
+def _command_key(cmd: list[str]) -> str:
+    if not cmd:
+        return ""
+    return " ".join([os.path.basename(cmd[0])] + list(cmd[1:]))
+
+
+def _tape_path() -> str:
+    return os.getenv(TAPE_ENV, DEFAULT_TAPE)
+
+
+def _load_tape() -> dict:
+    global _tape
+    if _tape is not None:
+        return _tape
+    path = Path(_tape_path())
+    tape: dict = {"commands": {}, "files": {}, "globs": {}}
+    if path.exists():
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+            for section in tape:
+                tape[section].update(loaded.get(section, {}))
+        except (OSError, ValueError):
+            get_logger().exception("hardware tape unreadable at %s", path)
+    _tape = tape
+    return tape
+
+
+def _record(section: str, key: str, value) -> None:
+    global _tape_flushed_at
+    with _tape_lock:
+        tape = _load_tape()
+        entries = tape[section].setdefault(key, [])
+        entries.append(value)
+        if len(entries) > _TAPE_LIMIT:
+            del entries[0]
+        now = time.monotonic()
+        if now - _tape_flushed_at >= _TAPE_FLUSH_SECONDS:
+            _write_tape(tape)
+            _tape_flushed_at = now
+
+
+def _replay(section: str, key: str):
+    with _tape_lock:
+        entries = _load_tape()[section].get(key)
+        if not entries:
+            return None
+        cursor_key = f"{section}:{key}"
+        cursor = _tape_cursors.get(cursor_key, 0)
+        _tape_cursors[cursor_key] = cursor + 1
+        entry = entries[cursor % len(entries)]
+    if section == "commands" and entry.get("latency"):
+        time.sleep(entry["latency"])
+    return entry
+
+
+def _write_tape(tape: dict) -> None:
+    path = Path(_tape_path())
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(tape, indent=1), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        get_logger().exception("hardware tape write failed at %s", path)
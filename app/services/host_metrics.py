@@ -0,0 +1,283 @@
+import os
+import threading
+import time
+
+from app.db import get_connection
+from app.services.compression import (
+    SAMPLE_SECONDS,
+    compression_mode,
+    distinct_keys,
+    latest_timestamp,
+    reconstruct,
+    reconstructs_linearly,
+    sample_times,
+    store_sample,
+    window_rows,
+)
+from app.services.hardware import is_simulated, run_command
+from app.services.logger import get_logger
+
+HOST_PREFIX = "host_"
+SECTOR_BYTES = 512
+THROTTLE_COMMAND_SECONDS = 30
+
+_lock = threading.Lock()
+_sampler: "HostSampler | None" = None
+_THROTTLE_PATHS = (
+    "/sys/devices/platform/soc/soc:firmware/get_throttled",
+    "/sys/devices/platform/soc@107c000000/soc@107c000000:firmware/get_throttled",
+)
+_CPUFREQ_DIR = "/sys/devices/system/cpu/cpufreq"
+_DISK_PREFIXES = ("loop", "ram", "zram")
+_KINDS = (
+    ("_percent", "percent"),
+    ("_mb", "megabytes"),
+    ("_kbps", "rate"),
+    ("_mhz", "frequency"),
+)
+
+
+class ProcReader:
+    def __init__(self, path: str, size: int = 4096) -> None:
+        self.path = path
+        self._buffer = bytearray(size)
+        self._file = None
+
+    def read(self) -> bytes:
+        if self._file is None:
+            self._file = open(self.path, "rb", buffering=0)
+        while True:
+            self._file.seek(0)
+            size = 0
+            with memoryview(self._buffer) as view:
+                while size < len(view):
+                    count = self._file.readinto(view[size:])
+                    if not count:
+                        return bytes(view[:size])
+                    size += count
+            self._buffer = bytearray(len(self._buffer) * 2)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class HostSampler:
+    def __init__(self) -> None:
+        self._readers: dict[str, ProcReader] = {}
+        self._missing: set[str] = set()
+        self._cpu: dict[bytes, tuple[int, int, int]] = {}
+        self._disks: dict[str, tuple[int, int, int]] = {}
+        self._disk_names = _block_devices()
+        self._disk_at: float | None = None
+        self._policies = _cpufreq_policies()
+        self._throttle_path = next((path for path in _THROTTLE_PATHS if os.path.exists(path)), None)
+        self._throttled: int | None = None
+        self._throttled_at: float | None = None
+
+    def sample(self) -> dict[str, float]:
+        values: dict[str, float] = {}
+        sources = (
+            ("/proc/stat", self._cpu_values),
+            ("/proc/loadavg", self._load_values),
+            ("/proc/meminfo", self._memory_values),
+            ("/proc/diskstats", self._disk_values),
+        )
+        for path, collect in sources:
+            data = self._read(path)
+            if data is not None:
+                collect(data, values)
+        self._frequency_values(values)
+        throttled = self._read_throttled()
+        if throttled is not None:
+            values["throttled"] = throttled
+        return values
+
+    def close(self) -> None:
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    def _read(self, path: str) -> bytes | None:
+        if path in self._missing:
+            return None
+        reader = self._readers.get(path)
+        if reader is None:
+            reader = self._readers[path] = ProcReader(path)
+        try:
+            return reader.read()
+        except OSError:
+            get_logger().warning("host metrics: %s is not readable, skipping it", path)
+            self._missing.add(path)
+            reader.close()
+            return None
+
+    def _cpu_values(self, data: bytes, values: dict[str, float]) -> None:
+        for line in data.splitlines():
+            if not line.startswith(b"cpu"):
+                break
+            fields = line.split()
+            counters = [int(value) for value in fields[1:8]]
+            idle = counters[3]
+            iowait = counters[4] if len(counters) > 4 else 0
+            total = sum(counters)
+            previous = self._cpu.get(fields[0])
+            self._cpu[fields[0]] = (total, idle, iowait)
+            if previous is None or total <= previous[0]:
+                continue
+            elapsed = total - previous[0]
+            busy = elapsed - (idle - previous[1]) - (iowait - previous[2])
+            name = "cpu" if fields[0] == b"cpu" else f"cpu{fields[0][3:].decode()}"
+            values[f"{name}_percent"] = round(max(busy, 0) / elapsed * 100, 1)
+            if name == "cpu":
+                values["cpu_iowait_percent"] = round(max(iowait - previous[2], 0) / elapsed * 100, 1)
+
+    def _load_values(self, data: bytes, values: dict[str, float]) -> None:
+        fields = data.split()
+        for name, raw in zip(("load_1", "load_5", "load_15"), fields[:3]):
+            values[name] = float(raw)
+
+    def _memory_values(self, data: bytes, values: dict[str, float]) -> None:
+        for line in data.splitlines():
+            if line.startswith(b"MemAvailable:"):
+                values["mem_available_mb"] = round(int(line.split()[1]) / 1024, 1)
+                return
+
+    def _disk_values(self, data: bytes, values: dict[str, float]) -> None:
+        now = time.monotonic()
+        elapsed = now - self._disk_at if self._disk_at is not None else None
+        self._disk_at = now
+        for line in data.splitlines():
+            fields = line.split()
+            if len(fields) < 13:
+                continue
+            name = fields[2].decode()
+            if name not in self._disk_names:
+                continue
+            counters = (int(fields[5]), int(fields[9]), int(fields[12]))
+            previous = self._disks.get(name)
+            self._disks[name] = counters
+            if previous is None or not elapsed:
+                continue
+            read_kb = max(counters[0] - previous[0], 0) * SECTOR_BYTES / 1024
+            written_kb = max(counters[1] - previous[1], 0) * SECTOR_BYTES / 1024
+            values[f"disk_{name}_read_kbps"] = round(read_kb / elapsed, 1)
+            values[f"disk_{name}_write_kbps"] = round(written_kb / elapsed, 1)
+            values[f"disk_{name}_busy_percent"] = round(min(max(counters[2] - previous[2], 0) / 10 / elapsed, 100), 1)
+
+    def _frequency_values(self, values: dict[str, float]) -> None:
+        for policy in self._policies:
+            data = self._read(f"{_CPUFREQ_DIR}/{policy}/scaling_cur_freq")
+            if data:
+                values[f"cpufreq{policy[len('policy'):]}_mhz"] = round(int(data) / 1000)
+
+    def _read_throttled(self) -> int | None:
+        if self._throttle_path is not None and not is_simulated():
+            data = self._read(self._throttle_path)
+            if data is not None:
+                return int(data.strip() or b"0", 16)
+        now = time.monotonic()
+        if self._throttled_at is not None and now - self._throttled_at < THROTTLE_COMMAND_SECONDS:
+            return self._throttled
+        self._throttled_at = now
+        try:
+            result = run_command(["vcgencmd", "get_throttled"])
+        except FileNotFoundError:
+            return None
+        if result.returncode == 0 and "=" in result.stdout:
+            try:
+                self._throttled = int(result.stdout.split("=", 1)[1].strip(), 16)
+            except ValueError:
+                self._throttled = None
+        return self._throttled
+
+
+def sample_host() -> dict[str, float]:
+    global _sampler
+    with _lock:
+        if _sampler is None:
+            _sampler = HostSampler()
+        return _sampler.sample()
+
+
+def host_kind(series: str) -> str:
+    if series.startswith("load_"):
+        return "load"
+    if series == "throttled":
+        return "flags"
+    for suffix, kind in _KINDS:
+        if series.endswith(suffix):
+            return kind
+    return "percent"
+
+
+def insert_host_readings(values: dict[str, float], created_at: str | None = None) -> None:
+    if not values:
+        return
+    with get_connection() as conn:
+        for series, value in values.items():
+            store_sample(conn, "host_readings", {"series": series}, {"value": value}, {"value": host_kind(series)}, created_at)
+        conn.commit()
+
+
+def recent_host_readings(limit: int = 24, series: list[str] | None = None) -> dict[str, list[float]]:
+    with get_connection() as conn:
+        if compression_mode() != "off":
+            return _reconstructed_host_readings(conn, limit, series)
+        rows = conn.execute(
+            """
+            SELECT series, value
+            FROM host_readings
+            WHERE created_at >= datetime('now', ?)
+            ORDER BY created_at DESC, id DESC
+            """,
+            (f"-{limit * SAMPLE_SECONDS * 2} seconds",),
+        ).fetchall()
+        grouped: dict[str, list[float]] = {}
+        for row in rows:
+            if series is not None and row["series"] not in series:
+                continue
+            values = grouped.setdefault(row["series"], [])
+            if len(values) < limit:
+                values.append(row["value"])
+        return {name: list(reversed(values)) for name, values in grouped.items()}
+
+
+def shutdown_host_metrics() -> None:
+    global _sampler
+    with _lock:
+        sampler, _sampler = _sampler, None
+    if sampler is not None:
+        sampler.close()
+
+
+def _reconstructed_host_readings(conn, limit: int, series: list[str] | None) -> dict[str, list[float]]:
+    names = series if series is not None else distinct_keys(conn, "host_readings", "series")
+    ends = [latest_timestamp(conn, "host_readings", {"series": name}) for name in names]
+    ends = [end_at for end_at in ends if end_at is not None]
+    if not ends or limit <= 0:
+        return {}
+    times = sample_times(max(ends), limit)
+    grouped: dict[str, list[float]] = {}
+    for name in names:
+        rows = window_rows(conn, "host_readings", ["value"], times[0], {"series": name})
+        points = reconstruct(rows, ["value"], times, reconstructs_linearly())
+        if points:
+            grouped[name] = [point["value"] for point in points]
+    return grouped
+
+
+def _block_devices() -> set[str]:
+    try:
+        names = os.listdir("/sys/block")
+    except OSError:
+        return set()
+    return {name for name in names if not name.startswith(_DISK_PREFIXES)}
+
+
+def _cpufreq_policies() -> list[str]:
+    try:
+        return sorted(name for name in os.listdir(_CPUFREQ_DIR) if name.startswith("policy"))
+    except OSError:
+        return []
@@ -0,0 +1,220 @@
+import json
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from app.db import get_connection
+from app.services import telemetry
+from app.services.compression import format_timestamp
+from app.services.instrumentation import increment, timed
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+INGEST_PREFIX = "ingest_"
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_POINTS = 100_000
+MAX_SERIES = 1000
+MAX_AGE_SECONDS = 7 * 24 * 3600
+MAX_FUTURE_SECONDS = 300
+MAX_REPORTED_ERRORS = 20
+SERIES_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.:/-]{0,63}$")
+BODY_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonlines": "ndjson",
+    "application/json": "json",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+}
+
+_lock = threading.Lock()
+
+
+@dataclass
+class IngestResult:
+    accepted: int = 0
+    rejected: int = 0
+    registered: list[str] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+    def reject(self, index: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"index": index, "error": error})
+
+    def as_dict(self) -> dict:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "registered": self.registered,
+            "errors": self.errors,
+        }
+
+
+def body_format(content_type: str) -> str | None:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    body_type = BODY_FORMATS.get(media_type)
+    if body_type == "msgpack" and msgpack is None:
+        return None
+    return body_type
+
+
+def ingest_body(body: bytes, body_type: str) -> IngestResult:
+    result = IngestResult()
+    with timed("ingest.batch"):
+        points = _validate(_decode(body, body_type, result), result, time.time())
+        if points:
+            write_points(points, result)
+    increment("ingest.accepted", result.accepted)
+    increment("ingest.rejected", result.rejected)
+    return result
+
+
+def write_points(points: list[tuple[int, str, float, float]], result: IngestResult) -> None:
+    latest: dict[str, tuple[float, float]] = {}
+    for _, name, sample_at, value in points:
+        if name not in latest or sample_at >= latest[name][0]:
+            latest[name] = (sample_at, value)
+    with _lock, get_connection() as conn:
+        series_ids = _series_ids(conn)
+        unknown = sorted(name for name in latest if name not in series_ids)
+        if unknown:
+            room = max(MAX_SERIES - len(series_ids), 0)
+            conn.executemany("INSERT INTO ingest_series (name) VALUES (?)", [(name,) for name in unknown[:room]])
+            series_ids = _series_ids(conn)
+            result.registered = [name for name in unknown if name in series_ids]
+        rows = []
+        for index, name, sample_at, value in points:
+            series_id = series_ids.get(name)
+            if series_id is None:
+                result.reject(index, f"series limit of {MAX_SERIES} reached")
+                continue
+            rows.append((series_id, value, format_timestamp(sample_at)))
+        latest = {name: point for name, point in latest.items() if name in series_ids}
+        conn.executemany(
+            "INSERT INTO ingest_readings (series_id, value, created_at) VALUES (?, ?, ?)",
+            rows,
+        )
+        conn.executemany(
+            """
+            UPDATE ingest_series
+            SET last_value = ?, last_seen_at = ?
+            WHERE id = ? AND (last_seen_at IS NULL OR last_seen_at <= ?)
+            """,
+            [
+                (value, format_timestamp(sample_at), series_ids[name], format_timestamp(sample_at))
+                for name, (sample_at, value) in latest.items()
+            ],
+        )
+        conn.commit()
+    result.accepted = len(rows)
+    telemetry.publish({f"{INGEST_PREFIX}{name}": value for name, (_, value) in latest.items()})
+
+
+def list_ingest_series() -> list[dict]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT name, last_value, last_seen_at, created_at
+            FROM ingest_series
+            ORDER BY name
+            """
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def recent_ingest_readings(name: str, limit: int = 24) -> list[dict]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT r.value, r.created_at
+            FROM ingest_readings r
+            JOIN ingest_series s ON s.id = r.series_id
+            WHERE s.name = ?
+            ORDER BY r.created_at DESC, r.id DESC
+            LIMIT ?
+            """,
+            (name, limit),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+
+def _decode(body: bytes, body_type: str, result: IngestResult) -> list:
+    if body_type == "ndjson":
+        items = []
+        for index, line in enumerate(body.splitlines()):
+            if not line.strip():
+                items.append(None)
+                continue
+            try:
+                items.append(json.loads(line))
+            except (ValueError, RecursionError):
+                items.append(None)
+                result.reject(index, "line is not valid JSON")
+        return items
+    try:
+        items = json.loads(body) if body_type == "json" else msgpack.unpackb(body, raw=False)
+    except (ValueError, RecursionError) as exc:
+        raise ValueError(f"Body is not valid {body_type}: {exc}") from exc
+    if isinstance(items, dict) and isinstance(items.get("points"), list):
+        items = items["points"]
+    if not isinstance(items, list):
+        raise ValueError("Body must be a list of points.")
+    return items
+
+
+def _validate(items: list, result: IngestResult, now: float) -> list[tuple[int, str, float, float]]:
+    if len(items) > MAX_POINTS:
+        raise ValueError(f"At most {MAX_POINTS} points are accepted per request.")
+    points = []
+    for index, item in enumerate(items):
+        if item is None:
+            continue
+        if isinstance(item, dict):
+            name, sample_at, value = item.get("series"), item.get("ts"), item.get("value")
+        elif isinstance(item, (list, tuple)) and len(item) == 3:
+            name, sample_at, value = item
+        else:
+            result.reject(index, "point must be {series, ts, value} or [series, ts, value]")
+            continue
+        if not isinstance(name, str) or not SERIES_PATTERN.match(name):
+            result.reject(index, "series must be 1-64 letters, digits or _.:/-")
+            continue
+        value = _finite_float(value)
+        if value is None:
+            result.reject(index, "value must be a finite number")
+            continue
+        if msgpack is not None and isinstance(sample_at, msgpack.Timestamp):
+            sample_at = sample_at.to_unix()
+        if sample_at is None:
+            sample_at = now
+        else:
+            sample_at = _finite_float(sample_at)
+            if sample_at is None:
+                result.reject(index, "ts must be epoch seconds or null")
+                continue
+        if sample_at > now + MAX_FUTURE_SECONDS or sample_at < now - MAX_AGE_SECONDS:
+            result.reject(index, "ts is outside the accepted window")
+            continue
+        points.append((index, name, sample_at, value))
+    return points
+
+
+def _finite_float(value) -> float | None:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except OverflowError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _series_ids(conn) -> dict[str, int]:
+    return {row["name"]: row["id"] for row in conn.execute("SELECT id, name FROM ingest_series")}
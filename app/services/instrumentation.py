@@ -0,0 +1,190 @@
+import bisect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_STATEMENT_CACHE_LIMIT = 512
+_STATEMENT_TABLE_PATTERNS = {
+    "select": re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE),
+    "delete": re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE),
+    "insert": re.compile(r"\bINTO\s+(\w+)", re.IGNORECASE),
+    "replace": re.compile(r"\bINTO\s+(\w+)", re.IGNORECASE),
+    "update": re.compile(r"^\s*UPDATE\s+(?:OR\s+\w+\s+)?(\w+)", re.IGNORECASE),
+    "create": re.compile(r"\b(?:TABLE|INDEX)\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE),
+    "alter": re.compile(r"\bTABLE\s+(\w+)", re.IGNORECASE),
+    "pragma": re.compile(r"^\s*PRAGMA\s+(\w+)", re.IGNORECASE),
+}
+
+
+@dataclass
+class LatencyStats:
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: int = 0
+    timeouts: int = 0
+    last_success: float | None = None
+    last_error: float | None = None
+    last_error_message: str | None = None
+
+
+_lock = threading.Lock()
+_stats: dict[str, LatencyStats] = {}
+_counters: dict[str, int] = {}
+_statement_metrics: dict[str, str] = {}
+_started_at = time.time()
+
+
+def observe(
+    name: str,
+    seconds: float,
+    ok: bool = True,
+    timeout: bool = False,
+    error: str | None = None,
+) -> None:
+    elapsed_ms = seconds * 1000
+    index = bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)
+    now = time.time()
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = LatencyStats()
+        stats.buckets[index] += 1
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        if elapsed_ms > stats.max_ms:
+            stats.max_ms = elapsed_ms
+        if timeout or not ok:
+            if timeout:
+                stats.timeouts += 1
+            else:
+                stats.errors += 1
+            stats.last_error = now
+            stats.last_error_message = (error or ("timeout" if timeout else "error"))[:200]
+        else:
+            stats.last_success = now
+
+
+@contextmanager
+def timed(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        observe(name, time.perf_counter() - started, ok=False, error=str(exc) or exc.__class__.__name__)
+        raise
+    observe(name, time.perf_counter() - started)
+
+
+def increment(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def counter_value(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def statement_metric(sql: str) -> str:
+    metric = _statement_metrics.get(sql)
+    if metric is None:
+        metric = _classify_statement(sql)
+        if len(_statement_metrics) < _STATEMENT_CACHE_LIMIT:
+            _statement_metrics[sql] = metric
+    return metric
+
+
+def reset() -> None:
+    global _started_at
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+        _started_at = time.time()
+
+
+def snapshot() -> dict:
+    now = time.time()
+    with _lock:
+        items = [(name, _copy_stats(stats)) for name, stats in _stats.items()]
+        counters = dict(_counters)
+        started_at = _started_at
+    metrics = []
+    for name, stats in sorted(items):
+        metrics.append(
+            {
+                "name": name,
+                "category": name.split(".", 1)[0],
+                "count": stats.count,
+                "errors": stats.errors,
+                "timeouts": stats.timeouts,
+                "mean_ms": round(stats.total_ms / stats.count, 3) if stats.count else None,
+                "p50_ms": _percentile(stats, 0.50),
+                "p95_ms": _percentile(stats, 0.95),
+                "p99_ms": _percentile(stats, 0.99),
+                "max_ms": round(stats.max_ms, 3),
+                "last_success_age": _age(now, stats.last_success),
+                "last_error_age": _age(now, stats.last_error),
+                "last_error": stats.last_error_message,
+                "buckets": stats.buckets,
+            }
+        )
+    return {
+        "uptime_seconds": round(now - started_at, 1),
+        "bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+        "metrics": metrics,
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def _copy_stats(stats: LatencyStats) -> LatencyStats:
+    return LatencyStats(
+        buckets=list(stats.buckets),
+        count=stats.count,
+        total_ms=stats.total_ms,
+        max_ms=stats.max_ms,
+        errors=stats.errors,
+        timeouts=stats.timeouts,
+        last_success=stats.last_success,
+        last_error=stats.last_error,
+        last_error_message=stats.last_error_message,
+    )
+
+
+def _percentile(stats: LatencyStats, quantile: float) -> float | None:
+    if not stats.count:
+        return None
+    target = quantile * stats.count
+    cumulative = 0
+    for index, bucket in enumerate(stats.buckets):
+        cumulative += bucket
+        if cumulative >= target:
+            if index >= len(BUCKET_BOUNDS_MS):
+                return round(stats.max_ms, 3)
+            return round(min(BUCKET_BOUNDS_MS[index], stats.max_ms), 3)
+    return round(stats.max_ms, 3)
+
+
+def _age(now: float, timestamp: float | None) -> float | None:
+    if timestamp is None:
+        return None
+    return round(now - timestamp, 1)
+
+
+def _classify_statement(sql: str) -> str:
+    text = sql.lstrip()
+    if not text:
+        return "db.unknown"
+    verb = text.split(None, 1)[0].lower()
+    if verb == "with":
+        verb = "select"
+    pattern = _STATEMENT_TABLE_PATTERNS.get(verb)
+    match = pattern.search(text) if pattern else None
+    if match:
+        return f"db.{verb}.{match.group(1).lower()}"
+    return f"db.{verb}"
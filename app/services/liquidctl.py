@@ -1,13 +1,16 @@
 import os
 import re
-import subprocess
+import time
 from typing import Dict, Tuple
 
+from app.services.hardware import run_command
 from app.services.logger import get_logger
 
 LIQUIDCTL_PATH_ENV = "HYDROX_LIQUIDCTL_PATH"
 DEFAULT_LIQUIDCTL_PATH = "/root/.local/bin/liquidctl"
 
+_devices: tuple[bool, float] | None = None
+
 
 def _candidate_paths() -> list[str]:
     env_path = os.getenv(LIQUIDCTL_PATH_ENV, DEFAULT_LIQUIDCTL_PATH)
@@ -25,7 +28,7 @@ def _run_liquidctl(args: list[str]) -> Tuple[int, str, str]:
     for path in _candidate_paths():
         cmd = [path] + args
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+            result = run_command(cmd)
         except FileNotFoundError:
             logger.error("liquidctl not found at %s", path)
             last_error = "liquidctl not found"
@@ -47,7 +50,8 @@ def set_fan_speed(channel_index: int, percent: int) -> bool:
 
 def get_fan_rpms() -> Dict[int, int]:
     logger = get_logger()
-    _, stdout, _ = _run_liquidctl(["status"])
+    code, stdout, _ = _run_liquidctl(["status"])
+    _record_devices(code == 0 and bool(stdout))
     rpms: Dict[int, int] = {}
     for line in stdout.splitlines():
         match = re.search(r"fan\s*(\d+).*?(\d+)\s*rpm", line, re.IGNORECASE)
@@ -65,7 +69,8 @@ def get_fan_rpms() -> Dict[int, int]:
 
 def get_liquid_temps() -> list[float]:
     logger = get_logger()
-    _, stdout, _ = _run_liquidctl(["status"])
+    code, stdout, _ = _run_liquidctl(["status"])
+    _record_devices(code == 0 and bool(stdout))
     temps: list[float] = []
     for line in stdout.splitlines():
         lowered = line.lower()
@@ -84,4 +89,15 @@ def get_liquid_temps() -> list[float]:
 
 def has_liquidctl_devices() -> bool:
     _, stdout, _ = _run_liquidctl(["list"])
-    return "Device #" in stdout
+    present = "Device #" in stdout
+    _record_devices(present)
+    return present
+
+
+def device_snapshot() -> tuple[bool, float] | None:
+    return _devices
+
+
+def _record_devices(present: bool) -> None:
+    global _devices
+    _devices = (present, time.monotonic())
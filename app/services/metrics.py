@@ -1,9 +1,18 @@
 import os
 import re
-import subprocess
 from typing import Optional
 
 from app.db import get_connection
+from app.services.compression import (
+    compression_mode,
+    latest_timestamp,
+    reconstruct,
+    reconstructs_linearly,
+    sample_times,
+    store_sample,
+    window_rows,
+)
+from app.services.hardware import read_text, run_command
 
 
 DEFAULT_METRICS = {
@@ -13,6 +22,13 @@ DEFAULT_METRICS = {
     "pump_percent": 42,
 }
 
+METRIC_KINDS = {
+    "cpu_temp": "temp",
+    "ambient_temp": "temp",
+    "fan_rpm": "rpm",
+    "pump_percent": "percent",
+}
+
 
 def seed_metrics_if_empty() -> None:
     with get_connection() as conn:
@@ -57,6 +73,14 @@ def latest_metrics():
 
 def recent_metrics(limit: int = 12):
     with get_connection() as conn:
+        if compression_mode() != "off":
+            end_at = latest_timestamp(conn, "metrics")
+            if end_at is None or limit <= 0:
+                return []
+            times = sample_times(end_at, limit)
+            fields = list(METRIC_KINDS)
+            rows = window_rows(conn, "metrics", fields, times[0])
+            return reconstruct(rows, fields, times, reconstructs_linearly())
         rows = conn.execute(
             """
             SELECT cpu_temp, ambient_temp, fan_rpm, pump_percent, created_at
@@ -69,30 +93,37 @@ def recent_metrics(limit: int = 12):
         return [dict(row) for row in reversed(rows)]
 
 
-def insert_metrics(cpu_temp: float, ambient_temp: float, fan_rpm: int, pump_percent: int | None) -> None:
+def insert_metrics(
+    cpu_temp: float,
+    ambient_temp: float,
+    fan_rpm: int,
+    pump_percent: int | None,
+    created_at: str | None = None,
+) -> None:
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO metrics (cpu_temp, ambient_temp, fan_rpm, pump_percent)
-            VALUES (?, ?, ?, ?)
-            """,
-            (cpu_temp, ambient_temp, fan_rpm, pump_percent),
+        store_sample(
+            conn,
+            "metrics",
+            {},
+            {
+                "cpu_temp": cpu_temp,
+                "ambient_temp": ambient_temp,
+                "fan_rpm": fan_rpm,
+                "pump_percent": pump_percent,
+            },
+            METRIC_KINDS,
+            created_at,
         )
         conn.commit()
 
 
 def read_cpu_temp_vcgencmd() -> Optional[float]:
     try:
-        result = subprocess.run(
-            ["vcgencmd", "measure_temp"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_command(["vcgencmd", "measure_temp"])
     except FileNotFoundError:
-        return None
+        return read_cpu_temp_thermal_zone()
     if result.returncode != 0:
-        return None
+        return read_cpu_temp_thermal_zone()
     raw = result.stdout.strip()
     if "=" not in raw:
         return None
@@ -103,15 +134,18 @@ def read_cpu_temp_vcgencmd() -> Optional[float]:
         return None
 
 
+def read_cpu_temp_thermal_zone() -> Optional[float]:
+    try:
+        raw = read_text("/sys/class/thermal/thermal_zone0/temp").strip()
+        return int(raw) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
 def read_nvme_temp_sensors() -> Optional[float]:
     target = os.getenv("HYDROX_NVME_SENSOR_NAME", "nvme-pci-0100")
     try:
-        result = subprocess.run(
-            ["sensors"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_command(["sensors"])
     except FileNotFoundError:
         return None
     if result.returncode != 0:
@@ -1,118 +1,245 @@
-from dataclasses import dataclass
-import os
-import shutil
+import io
+import threading
+import time
+from collections import OrderedDict
 
-from luma.core.interface.serial import i2c
-from luma.core.render import canvas
-from luma.oled.device import ssd1306
-from PIL import ImageFont
-from smbus2 import SMBus
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 
-from app.services.logger import get_logger
+from app.services.hardware import open_oled_device, open_smbus
+from app.services.instrumentation import increment, timed
+from app.services.oled_config import FONT_CHOICES
 
 I2C_BUS = 1
 PCA_ADDR = 0x70
 OLED_ADDR = 0x3C
-
-OLED_CHANNELS = {
-    "OLED 1": 5,
-    "OLED 2": 6,
-    "OLED 3": 7,
-}
-
-FONT_CHOICES = {
-    "DejaVu Sans": "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-    "DejaVu Sans Mono": "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
-    "Liberation Sans": "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-    "Liberation Mono": "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
-}
-
-FONT_WEB_FILES = {
-    "DejaVu Sans": "DejaVuSans.ttf",
-    "DejaVu Sans Mono": "DejaVuSansMono.ttf",
-    "Liberation Sans": "LiberationSans-Regular.ttf",
-    "Liberation Mono": "LiberationMono-Regular.ttf",
-}
-
-
-@dataclass
-class ScreenPayload:
-    message: str
-    font_key: str
-    font_size: int
-
-
-def list_font_choices() -> list[dict]:
-    return [{"key": key, "label": key} for key in FONT_CHOICES.keys()]
+OLED_WIDTH = 128
+OLED_HEIGHT = 64
+
+FONT_CACHE_SIZE = 16
+TEXT_CACHE_SIZE = 256
+
+COLUMN_ADDRESS = 0x21
+PAGE_ADDRESS = 0x22
+_WINDOW_COMMAND_BYTES = 6
+
+
+_cache_lock = threading.Lock()
+_font_cache: OrderedDict[tuple[str, int], ImageFont.FreeTypeFont] = OrderedDict()
+_text_cache: OrderedDict[tuple[str, str, int], tuple[Image.Image | None, tuple[int, int]]] = OrderedDict()
+
+
+class FrameRenderer:
+    def __init__(self, device) -> None:
+        self.device = device
+        self.frames = 0
+        self.skipped = 0
+        self.bytes_sent = 0
+        self.render_seconds = 0.0
+        self.version = 0
+        self._pages: np.ndarray | None = None
+        self._shown: tuple[int, np.ndarray] | None = None
+        self._preview: tuple[int, bytes] | None = None
+
+    def new_frame(self) -> Image.Image:
+        return Image.new(self.device.mode, self.device.size)
+
+    def preview_png(self) -> bytes | None:
+        shown = self._shown
+        if shown is None:
+            return None
+        version, pages = shown
+        preview = self._preview
+        if preview is None or preview[0] != version:
+            preview = (version, png_bytes(unpack_pages(pages)))
+            self._preview = preview
+        return preview[1]
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "bytes_sent": self.bytes_sent,
+            "mean_frame_ms": round(self.render_seconds / self.frames * 1000, 3) if self.frames else None,
+        }
+
+    def render(self, image: Image.Image) -> int:
+        started = time.perf_counter()
+        sent = self._send(image)
+        if sent:
+            self.frames += 1
+            self.bytes_sent += sent
+            self.render_seconds += time.perf_counter() - started
+        else:
+            self.skipped += 1
+        return sent
+
+    def _send(self, image: Image.Image) -> int:
+        device = self.device
+        pages = pack_pages(device.preprocess(image))
+        previous = self._pages
+        if previous is None:
+            windows = [(0, pages.shape[0] - 1, 0, pages.shape[1] - 1)]
+        else:
+            windows = changed_windows(previous, pages)
+        if not windows:
+            increment("oled.frames_skipped")
+            return 0
+        offset = getattr(device, "_colstart", 0)
+        sent = 0
+        try:
+            for first_page, last_page, first_col, last_col in windows:
+                device.command(COLUMN_ADDRESS, offset + first_col, offset + last_col, PAGE_ADDRESS, first_page, last_page)
+                block = pages[first_page : last_page + 1, first_col : last_col + 1]
+                device.data(block.tobytes())
+                sent += block.size
+        except BaseException:
+            self._pages = None
+            raise
+        self._pages = pages
+        self.version += 1
+        self._shown = (self.version, pages)
+        increment("oled.frames_sent")
+        increment("oled.bytes_sent", sent)
+        return sent
+
+
+def pack_pages(image: Image.Image) -> np.ndarray:
+    pixels = np.asarray(image.convert("1"), dtype=bool)
+    height, width = pixels.shape
+    bits = pixels.reshape(height // 8, 8, width).transpose(0, 2, 1)
+    return np.packbits(bits, axis=2, bitorder="little")[:, :, 0]
+
+
+def unpack_pages(pages: np.ndarray) -> Image.Image:
+    bits = np.unpackbits(pages[:, :, np.newaxis], axis=2, bitorder="little")
+    pixels = bits.transpose(0, 2, 1).reshape(pages.shape[0] * 8, pages.shape[1])
+    return Image.fromarray(pixels.astype(bool))
+
+
+def png_bytes(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def changed_windows(previous: np.ndarray, pages: np.ndarray) -> list[tuple[int, int, int, int]]:
+    changed = previous != pages
+    windows: list[tuple[int, int, int, int]] = []
+    for page in np.flatnonzero(changed.any(axis=1)):
+        columns = np.flatnonzero(changed[page])
+        window = (int(page), int(page), int(columns[0]), int(columns[-1]))
+        if windows and windows[-1][1] == page - 1:
+            merged = _merge_windows(windows[-1], window)
+            if _window_bytes(merged) <= _window_bytes(windows[-1]) + _window_bytes(window) + _WINDOW_COMMAND_BYTES:
+                windows[-1] = merged
+                continue
+        windows.append(window)
+    return windows
+
+
+def load_font(key: str, size: int) -> ImageFont.FreeTypeFont:
+    if key not in FONT_CHOICES:
+        key = "DejaVu Sans Mono"
+    with _cache_lock:
+        font = _font_cache.get((key, size))
+        if font is not None:
+            _font_cache.move_to_end((key, size))
+    if font is not None:
+        increment("oled.font_cache.hits")
+        return font
+    font = ImageFont.truetype(FONT_CHOICES[key], size)
+    increment("oled.font_cache.misses")
+    with _cache_lock:
+        _font_cache[(key, size)] = font
+        while len(_font_cache) > FONT_CACHE_SIZE:
+            _font_cache.popitem(last=False)
+    return font
+
+
+def text_bitmap(text: str, key: str, size: int) -> tuple[Image.Image | None, tuple[int, int]]:
+    with _cache_lock:
+        cached = _text_cache.get((text, key, size))
+        if cached is not None:
+            _text_cache.move_to_end((text, key, size))
+    if cached is not None:
+        increment("oled.text_cache.hits")
+        return cached
+    font = load_font(key, size)
+    left, top, right, bottom = ImageDraw.Draw(Image.new("1", (1, 1))).textbbox((0, 0), text, font=font)
+    bitmap = None
+    if right > left and bottom > top:
+        bitmap = Image.new("1", (right - left, bottom - top))
+        ImageDraw.Draw(bitmap).text((-left, -top), text, font=font, fill=255)
+    cached = (bitmap, (left, top))
+    increment("oled.text_cache.misses")
+    with _cache_lock:
+        _text_cache[(text, key, size)] = cached
+        while len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return cached
+
+
+def draw_text(frame: Image.Image, position: tuple[int, int], text: str, key: str, size: int) -> None:
+    bitmap, (left, top) = text_bitmap(text, key, size)
+    if bitmap is not None:
+        frame.paste(255, (position[0] + left, position[1] + top), bitmap)
 
 
-def list_oled_channels() -> list[dict]:
-    return [{"label": label, "channel": channel} for label, channel in OLED_CHANNELS.items()]
+def select_oled_channel(channel: int) -> None:
+    _select_channel(channel)
 
 
-def ensure_web_fonts(static_dir: str = "app/static/fonts") -> None:
-    logger = get_logger()
-    os.makedirs(static_dir, exist_ok=True)
-    for name, source in FONT_CHOICES.items():
-        filename = FONT_WEB_FILES.get(name)
-        if not filename:
-            continue
-        target = os.path.join(static_dir, filename)
-        if os.path.exists(target):
-            continue
-        try:
-            shutil.copyfile(source, target)
-        except FileNotFoundError:
-            logger.warning("oled font file missing for web preview: %s", source)
-        except OSError:
-            logger.exception("oled font copy failed for %s", source)
+def mux_address(channel: int) -> int:
+    return PCA_ADDR + channel // 8
 
 
-def select_oled_channel(channel: int) -> None:
-    _select_channel(channel)
+def mux_mask(channel: int) -> int:
+    return 1 << channel % 8
 
 
-def disable_oled_channel() -> None:
-    _disable_channel()
+class OledBus:
+    def __init__(self) -> None:
+        self.handle = open_smbus(I2C_BUS)
+        self.selected: int | None = None
 
+    def select(self, channel: int) -> None:
+        if channel == self.selected:
+            return
+        with timed("oled.mux_select"):
+            if self.selected is not None and mux_address(self.selected) != mux_address(channel):
+                self.handle.write_byte(mux_address(self.selected), 0x00)
+            self.selected = None
+            self.handle.write_byte(mux_address(channel), mux_mask(channel))
+        self.selected = channel
+        increment("oled.mux_switches")
 
-def publish_screen(payload: ScreenPayload, channel: int) -> None:
-    logger = get_logger()
-    try:
-        _select_channel(channel)
-        serial = i2c(port=I2C_BUS, address=OLED_ADDR)
-        device = ssd1306(serial, width=128, height=64)
-        font = _load_font(payload.font_key, payload.font_size)
-        with canvas(device) as draw:
-            draw.text((0, 0), payload.message, font=font, fill=255)
-    except Exception:
-        logger.exception("oled publish failed for channel %s", channel)
+    def disable(self) -> None:
+        if self.selected is None:
+            return
+        channel, self.selected = self.selected, None
+        self.handle.write_byte(mux_address(channel), 0x00)
 
+    def open_panel(self, channel: int):
+        self.select(channel)
+        return open_oled_device(I2C_BUS, OLED_ADDR, bus=self.handle)
 
-def clear_screen(channel: int) -> None:
-    logger = get_logger()
-    try:
-        _select_channel(channel)
-        serial = i2c(port=I2C_BUS, address=OLED_ADDR)
-        device = ssd1306(serial, width=128, height=64)
-        with canvas(device) as draw:
-            draw.rectangle(device.bounding_box, outline=0, fill=0)
-        _disable_channel()
-    except Exception:
-        logger.exception("oled clear failed for channel %s", channel)
+    def close(self) -> None:
+        try:
+            self.disable()
+        finally:
+            self.handle.close()
 
 
 def _select_channel(channel: int) -> None:
-    mask = 1 << channel
-    with SMBus(I2C_BUS) as bus:
-        bus.write_byte(PCA_ADDR, mask)
+    with timed("oled.mux_select"):
+        with open_smbus(I2C_BUS) as bus:
+            bus.write_byte(mux_address(channel), mux_mask(channel))
 
 
-def _disable_channel() -> None:
-    with SMBus(I2C_BUS) as bus:
-        bus.write_byte(PCA_ADDR, 0x00)
+def _merge_windows(first: tuple[int, int, int, int], second: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+    return (first[0], second[1], min(first[2], second[2]), max(first[3], second[3]))
 
 
-def _load_font(key: str, size: int) -> ImageFont.FreeTypeFont:
-    path = FONT_CHOICES.get(key) or FONT_CHOICES["DejaVu Sans Mono"]
-    return ImageFont.truetype(path, size)
+def _window_bytes(window: tuple[int, int, int, int]) -> int:
+    return (window[1] - window[0] + 1) * (window[3] - window[2] + 1)
@@ -0,0 +1,50 @@
+import os
+import shutil
+
+from app.services.logger import get_logger
+
+OLED_CHANNELS = {
+    "OLED 1": 5,
+    "OLED 2": 6,
+    "OLED 3": 7,
+}
+
+FONT_CHOICES = {
+    "DejaVu Sans": "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "DejaVu Sans Mono": "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "Liberation Sans": "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "Liberation Mono": "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
+}
+
+FONT_WEB_FILES = {
+    "DejaVu Sans": "DejaVuSans.ttf",
+    "DejaVu Sans Mono": "DejaVuSansMono.ttf",
+    "Liberation Sans": "LiberationSans-Regular.ttf",
+    "Liberation Mono": "LiberationMono-Regular.ttf",
+}
+
+
+def list_font_choices() -> list[dict]:
+    return [{"key": key, "label": key} for key in FONT_CHOICES.keys()]
+
+
+def list_oled_channels() -> list[dict]:
+    return [{"label": label, "channel": channel} for label, channel in OLED_CHANNELS.items()]
+
+
+def ensure_web_fonts(static_dir: str = "app/static/fonts") -> None:
+    logger = get_logger()
+    os.makedirs(static_dir, exist_ok=True)
+    for name, source in FONT_CHOICES.items():
+        filename = FONT_WEB_FILES.get(name)
+        if not filename:
+            continue
+        target = os.path.join(static_dir, filename)
+        if os.path.exists(target):
+            continue
+        try:
+            shutil.copyfile(source, target)
+        except FileNotFoundError:
+            logger.warning("oled font file missing for web preview: %s", source)
+        except OSError:
+            logger.exception("oled font copy failed for %s", source)
@@ -1,161 +1,325 @@
+import heapq
 import random
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
-from luma.core.interface.serial import i2c
-from luma.core.render import canvas
-from luma.oled.device import ssd1306
-from PIL import ImageFont
+from PIL import Image
 
-from app.services.fan_metrics import latest_fan_readings, recent_cpu_fan_readings
+from app.services import telemetry
 from app.services.fans import list_fans
+from app.services.governor import scaled, under_pressure
+from app.services.instrumentation import increment, timed
 from app.services.logger import get_logger
-from app.services.metrics import latest_metrics
-from app.services.oled import FONT_CHOICES, I2C_BUS, OLED_ADDR, clear_screen, select_oled_channel
-from app.services.sensors import format_temp, latest_sensor_readings, list_sensors
+from app.services.oled import OLED_HEIGHT, OLED_WIDTH, FrameRenderer, OledBus, draw_text, mux_address, png_bytes
+from app.services.oled_templates import CompiledTemplate, TokenValue, build_token_values, series_changed
+from app.services.sensors import list_sensors
+
+PREVIEW_CACHE_SIZE = 64
 
-_active_jobs: dict[int, "OLEDJob"] = {}
 _lock = threading.Lock()
-_render_lock = threading.Lock()
-_REFRESH_SECONDS = 5
+_scheduler: "OLEDScheduler | None" = None
+_previews: OrderedDict[tuple, bytes] = OrderedDict()
+_REFRESH_SECONDS = 60
+_PRESSURE_REDRAW_SECONDS = 5
+_PIXEL_SHIFT_SECONDS = 60
+_BATCH_SECONDS = 0.05
+_REQUEST_TIMEOUT_SECONDS = 2
 
 
 @dataclass(frozen=True)
 class PlaylistScreen:
-    title_template: str
-    value_template: str
+    title: CompiledTemplate
+    value: CompiledTemplate
     title_font: str
     value_font: str
     title_size: int
     value_size: int
     rotation_seconds: int
 
+    def sources(self) -> frozenset[str]:
+        return self.title.sources | self.value.sources
+
+    def series(self) -> frozenset[str]:
+        return self.title.series | self.value.series
+
 
-class OLEDJob:
-    def __init__(self, channel: int, screens: list[PlaylistScreen], brightness_percent: int, pixel_shift: bool) -> None:
-        self.channel = channel
-        self.screens = screens
-        self.brightness_percent = brightness_percent
-        self.pixel_shift = pixel_shift
-        self._stop_event = threading.Event()
+@dataclass
+class PanelPlayback:
+    channel: int
+    screens: list[PlaylistScreen]
+    brightness_percent: int
+    pixel_shift: bool
+    generation: int = 0
+    screen_index: int = -1
+    screen_ends_at: float = 0.0
+    shift: tuple[int, int] = (0, 0)
+    next_shift_at: float = 0.0
+    shown: tuple | None = None
+    rendered_at: float = 0.0
+
+
+class OLEDScheduler:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._requests: list[tuple[int, PanelPlayback | None, threading.Event]] = []
+        self._changed: set[str] = set()
+        self._stopping = False
+        self._state_lock = threading.Lock()
+        self._panels: dict[int, PanelPlayback] = {}
+        self._deadlines: list[tuple[float, int, int]] = []
+        self._renderers: dict[int, FrameRenderer] = {}
+        self._bus: OledBus | None = None
+        self._generation = 0
         self._thread = threading.Thread(target=self._run, daemon=True)
 
     def start(self) -> None:
+        telemetry.subscribe(self._on_telemetry)
         self._thread.start()
 
+    def submit(self, channel: int, playback: PanelPlayback | None) -> None:
+        done = threading.Event()
+        with self._condition:
+            self._requests.append((channel, playback, done))
+            self._condition.notify()
+        done.wait(_REQUEST_TIMEOUT_SECONDS)
+
     def stop(self) -> None:
-        self._stop_event.set()
+        telemetry.unsubscribe(self._on_telemetry)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
         self._thread.join(timeout=2)
 
     def _run(self) -> None:
         logger = get_logger()
-        if not self.screens:
-            clear_screen(self.channel)
+        while True:
+            with self._condition:
+                while not self._stopping and not self._requests and not self._changed and not self._due(time.monotonic()):
+                    self._condition.wait(self._wait_seconds(time.monotonic()))
+                if self._stopping:
+                    break
+                requests, self._requests = self._requests, []
+                changed, self._changed = self._changed, set()
+            for channel, playback, done in requests:
+                try:
+                    self._apply(channel, playback)
+                finally:
+                    done.set()
+            try:
+                self._render_due(changed)
+            except Exception:
+                logger.exception("oled scheduler tick failed")
+        self._close_bus()
+
+    def _on_telemetry(self, changed: set[str]) -> None:
+        with self._condition:
+            self._changed |= changed
+            self._condition.notify()
+
+    def _due(self, now: float) -> bool:
+        return bool(self._deadlines) and self._deadlines[0][0] <= now + _BATCH_SECONDS
+
+    def _wait_seconds(self, now: float) -> float | None:
+        if not self._deadlines:
+            return None
+        return max(0.0, self._deadlines[0][0] - now - _BATCH_SECONDS)
+
+    def _apply(self, channel: int, playback: PanelPlayback | None) -> None:
+        logger = get_logger()
+        with self._state_lock:
+            self._panels.pop(channel, None)
+        if playback is None or not playback.screens:
+            try:
+                renderer = self._renderer(channel)
+                self._bus.select(channel)
+                renderer.render(renderer.new_frame())
+                self._bus.disable()
+            except Exception:
+                self._lost_bus()
+                logger.exception("oled clear failed for channel %s", channel)
             return
         try:
-            select_oled_channel(self.channel)
-            serial = i2c(port=I2C_BUS, address=OLED_ADDR)
-            device = ssd1306(serial, width=128, height=64)
-            brightness = int(max(0, min(100, self.brightness_percent)))
-            device.contrast(int(brightness / 100 * 255))
+            renderer = self._renderer(channel)
+            self._bus.select(channel)
+            brightness = int(max(0, min(100, playback.brightness_percent)))
+            renderer.device.contrast(int(brightness / 100 * 255))
         except Exception:
-            logger.exception("oled job failed to initialize for channel %s", self.channel)
+            self._lost_bus()
+            logger.exception("oled job failed to initialize for channel %s", channel)
             return
-        font_cache: dict[tuple[str, int], ImageFont.FreeTypeFont] = {}
-        shift_x = 0
-        shift_y = 0
-        next_shift = time.time() + 60
-        while not self._stop_event.is_set():
-            for screen in self.screens:
-                if self._stop_event.is_set():
-                    break
-                rotation_seconds = max(int(screen.rotation_seconds), 1)
-                end_at = time.time() + rotation_seconds
-                title_font = _cached_font(font_cache, screen.title_font, screen.title_size)
-                value_font = _cached_font(font_cache, screen.value_font, screen.value_size)
-                while time.time() < end_at and not self._stop_event.is_set():
-                    if self.pixel_shift and time.time() >= next_shift:
-                        shift_x = random.randint(-2, 2)
-                        shift_y = random.randint(-2, 2)
-                        next_shift = time.time() + 60
-                    elif not self.pixel_shift:
-                        shift_x = 0
-                        shift_y = 0
-                    tokens = build_token_map()
-                    title = render_template(screen.title_template, tokens)
-                    value = render_template(screen.value_template, tokens)
-                    try:
-                        with _render_lock:
-                            select_oled_channel(self.channel)
-                            with canvas(device) as draw:
-                                draw.text((0 + shift_x, 0 + shift_y), title, font=title_font, fill=255)
-                                draw.text((0 + shift_x, 24 + shift_y), value, font=value_font, fill=255)
-                    except Exception:
-                        logger.exception("oled render failed for channel %s", self.channel)
-                    remaining = end_at - time.time()
-                    if remaining <= 0:
-                        break
-                    self._stop_event.wait(min(_REFRESH_SECONDS, remaining))
+        now = time.monotonic()
+        self._generation += 1
+        playback.generation = self._generation
+        playback.next_shift_at = now + _PIXEL_SHIFT_SECONDS
+        with self._state_lock:
+            self._panels[channel] = playback
+        heapq.heappush(self._deadlines, (now, channel, playback.generation))
+
+    def _render_due(self, changed: set[str]) -> None:
+        now = time.monotonic()
+        due = []
+        while self._due(now):
+            deadline, channel, generation = heapq.heappop(self._deadlines)
+            playback = self._panels.get(channel)
+            if playback is not None and playback.generation == generation:
+                self._advance(playback, max(now, deadline))
+                due.append((max(now, deadline), playback))
+        timers = {playback.channel for _, playback in due}
+        if changed:
+            for playback in self._panels.values():
+                if playback.channel in timers or playback.screen_index < 0:
+                    continue
+                if under_pressure() and now - playback.rendered_at < scaled(_PRESSURE_REDRAW_SECONDS):
+                    increment("oled.redraws_deferred")
+                    continue
+                if series_changed(playback.screens[playback.screen_index].series(), changed):
+                    due.append((now, playback))
+        if not due:
+            return
+        sources = set().union(*(playback.screens[playback.screen_index].sources() for _, playback in due))
+        with timed("oled.tokens"):
+            values = build_token_values(sources)
+        selected = self._bus.selected if self._bus is not None else None
+        due.sort(key=lambda item: (item[1].channel != selected, mux_address(item[1].channel), item[1].channel))
+        for at, playback in due:
+            self._render(playback, values)
+            if playback.channel not in timers:
+                continue
+            next_frame_at = min(playback.screen_ends_at, at + scaled(_REFRESH_SECONDS))
+            if playback.pixel_shift:
+                next_frame_at = min(next_frame_at, playback.next_shift_at)
+            heapq.heappush(self._deadlines, (next_frame_at, playback.channel, playback.generation))
+
+    def _advance(self, playback: PanelPlayback, now: float) -> None:
+        if now >= playback.screen_ends_at:
+            playback.screen_index = (playback.screen_index + 1) % len(playback.screens)
+            rotation_seconds = max(int(playback.screens[playback.screen_index].rotation_seconds), 1)
+            playback.screen_ends_at = now + rotation_seconds
+        if playback.pixel_shift and now >= playback.next_shift_at:
+            playback.shift = (random.randint(-2, 2), random.randint(-2, 2))
+            playback.next_shift_at = now + _PIXEL_SHIFT_SECONDS
+        elif not playback.pixel_shift:
+            playback.shift = (0, 0)
+
+    def _render(self, playback: PanelPlayback, values: dict[str, TokenValue]) -> None:
+        screen = playback.screens[playback.screen_index]
+        title = screen.title.render(values)
+        value = screen.value.render(values)
+        shown = (playback.screen_index, title, value, playback.shift)
+        playback.rendered_at = time.monotonic()
+        if shown == playback.shown:
+            increment("oled.redraws_skipped")
+            return
+        try:
+            renderer = self._renderer(playback.channel)
+            frame = renderer.new_frame()
+            draw_screen(frame, screen, title, value, playback.shift)
+            self._bus.select(playback.channel)
+            with timed("oled.frame"):
+                renderer.render(frame)
+            playback.shown = shown
+        except Exception:
+            playback.shown = None
+            self._lost_bus()
+            get_logger().exception("oled render failed for channel %s", playback.channel)
+
+    def preview(self, channel: int) -> bytes | None:
+        with self._state_lock:
+            renderer = self._renderers.get(channel)
+        return renderer.preview_png() if renderer is not None else None
+
+    def status(self) -> list[dict]:
+        with self._state_lock:
+            panels = {channel: (playback.screen_index, len(playback.screens)) for channel, playback in self._panels.items()}
+            renderers = sorted((channel, renderer.stats()) for channel, renderer in self._renderers.items())
+        return [
+            {
+                "channel": channel,
+                "playing": channel in panels,
+                "screen_index": panels[channel][0] if channel in panels else None,
+                "screens": panels[channel][1] if channel in panels else 0,
+                **stats,
+            }
+            for channel, stats in renderers
+        ]
+
+    def _renderer(self, channel: int) -> FrameRenderer:
+        if self._bus is None:
+            self._bus = OledBus()
+        renderer = self._renderers.get(channel)
+        if renderer is None:
+            renderer = FrameRenderer(self._bus.open_panel(channel))
+            with self._state_lock:
+                self._renderers[channel] = renderer
+        return renderer
+
+    def _lost_bus(self) -> None:
+        if self._bus is not None:
+            self._bus.selected = None
+
+    def _close_bus(self) -> None:
+        bus, self._bus = self._bus, None
+        with self._state_lock:
+            self._renderers.clear()
+        if bus is not None:
+            try:
+                bus.close()
+            except Exception:
+                get_logger().exception("oled bus close failed")
 
 
 def start_oled_job(channel: int, screens: list[PlaylistScreen], brightness_percent: int, pixel_shift: bool) -> None:
-    with _lock:
-        existing = _active_jobs.get(channel)
-        if existing:
-            existing.stop()
-        job = OLEDJob(channel, screens, brightness_percent, pixel_shift)
-        _active_jobs[channel] = job
-        job.start()
+    _get_scheduler().submit(channel, PanelPlayback(channel, screens, brightness_percent, pixel_shift))
 
 
 def stop_oled_job(channel: int) -> None:
-    with _lock:
-        existing = _active_jobs.pop(channel, None)
-    if existing:
-        existing.stop()
-    clear_screen(channel)
+    _get_scheduler().submit(channel, None)
 
 
-def render_template(template: str, tokens: dict[str, str]) -> str:
-    result = template
-    for key, value in tokens.items():
-        result = result.replace(f"{{{{{key}}}}}", value)
-    return result
+def oled_preview(channel: int) -> bytes | None:
+    scheduler = _scheduler
+    return scheduler.preview(channel) if scheduler is not None else None
 
 
-def build_token_map() -> dict[str, str]:
-    tokens: dict[str, str] = {}
-    metrics = latest_metrics() or {}
-    if "cpu_temp" in metrics and metrics["cpu_temp"] is not None:
-        tokens["cpu_temp"] = f"{metrics['cpu_temp']:.1f}°C"
-    if "ambient_temp" in metrics and metrics["ambient_temp"] is not None:
-        tokens["ambient_temp"] = f"{metrics['ambient_temp']:.1f}°C"
-    if "pump_percent" in metrics and metrics["pump_percent"] is not None:
-        tokens["pump_percent"] = f"{metrics['pump_percent']}%"
+def oled_status() -> list[dict]:
+    scheduler = _scheduler
+    return scheduler.status() if scheduler is not None else []
 
-    fans = list_fans()
-    fan_readings = {row["channel_index"]: row["rpm"] for row in latest_fan_readings()}
-    for fan in fans:
-        channel = fan["channel_index"]
-        rpm = fan_readings.get(channel)
-        if rpm is not None:
-            tokens[f"fan{channel}_rpm"] = f"{rpm}"
-            if fan.get("max_rpm"):
-                percent = min(max(rpm / fan["max_rpm"] * 100, 0), 100)
-                tokens[f"fan{channel}_percent"] = f"{percent:.0f}%"
-    cpu_fan_rows = recent_cpu_fan_readings(limit=1)
-    if cpu_fan_rows:
-        tokens["cpu_fan_rpm"] = f"{cpu_fan_rows[0]['rpm']}"
-    sensors = list_sensors()
-    sensor_readings = latest_sensor_readings()
-    for sensor in sensors:
-        temp_c = sensor_readings.get(sensor["id"])
-        if temp_c is None:
-            continue
-        tokens[f"sensor_{sensor['id']}"] = format_temp(temp_c, sensor["unit"])
-        tokens[sensor["name"].lower().replace(" ", "_")] = format_temp(temp_c, sensor["unit"])
-    return tokens
+
+def screen_preview(screen: PlaylistScreen) -> bytes:
+    values = build_token_values(screen.sources())
+    title = screen.title.render(values)
+    value = screen.value.render(values)
+    key = (title, value, screen.title_font, screen.title_size, screen.value_font, screen.value_size)
+    with _lock:
+        png = _previews.get(key)
+        if png is not None:
+            _previews.move_to_end(key)
+            return png
+    frame = Image.new("1", (OLED_WIDTH, OLED_HEIGHT))
+    draw_screen(frame, screen, title, value, (0, 0))
+    png = png_bytes(frame)
+    with _lock:
+        _previews[key] = png
+        while len(_previews) > PREVIEW_CACHE_SIZE:
+            _previews.popitem(last=False)
+    return png
+
+
+def draw_screen(frame: Image.Image, screen: PlaylistScreen, title: str, value: str, shift: tuple[int, int]) -> None:
+    shift_x, shift_y = shift
+    draw_text(frame, (0 + shift_x, 0 + shift_y), title, screen.title_font, screen.title_size)
+    draw_text(frame, (0 + shift_x, 24 + shift_y), value, screen.value_font, screen.value_size)
+
+
+def shutdown_oled() -> None:
+    global _scheduler
+    with _lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.stop()
 
 
 def list_token_definitions() -> list[dict]:
@@ -176,15 +340,10 @@ def list_token_definitions() -> list[dict]:
     return items
 
 
-def _load_font(key: str, size: int) -> ImageFont.FreeTypeFont:
-    path = FONT_CHOICES.get(key) or FONT_CHOICES["DejaVu Sans Mono"]
-    return ImageFont.truetype(path, size)
-
-
-def _cached_font(cache: dict[tuple[str, int], ImageFont.FreeTypeFont], key: str, size: int) -> ImageFont.FreeTypeFont:
-    cache_key = (key, size)
-    if cache_key in cache:
-        return cache[cache_key]
-    font = _load_font(key, size)
-    cache[cache_key] = font
-    return font
+def _get_scheduler() -> OLEDScheduler:
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            _scheduler = OLEDScheduler()
+            _scheduler.start()
+        return _scheduler
@@ -0,0 +1,216 @@
+import re
+from dataclasses import dataclass
+
+from app.services import telemetry
+from app.services.fan_metrics import latest_fan_readings, recent_cpu_fan_readings
+from app.services.fans import list_fans
+from app.services.metrics import latest_metrics
+from app.services.sensors import latest_sensor_readings, list_sensors
+
+TOKEN_SOURCES = ("metrics", "fans", "cpu_fan", "sensors")
+TEMPERATURE_UNITS = ("C", "F")
+MISSING_VALUE = "--"
+ANY_SENSOR = "sensor_*"
+
+_TOKEN = re.compile(r"\{\{\s*([^{}|:\s]+)\s*(?:\|\s*([^{}:\s]*)\s*)?(?::([^{}]*))?\}\}")
+_METRIC_TOKENS = {"cpu_temp": "temp", "ambient_temp": "temp", "pump_percent": "percent"}
+_FAN_TOKEN = re.compile(r"^fan(\d+)_(rpm|percent)$")
+_SENSOR_TOKEN = re.compile(r"^sensor_\d+$")
+_DEFAULT_SPECS = {"temp": ".1f", "percent": ".0f", "count": ""}
+
+
+@dataclass(frozen=True)
+class TokenValue:
+    value: float
+    kind: str
+    unit: str = "C"
+
+    def format(self, unit: str | None = None, spec: str | None = None) -> str:
+        value = self.value
+        suffix = {"percent": "%", "count": ""}.get(self.kind)
+        if self.kind == "temp":
+            unit = unit or self.unit
+            if unit == "F":
+                value = value * 9 / 5 + 32
+            suffix = f"°{unit}"
+        return f"{format(value, _DEFAULT_SPECS[self.kind] if spec is None else spec)}{suffix}"
+
+
+@dataclass(frozen=True)
+class TemplateToken:
+    name: str
+    source: str
+    series: str
+    unit: str | None
+    spec: str | None
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    text: str
+    parts: tuple[str | TemplateToken, ...]
+    sources: frozenset[str]
+    series: frozenset[str]
+
+    def render(self, values: dict[str, TokenValue]) -> str:
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+            value = values.get(part.name)
+            if value is None:
+                rendered.append(MISSING_VALUE)
+                continue
+            try:
+                rendered.append(value.format(part.unit, part.spec))
+            except ValueError:
+                rendered.append(MISSING_VALUE)
+        return "".join(rendered)
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    parts: list[str | TemplateToken] = []
+    position = 0
+    for match in _TOKEN.finditer(text):
+        if match.start() > position:
+            parts.append(text[position : match.start()])
+        name, unit, spec = match.groups()
+        parts.append(TemplateToken(name, token_source(name), token_series(name), unit.upper() if unit else None, spec))
+        position = match.end()
+    if position < len(text):
+        parts.append(text[position:])
+    tokens = [part for part in parts if isinstance(part, TemplateToken)]
+    return CompiledTemplate(
+        text,
+        tuple(parts),
+        frozenset(token.source for token in tokens),
+        frozenset(token.series for token in tokens),
+    )
+
+
+def token_source(name: str) -> str:
+    if name in _METRIC_TOKENS:
+        return "metrics"
+    if _FAN_TOKEN.match(name):
+        return "fans"
+    if name == "cpu_fan_rpm":
+        return "cpu_fan"
+    return "sensors"
+
+
+def token_series(name: str) -> str:
+    match = _FAN_TOKEN.match(name)
+    if match:
+        return f"fan_{match.group(1)}_rpm"
+    if name in _METRIC_TOKENS or name == "cpu_fan_rpm" or _SENSOR_TOKEN.match(name):
+        return name
+    return ANY_SENSOR
+
+
+def series_changed(series: frozenset[str], changed: set[str]) -> bool:
+    if not series.isdisjoint(changed):
+        return True
+    return ANY_SENSOR in series and any(key.startswith("sensor_") for key in changed)
+
+
+def template_error(text: str, known: dict[str, str]) -> str | None:
+    literal = _TOKEN.sub("", text)
+    if "{{" in literal or "}}" in literal:
+        return f"Template {text!r} has an unclosed or malformed {{{{token}}}}."
+    for part in compile_template(text).parts:
+        if isinstance(part, str):
+            continue
+        kind = known.get(part.name)
+        if kind is None:
+            return f"Unknown token {{{{{part.name}}}}} in {text!r}."
+        if part.unit is not None and (kind != "temp" or part.unit not in TEMPERATURE_UNITS):
+            return f"Token {{{{{part.name}}}}} only accepts |C or |F on temperatures."
+        if part.spec is not None:
+            try:
+                format(1.0 if kind != "count" else 1, part.spec)
+            except ValueError:
+                return f"Token {{{{{part.name}}}}} has an invalid format {part.spec!r}."
+    return None
+
+
+def known_tokens() -> dict[str, str]:
+    known = dict(_METRIC_TOKENS)
+    for fan in list_fans():
+        known[f"fan{fan['channel_index']}_rpm"] = "count"
+        known[f"fan{fan['channel_index']}_percent"] = "percent"
+    known["cpu_fan_rpm"] = "count"
+    for sensor in list_sensors():
+        known[f"sensor_{sensor['id']}"] = "temp"
+        known[_sensor_slug(sensor["name"])] = "temp"
+    return known
+
+
+def build_token_values(sources=TOKEN_SOURCES) -> dict[str, TokenValue]:
+    loaders = {
+        "metrics": _metric_values,
+        "fans": _fan_values,
+        "cpu_fan": _cpu_fan_values,
+        "sensors": _sensor_values,
+    }
+    values: dict[str, TokenValue] = {}
+    readings = telemetry.snapshot()
+    for source in sources:
+        loaders[source](values, readings)
+    return values
+
+
+def _metric_values(values: dict[str, TokenValue], readings: dict[str, float]) -> None:
+    metrics = None
+    for name, kind in _METRIC_TOKENS.items():
+        value = readings.get(name)
+        if value is None:
+            if metrics is None:
+                metrics = latest_metrics() or {}
+            value = metrics.get(name)
+        if value is not None:
+            values[name] = TokenValue(value, kind)
+
+
+def _fan_values(values: dict[str, TokenValue], readings: dict[str, float]) -> None:
+    stored = None
+    for fan in list_fans():
+        channel = fan["channel_index"]
+        rpm = readings.get(f"fan_{channel}_rpm")
+        if rpm is None:
+            if stored is None:
+                stored = {row["channel_index"]: row["rpm"] for row in latest_fan_readings()}
+            rpm = stored.get(channel)
+        if rpm is None:
+            continue
+        values[f"fan{channel}_rpm"] = TokenValue(rpm, "count")
+        if fan.get("max_rpm"):
+            values[f"fan{channel}_percent"] = TokenValue(min(max(rpm / fan["max_rpm"] * 100, 0), 100), "percent")
+
+
+def _cpu_fan_values(values: dict[str, TokenValue], readings: dict[str, float]) -> None:
+    rpm = readings.get("cpu_fan_rpm")
+    if rpm is None:
+        cpu_fan_rows = recent_cpu_fan_readings(limit=1)
+        rpm = cpu_fan_rows[0]["rpm"] if cpu_fan_rows else None
+    if rpm is not None:
+        values["cpu_fan_rpm"] = TokenValue(rpm, "count")
+
+
+def _sensor_values(values: dict[str, TokenValue], readings: dict[str, float]) -> None:
+    stored = None
+    for sensor in list_sensors():
+        temp_c = readings.get(f"sensor_{sensor['id']}")
+        if temp_c is None:
+            if stored is None:
+                stored = latest_sensor_readings()
+            temp_c = stored.get(sensor["id"])
+        if temp_c is None:
+            continue
+        value = TokenValue(temp_c, "temp", "F" if sensor["unit"].upper() == "F" else "C")
+        values[f"sensor_{sensor['id']}"] = value
+        values[_sensor_slug(sensor["name"])] = value
+
+
+def _sensor_slug(name: str) -> str:
+    return name.lower().replace(" ", "_")
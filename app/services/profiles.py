@@ -0,0 +1,148 @@
+import json
+import threading
+
+from app.db import get_connection
+from app.services.curves import input_sensor_ids, parse_curves
+from app.services.schedule import validate_schedule
+from app.services.sensors import list_sensors
+
+
+_revision_lock = threading.Lock()
+_revisions: dict[int, int] = {}
+
+
+def list_profiles() -> list[dict]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, name, curve_json, schedule_json, revision, created_at
+            FROM profiles
+            ORDER BY created_at DESC
+            """
+        ).fetchall()
+        profiles = [dict(row) for row in rows]
+    _remember_revisions(profiles)
+    return profiles
+
+
+def list_schedules() -> list[dict]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, name, schedule_json, revision
+            FROM profiles
+            ORDER BY id
+            """
+        ).fetchall()
+        profiles = [dict(row) for row in rows]
+    _remember_revisions(profiles)
+    return profiles
+
+
+def get_profile(profile_id: int) -> dict | None:
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            SELECT id, name, curve_json, schedule_json, revision
+            FROM profiles
+            WHERE id = ?
+            """,
+            (profile_id,),
+        ).fetchone()
+    if not row:
+        return None
+    profile = dict(row)
+    _remember_revisions([profile])
+    return profile
+
+
+def profile_revision(profile_id: int) -> int | None:
+    with _revision_lock:
+        revision = _revisions.get(profile_id)
+    if revision is not None:
+        return revision
+    with get_connection() as conn:
+        row = conn.execute("SELECT id, revision FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+    if not row:
+        return None
+    _remember_revisions([dict(row)])
+    return row["revision"]
+
+
+def insert_profile(name: str, curve_json: str, schedule_json: str | None) -> int:
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO profiles (name, curve_json, schedule_json)
+            VALUES (?, ?, ?)
+            """,
+            (name, curve_json, schedule_json or None),
+        )
+        conn.commit()
+        profile_id = cursor.lastrowid
+    _remember_revisions([{"id": profile_id, "revision": 1}])
+    return profile_id
+
+
+def update_profile(profile_id: int, name: str, curve_json: str, schedule_json: str | None) -> int | None:
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE profiles
+            SET name = ?, curve_json = ?, schedule_json = ?, revision = revision + 1
+            WHERE id = ?
+            """,
+            (name, curve_json, schedule_json or None, profile_id),
+        )
+        if cursor.rowcount == 0:
+            return None
+        row = conn.execute("SELECT revision FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+        conn.commit()
+    _remember_revisions([{"id": profile_id, "revision": row["revision"]}])
+    return row["revision"]
+
+
+def validate_profile_json(curve_json: str, schedule_json: str) -> str | None:
+    try:
+        curve = json.loads(curve_json)
+    except json.JSONDecodeError:
+        return "Curve JSON must be valid JSON."
+
+    try:
+        specs = parse_curves(curve)
+    except ValueError as exc:
+        return str(exc)
+    unknown = sorted(input_sensor_ids(specs) - {sensor["id"] for sensor in list_sensors()})
+    if unknown:
+        return f"Curve input sensor_{unknown[0]} is not a registered sensor."
+
+    if schedule_json:
+        try:
+            schedule = json.loads(schedule_json)
+        except json.JSONDecodeError:
+            return "Schedule JSON must be valid JSON."
+        if not isinstance(schedule, dict):
+            return "Schedule JSON must be an object."
+        if "cron" in schedule and not isinstance(schedule["cron"], str):
+            return "Schedule cron must be a string."
+        if "window" in schedule:
+            window = schedule["window"]
+            if not isinstance(window, dict):
+                return "Schedule window must be an object."
+            if "days" in window and not isinstance(window["days"], list):
+                return "Schedule window days must be a list."
+            if "start" in window and not isinstance(window["start"], str):
+                return "Schedule window start must be a string."
+            if "end" in window and not isinstance(window["end"], str):
+                return "Schedule window end must be a string."
+        schedule_error = validate_schedule(schedule)
+        if schedule_error:
+            return schedule_error
+
+    return None
+
+
+def _remember_revisions(profiles: list[dict]) -> None:
+    with _revision_lock:
+        for profile in profiles:
+            _revisions[profile["id"]] = profile["revision"]
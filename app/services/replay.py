@@ -0,0 +1,280 @@
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from app.db import get_connection
+from app.services.compression import (
+    SAMPLE_SECONDS,
+    format_timestamp,
+    max_gap_seconds,
+    reconstructs_linearly,
+)
+from app.services.control import CompiledProfile, get_compiled_profile
+from app.services.fans import get_fan_calibration, list_fans
+from app.services.instrumentation import observe
+from app.services.logger import get_logger
+from app.services.rpm_hold import build_rpm_model
+from app.services.schedule import schedule_timezone
+from app.services.settings import get_pump_channel
+
+DUTY_THRESHOLDS = (50, 80, 100)
+DEFAULT_RANGE_SECONDS = 86400
+MAX_RANGE_SECONDS = 366 * 86400
+HISTOGRAM_BINS = 10
+
+_CHUNK_SAMPLES = 500_000
+_JOB_LIMIT = 20
+_METRIC_INPUTS = {"cpu_temp", "ambient_temp"}
+_SENSOR_INPUT = re.compile(r"^sensor_(\d+)$")
+
+_lock = threading.Lock()
+_executor: ProcessPoolExecutor | None = None
+_jobs: dict[str, dict] = {}
+
+
+@dataclass(frozen=True)
+class ReplayRequest:
+    compiled: CompiledProfile
+    fans: list[dict]
+    calibrations: dict[int, list[tuple[int, int]]]
+    start_at: float
+    end_at: float
+    linear: bool
+    max_gap: float
+
+
+def build_request(profile_id: int, start: str = "", end: str = "") -> ReplayRequest:
+    end_at = parse_local(end) if end else float(int(time.time()))
+    start_at = parse_local(start) if start else end_at - DEFAULT_RANGE_SECONDS
+    if end_at <= start_at:
+        raise ValueError("Replay end must be after start.")
+    if end_at - start_at > MAX_RANGE_SECONDS:
+        raise ValueError("Replay range is limited to 366 days.")
+    fans = list_fans(active_only=True)
+    compiled = get_compiled_profile(profile_id, fans, get_pump_channel())
+    if compiled is None:
+        raise ValueError("Profile not found.")
+    return ReplayRequest(
+        compiled=compiled,
+        fans=fans,
+        calibrations={fan["channel_index"]: get_fan_calibration(fan["channel_index"]) for fan in fans},
+        start_at=start_at,
+        end_at=end_at,
+        linear=reconstructs_linearly(),
+        max_gap=max_gap_seconds(),
+    )
+
+
+def parse_local(value: str) -> float:
+    try:
+        moment = datetime.fromisoformat(value.strip().replace(" ", "T"))
+    except ValueError:
+        raise ValueError(f"Replay time {value!r} must look like 2026-01-31 18:00.") from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=schedule_timezone())
+    return moment.timestamp()
+
+
+def run_replay(request: ReplayRequest) -> dict:
+    started = time.perf_counter()
+    compiled = request.compiled
+    times = np.arange(request.start_at, request.end_at, SAMPLE_SECONDS, dtype=float)
+    with get_connection() as conn:
+        conn.row_factory = None
+        series = {key: _load_series(conn, key, request.start_at, request.end_at) for key in compiled.keys}
+    channels = len(compiled.channels)
+    counts = np.zeros((channels, 101), dtype=np.int64)
+    changes = np.zeros(channels, dtype=np.int64)
+    last = np.full(channels, -1)
+    coverage = dict.fromkeys(compiled.keys, 0)
+    for offset in range(0, len(times), _CHUNK_SAMPLES):
+        chunk = times[offset : offset + _CHUNK_SAMPLES]
+        readings = np.empty((len(chunk), len(compiled.keys)))
+        for column, key in enumerate(compiled.keys):
+            stamps, values = series[key]
+            readings[:, column] = _resample(stamps, values, chunk, request.linear, request.max_gap)
+            coverage[key] += int(np.count_nonzero(~np.isnan(readings[:, column])))
+        if not channels:
+            continue
+        duties = compiled.duties(readings)
+        for row in range(channels):
+            column = duties[:, row]
+            column = column[column >= 0]
+            if not column.size:
+                continue
+            counts[row] += np.bincount(column, minlength=101)
+            changes[row] += np.count_nonzero(np.diff(column))
+            if last[row] >= 0 and column[0] != last[row]:
+                changes[row] += 1
+            last[row] = column[-1]
+    names = {fan["channel_index"]: fan["name"] for fan in request.fans}
+    max_rpms = {fan["channel_index"]: fan.get("max_rpm") for fan in request.fans}
+    total = len(times)
+    return {
+        "profile_id": compiled.profile_id,
+        "profile_name": compiled.name,
+        "start": _format_local(request.start_at),
+        "end": _format_local(request.end_at),
+        "samples": total,
+        "sample_seconds": SAMPLE_SECONDS,
+        "inputs": {key: round(value / total, 4) if total else 0 for key, value in coverage.items()},
+        "fans": [
+            _channel_summary(
+                channel_index,
+                names.get(channel_index, f"Fan {channel_index}"),
+                counts[row],
+                int(changes[row]),
+                total,
+                build_rpm_model(request.calibrations.get(channel_index, []), max_rpms.get(channel_index)),
+            )
+            for row, channel_index in enumerate(compiled.channels)
+        ],
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def submit_replay(profile_id: int, start: str = "", end: str = "") -> str:
+    global _executor
+    request = build_request(profile_id, start, end)
+    job_id = uuid.uuid4().hex[:12]
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        future = _executor.submit(run_replay, request)
+        _jobs[job_id] = {"future": future, "submitted_at": time.time(), "profile_id": profile_id}
+        while len(_jobs) > _JOB_LIMIT:
+            del _jobs[next(iter(_jobs))]
+    submitted = time.perf_counter()
+    future.add_done_callback(lambda done: _observe_job(done, submitted))
+    return job_id
+
+
+def replay_status(job_id: str) -> dict | None:
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    future: Future = job["future"]
+    payload = {
+        "job_id": job_id,
+        "profile_id": job["profile_id"],
+        "elapsed_seconds": round(time.time() - job["submitted_at"], 1),
+    }
+    if not future.done():
+        return {**payload, "state": "running"}
+    if future.cancelled():
+        return {**payload, "state": "error", "error": "Replay was cancelled."}
+    error = future.exception()
+    if error is not None:
+        return {**payload, "state": "error", "error": str(error) or error.__class__.__name__}
+    return {**payload, "state": "done", "result": future.result()}
+
+
+def shutdown_replay() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _format_local(value: float) -> str:
+    return datetime.fromtimestamp(value, schedule_timezone()).strftime("%Y-%m-%d %H:%M")
+
+
+def _observe_job(future: Future, submitted: float) -> None:
+    error = None if future.cancelled() else future.exception()
+    observe("replay.run", time.perf_counter() - submitted, ok=error is None, error=str(error) if error else None)
+    if error is not None:
+        get_logger().error("profile replay failed: %s", error)
+
+
+def _load_series(conn, key: str, start_at: float, end_at: float) -> tuple[np.ndarray, np.ndarray]:
+    if key in _METRIC_INPUTS:
+        table, column, where, params = "metrics", key, "", []
+    else:
+        match = _SENSOR_INPUT.match(key)
+        if not match:
+            return np.empty(0), np.empty(0)
+        table, column, where, params = "sensor_readings", "temp_c", "sensor_id = ? AND ", [int(match.group(1))]
+    select = f"SELECT created_at, {column} FROM {table} WHERE {where}"
+    before = conn.execute(
+        select + "created_at < ? ORDER BY created_at DESC, id DESC LIMIT 1",
+        params + [format_timestamp(start_at)],
+    ).fetchall()
+    rows = conn.execute(
+        select + "created_at >= ? AND created_at <= ? ORDER BY created_at, id",
+        params + [format_timestamp(start_at), format_timestamp(end_at)],
+    ).fetchall()
+    rows = before + rows
+    stamps = np.array([row[0][:19] for row in rows], dtype="datetime64[s]").astype(float)
+    values = np.fromiter((np.nan if row[1] is None else row[1] for row in rows), dtype=float, count=len(rows))
+    return stamps, values
+
+
+def _resample(stamps: np.ndarray, values: np.ndarray, times: np.ndarray, linear: bool, max_gap: float) -> np.ndarray:
+    if not stamps.size:
+        return np.full(len(times), np.nan)
+    index = np.searchsorted(stamps, times, side="right") - 1
+    known = index >= 0
+    index = np.maximum(index, 0)
+    result = values[index]
+    if linear and stamps.size > 1:
+        following = index + 1 < stamps.size
+        interpolated = np.interp(times, stamps, values)
+        result = np.where(following, interpolated, result)
+    fresh = known & (times - stamps[index] <= max_gap)
+    return np.where(fresh, result, np.nan)
+
+
+def _channel_summary(
+    channel_index: int, name: str, counts: np.ndarray, changes: int, total: int, model
+) -> dict:
+    samples = int(counts.sum())
+    summary = {
+        "channel_index": channel_index,
+        "name": name,
+        "coverage": round(samples / total, 4) if total else 0,
+        "changes": changes,
+        "duty": None,
+        "histogram": [],
+        "above": [],
+        "rpm": None,
+    }
+    if not samples:
+        return summary
+    duties = np.arange(101)
+    cumulative = np.cumsum(counts)
+    summary["duty"] = {
+        "mean": round(float((counts * duties).sum() / samples), 1),
+        "min": int(np.flatnonzero(counts)[0]),
+        "p50": int(np.searchsorted(cumulative, 0.5 * samples)),
+        "p95": int(np.searchsorted(cumulative, 0.95 * samples)),
+        "max": int(np.flatnonzero(counts)[-1]),
+    }
+    bins = np.minimum(duties // (100 // HISTOGRAM_BINS), HISTOGRAM_BINS - 1)
+    histogram = np.bincount(bins, weights=counts, minlength=HISTOGRAM_BINS)
+    summary["histogram"] = [round(float(value) / samples, 4) for value in histogram]
+    summary["above"] = [
+        {
+            "threshold": threshold,
+            "seconds": int(counts[threshold:].sum()) * SAMPLE_SECONDS,
+            "fraction": round(float(counts[threshold:].sum()) / samples, 4),
+        }
+        for threshold in DUTY_THRESHOLDS
+    ]
+    if model is not None:
+        rpms = np.interp(duties, model.duties, model.rpms)
+        summary["rpm"] = {
+            "mean": int(round(float((counts * rpms).sum() / samples))),
+            "p95": int(round(float(rpms[summary["duty"]["p95"]]))),
+            "max": int(round(float(rpms[summary["duty"]["max"]]))),
+        }
+    return summary
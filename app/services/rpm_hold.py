@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+KP = 0.3
+KI = 0.5
+INTEGRAL_LIMIT = 30.0
+SETTLE_SECONDS = 3.0
+RPM_DEADBAND = 15
+MIN_GAIN_RPM_PER_PERCENT = 1.0
+
+
+@dataclass(frozen=True)
+class RpmModel:
+    duties: np.ndarray
+    rpms: np.ndarray
+
+    def duty_for(self, rpm: float) -> float:
+        return float(np.interp(rpm, self.rpms, self.duties))
+
+    def gain_at(self, duty: float) -> float:
+        if len(self.duties) < 2:
+            return MIN_GAIN_RPM_PER_PERCENT
+        slopes = np.diff(self.rpms) / np.diff(self.duties)
+        index = int(np.clip(np.searchsorted(self.duties, duty, side="right") - 1, 0, len(slopes) - 1))
+        return max(MIN_GAIN_RPM_PER_PERCENT, float(slopes[index]))
+
+
+@dataclass
+class RpmHold:
+    channel_index: int
+    target_rpm: int
+    model: RpmModel
+    floor: int
+    feedforward: float = 0.0
+    integral: float = 0.0
+    duty: int = 0
+    commanded_at: float = 0.0
+    sample_at: float = 0.0
+    last_rpm: float | None = None
+
+    def start(self) -> int:
+        self.integral = 0.0
+        if self.target_rpm <= 0:
+            self.feedforward = 0.0
+            return 0
+        self.feedforward = self.model.duty_for(self.target_rpm)
+        return _clamp_duty(self.feedforward, self.floor)
+
+    def commanded(self, duty: int, now: float) -> None:
+        self.duty = duty
+        self.commanded_at = now
+
+    def step(self, measured: float | None, measured_at: float | None) -> int:
+        if self.target_rpm <= 0:
+            return 0
+        if measured is None or measured_at is None:
+            return self.duty
+        if measured_at <= self.sample_at or measured_at - self.commanded_at < SETTLE_SECONDS:
+            return self.duty
+        self.sample_at = measured_at
+        self.last_rpm = measured
+        error = self.target_rpm - measured
+        if abs(error) <= RPM_DEADBAND:
+            return self.duty
+        correction = error / self.model.gain_at(self.duty)
+        proportional = KP * correction
+        integral = max(-INTEGRAL_LIMIT, min(INTEGRAL_LIMIT, self.integral + KI * correction))
+        raw = self.feedforward + proportional + integral
+        saturated_high = raw > 100 and correction > 0
+        saturated_low = raw < self.floor and correction < 0
+        if not saturated_high and not saturated_low:
+            self.integral = integral
+        return _clamp_duty(self.feedforward + proportional + self.integral, self.floor)
+
+    def status(self) -> dict:
+        return {
+            "target_rpm": self.target_rpm,
+            "duty": self.duty,
+            "feedforward": round(self.feedforward, 1),
+            "integral": round(self.integral, 2),
+            "rpm": self.last_rpm,
+        }
+
+
+def build_rpm_model(points: list[tuple[int, int]], max_rpm: int | None) -> RpmModel | None:
+    if len(points) < 2:
+        if not max_rpm:
+            return None
+        points = [(0, 0), (100, max_rpm)]
+    kept: list[tuple[float, float]] = []
+    for duty, rpm in sorted(points):
+        if kept and rpm <= kept[-1][1]:
+            kept[-1] = (float(duty), kept[-1][1])
+            continue
+        kept.append((float(duty), float(rpm)))
+    if kept[0][1] > 0:
+        kept.insert(0, (0.0, 0.0))
+    duties, rpms = zip(*kept)
+    return RpmModel(np.array(duties), np.array(rpms))
+
+
+def _clamp_duty(value: float, floor: int) -> int:
+    return int(round(max(floor, min(100.0, value))))
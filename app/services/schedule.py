@@ -0,0 +1,505 @@
+import copy
+import heapq
+import json
+import os
+import threading
+import time as clock
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from app.services.logger import DEFAULT_TZ, get_logger
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+MONTH_NAMES = {name: index for index, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+CRON_DAY_NAMES = {name: index for index, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+WINDOW_DAY_NAMES = {name: index for index, name in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])}
+
+_CRON_FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, MONTH_NAMES),
+    ("day of week", 0, 7, CRON_DAY_NAMES),
+)
+_CRON_SEARCH_DAYS = 366 * 5
+_EVENT_ORDER = {"end": 0, "start": 1, "cron": 2}
+_MAX_WAIT_SECONDS = 60
+_REBUILD_LAG_SECONDS = 3600
+_UPCOMING_SCAN_LIMIT = 500
+
+
+@dataclass(frozen=True)
+class CronSpec:
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    any_day: bool
+    any_weekday: bool
+
+    def matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = day.isoweekday() % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime | None:
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for offset in range(_CRON_SEARCH_DAYS):
+            day = start.date() + timedelta(days=offset)
+            if not self.matches_day(day):
+                continue
+            for hour in self.hours:
+                if offset == 0 and hour < start.hour:
+                    continue
+                for minute in self.minutes:
+                    if offset == 0 and hour == start.hour and minute < start.minute:
+                        continue
+                    return datetime.combine(day, time(hour, minute))
+        return None
+
+    def last_at_or_before(self, moment: datetime) -> datetime | None:
+        end = moment.replace(second=0, microsecond=0)
+        for offset in range(_CRON_SEARCH_DAYS):
+            day = end.date() - timedelta(days=offset)
+            if not self.matches_day(day):
+                continue
+            for hour in reversed(self.hours):
+                if offset == 0 and hour > end.hour:
+                    continue
+                for minute in reversed(self.minutes):
+                    if offset == 0 and hour == end.hour and minute > end.minute:
+                        continue
+                    return datetime.combine(day, time(hour, minute))
+        return None
+
+
+@dataclass(frozen=True)
+class WindowSpec:
+    weekdays: frozenset[int]
+    start_minute: int
+    duration_minutes: int
+
+    def occurrence_containing(self, moment: datetime) -> tuple[datetime, datetime] | None:
+        for offset in (0, 1):
+            day = moment.date() - timedelta(days=offset)
+            if day.weekday() not in self.weekdays:
+                continue
+            start = datetime.combine(day, time()) + timedelta(minutes=self.start_minute)
+            end = start + timedelta(minutes=self.duration_minutes)
+            if start <= moment < end:
+                return start, end
+        return None
+
+    def next_start_after(self, moment: datetime) -> datetime:
+        for offset in range(8):
+            day = moment.date() + timedelta(days=offset)
+            if day.weekday() not in self.weekdays:
+                continue
+            start = datetime.combine(day, time()) + timedelta(minutes=self.start_minute)
+            if start > moment:
+                return start
+        raise ValueError("window has no days")
+
+
+@dataclass(frozen=True)
+class ProfileSchedule:
+    profile_id: int
+    name: str
+    priority: int
+    cron: CronSpec | None
+    window: WindowSpec | None
+
+
+@dataclass
+class ScheduleState:
+    heap: list[tuple] = field(default_factory=list)
+    claims: dict[int, tuple[float, str]] = field(default_factory=dict)
+    gates: set[int] = field(default_factory=set)
+    cron_claim: tuple[int, float] | None = None
+    override: int | None = None
+    sequence: int = 0
+
+
+def parse_cron(expression: str) -> CronSpec:
+    text = CRON_ALIASES.get(expression.strip().lower(), expression.strip())
+    parts = text.split()
+    if len(parts) != 5:
+        raise ValueError("Schedule cron must have 5 fields (minute hour day month weekday).")
+    values = []
+    for raw, (label, low, high, names) in zip(parts, _CRON_FIELDS):
+        values.append(_parse_cron_field(raw, label, low, high, names))
+    minutes, hours, days, months, weekdays = values
+    weekdays = {0 if day == 7 else day for day in weekdays}
+    return CronSpec(
+        minutes=tuple(sorted(minutes)),
+        hours=tuple(sorted(hours)),
+        days=frozenset(days),
+        months=frozenset(months),
+        weekdays=frozenset(weekdays),
+        any_day=parts[2] == "*",
+        any_weekday=parts[4] == "*",
+    )
+
+
+def parse_window(window: dict) -> WindowSpec:
+    raw_days = window.get("days") or list(WINDOW_DAY_NAMES)
+    weekdays = set()
+    for raw in raw_days:
+        key = str(raw).strip().lower()[:3]
+        if key not in WINDOW_DAY_NAMES:
+            raise ValueError(f"Schedule window day {raw!r} is not a weekday name.")
+        weekdays.add(WINDOW_DAY_NAMES[key])
+    start = _parse_clock(window.get("start", "00:00"), "start")
+    end = _parse_clock(window.get("end", "24:00"), "end")
+    duration = (end - start) % 1440 or 1440
+    return WindowSpec(frozenset(weekdays), start % 1440, duration)
+
+
+def parse_schedule(profile_id: int, name: str, schedule: dict) -> ProfileSchedule | None:
+    cron = parse_cron(schedule["cron"]) if schedule.get("cron") else None
+    window = parse_window(schedule["window"]) if schedule.get("window") else None
+    if cron is None and window is None:
+        return None
+    priority = schedule.get("priority", 0)
+    if isinstance(priority, bool) or not isinstance(priority, int):
+        raise ValueError("Schedule priority must be a whole number.")
+    return ProfileSchedule(profile_id, name, priority, cron, window)
+
+
+def validate_schedule(schedule: dict) -> str | None:
+    try:
+        parse_schedule(0, "", schedule)
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def schedule_timezone() -> ZoneInfo:
+    try:
+        return ZoneInfo(os.getenv("TZ", DEFAULT_TZ))
+    except Exception:
+        return ZoneInfo(DEFAULT_TZ)
+
+
+class ScheduleEngine:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stop = False
+        self._update_lock = threading.Lock()
+        self._dirty = True
+        self._pending_override: int | None = None
+        self._schedules: dict[int, ProfileSchedule] = {}
+        self._names: dict[int, str] = {}
+        self._state = ScheduleState()
+        self._base_profile_id: int | None = None
+        self._effective: tuple[int | None, str] = (None, "base")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def reload(self, override: int | None = None) -> None:
+        with self._condition:
+            self._dirty = True
+            self._pending_override = override
+        self._rebuild_and_apply()
+        with self._condition:
+            self._condition.notify_all()
+
+    def current(self) -> dict:
+        with self._condition:
+            profile_id, reason = self._effective
+            return {"profile_id": profile_id, "profile_name": self._names.get(profile_id), "reason": reason}
+
+    def upcoming(self, limit: int = 5) -> list[dict]:
+        with self._condition:
+            state = copy.deepcopy(self._state)
+            schedules = dict(self._schedules)
+            names = dict(self._names)
+            base = self._base_profile_id
+            effective = self._effective[0]
+        tz = schedule_timezone()
+        transitions = []
+        for _ in range(_UPCOMING_SCAN_LIMIT):
+            if len(transitions) >= limit or not state.heap:
+                break
+            at = state.heap[0][0]
+            _advance(state, schedules, at, tz)
+            profile_id, reason = _resolve(state, schedules, base)
+            if profile_id != effective:
+                transitions.append(
+                    {
+                        "at": datetime.fromtimestamp(at, tz).strftime("%Y-%m-%d %H:%M"),
+                        "timestamp": at,
+                        "profile_id": profile_id,
+                        "profile_name": names.get(profile_id),
+                        "reason": reason,
+                    }
+                )
+                effective = profile_id
+        return transitions
+
+    def _run(self) -> None:
+        logger = get_logger()
+        while True:
+            with self._condition:
+                if self._stop:
+                    return
+                if not self._dirty:
+                    next_at = self._state.heap[0][0] if self._state.heap else None
+                    wait = _MAX_WAIT_SECONDS if next_at is None else next_at - clock.time()
+                    if wait > 0:
+                        self._condition.wait(min(wait, _MAX_WAIT_SECONDS))
+                        continue
+            try:
+                self._rebuild_and_apply()
+            except Exception:
+                logger.exception("schedule engine update failed")
+                with self._condition:
+                    self._condition.wait(_MAX_WAIT_SECONDS)
+
+    def _rebuild_and_apply(self) -> None:
+        with self._update_lock:
+            self._update()
+
+    def _update(self) -> None:
+        from app.services.profiles import list_schedules
+        from app.services.settings import get_base_profile_id
+
+        now = clock.time()
+        tz = schedule_timezone()
+        with self._condition:
+            dirty = self._dirty
+            lagging = self._state.heap and now - self._state.heap[0][0] > _REBUILD_LAG_SECONDS
+        if dirty or lagging:
+            profiles = list_schedules()
+            schedules = _load_schedules(profiles)
+            base = get_base_profile_id()
+            with self._condition:
+                override = self._pending_override
+                self._pending_override = None
+                self._schedules = schedules
+                self._names = {profile["id"]: profile["name"] for profile in profiles}
+                self._base_profile_id = base
+                self._state = _initial_state(schedules, now, tz)
+                self._state.override = override
+                self._dirty = False
+        with self._condition:
+            _advance(self._state, self._schedules, now, tz)
+            effective = _resolve(self._state, self._schedules, self._base_profile_id)
+            changed = effective != self._effective
+            self._effective = effective
+        if changed:
+            _apply_profile(*effective)
+
+
+def _parse_cron_field(raw: str, label: str, low: int, high: int, names: dict[str, int]) -> set[int]:
+    values: set[int] = set()
+    for part in raw.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) < 1:
+                raise ValueError(f"Schedule cron {label} step {step_text!r} is invalid.")
+            step = int(step_text)
+        if not part:
+            raise ValueError(f"Schedule cron {label} has an empty list item in {raw!r}.")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            first, last = part.split("-", 1)
+            start, end = _cron_value(first, label, low, high, names), _cron_value(last, label, low, high, names)
+        else:
+            start = _cron_value(part, label, low, high, names)
+            end = high if step > 1 else start
+        if start > end:
+            raise ValueError(f"Schedule cron {label} range {part!r} is reversed.")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _cron_value(raw: str, label: str, low: int, high: int, names: dict[str, int]) -> int:
+    if raw in names:
+        return names[raw]
+    if not raw.isdigit() or not low <= int(raw) <= high:
+        raise ValueError(f"Schedule cron {label} value {raw!r} must be {low}-{high}.")
+    return int(raw)
+
+
+def _parse_clock(raw: str, label: str) -> int:
+    try:
+        hours, minutes = str(raw).split(":", 1)
+        value = int(hours) * 60 + int(minutes)
+    except ValueError:
+        raise ValueError(f"Schedule window {label} must be HH:MM.") from None
+    if not 0 <= int(minutes) < 60 or not 0 <= value <= 1440:
+        raise ValueError(f"Schedule window {label} must be HH:MM.")
+    return value
+
+
+def _load_schedules(profiles: list[dict]) -> dict[int, ProfileSchedule]:
+    logger = get_logger()
+    schedules = {}
+    for profile in profiles:
+        if not profile.get("schedule_json"):
+            continue
+        try:
+            parsed = parse_schedule(profile["id"], profile["name"], json.loads(profile["schedule_json"]))
+        except (ValueError, TypeError, AttributeError):
+            logger.error("profile %s has an invalid schedule, ignoring it", profile["id"])
+            continue
+        if parsed:
+            schedules[parsed.profile_id] = parsed
+    return schedules
+
+
+def _initial_state(schedules: dict[int, ProfileSchedule], now: float, tz: ZoneInfo) -> ScheduleState:
+    state = ScheduleState()
+    moment = _local(now, tz)
+    for schedule in schedules.values():
+        profile_id = schedule.profile_id
+        if schedule.window:
+            occurrence = schedule.window.occurrence_containing(moment)
+            if occurrence:
+                start, end = occurrence
+                _push(state, _epoch(end, tz), "end", profile_id)
+                if schedule.cron:
+                    state.gates.add(profile_id)
+                    fired = schedule.cron.last_at_or_before(moment)
+                    if fired and fired >= start:
+                        state.claims[profile_id] = (_epoch(fired, tz), "window")
+                else:
+                    state.claims[profile_id] = (_epoch(start, tz), "window")
+            _push(state, _epoch(schedule.window.next_start_after(moment), tz), "start", profile_id)
+        if schedule.cron:
+            if not schedule.window:
+                fired = schedule.cron.last_at_or_before(moment)
+                if fired:
+                    fired_at = _epoch(fired, tz)
+                    if state.cron_claim is None or fired_at > state.cron_claim[1]:
+                        state.cron_claim = (profile_id, fired_at)
+            upcoming = schedule.cron.next_after(moment)
+            if upcoming:
+                _push(state, _epoch(upcoming, tz), "cron", profile_id)
+    return state
+
+
+def _advance(state: ScheduleState, schedules: dict[int, ProfileSchedule], now: float, tz: ZoneInfo) -> None:
+    while state.heap and state.heap[0][0] <= now:
+        at, _, _, kind, profile_id = heapq.heappop(state.heap)
+        schedule = schedules.get(profile_id)
+        if schedule is None:
+            continue
+        state.override = None
+        moment = _local(at, tz)
+        if kind == "start":
+            end = moment + timedelta(minutes=schedule.window.duration_minutes)
+            _push(state, _epoch(end, tz), "end", profile_id)
+            _push(state, _epoch(schedule.window.next_start_after(moment), tz), "start", profile_id)
+            if schedule.cron:
+                state.gates.add(profile_id)
+            else:
+                state.claims[profile_id] = (at, "window")
+        elif kind == "end":
+            state.gates.discard(profile_id)
+            state.claims.pop(profile_id, None)
+        else:
+            upcoming = schedule.cron.next_after(moment)
+            if upcoming:
+                _push(state, _epoch(upcoming, tz), "cron", profile_id)
+            if schedule.window:
+                if profile_id in state.gates:
+                    state.claims[profile_id] = (at, "window")
+            else:
+                state.cron_claim = (profile_id, at)
+
+
+def _resolve(
+    state: ScheduleState, schedules: dict[int, ProfileSchedule], base_profile_id: int | None
+) -> tuple[int | None, str]:
+    if state.override is not None:
+        return state.override, "manual"
+    best = None
+    candidates = [(profile_id, started, kind) for profile_id, (started, kind) in state.claims.items()]
+    if state.cron_claim is not None:
+        candidates.append((state.cron_claim[0], state.cron_claim[1], "cron"))
+    for profile_id, started, kind in candidates:
+        schedule = schedules.get(profile_id)
+        if schedule is None:
+            continue
+        rank = (schedule.priority, 1 if kind == "window" else 0, started, profile_id)
+        if best is None or rank > best[0]:
+            best = (rank, profile_id, kind)
+    if best is None:
+        return base_profile_id, "base"
+    return best[1], best[2]
+
+
+def _apply_profile(profile_id: int | None, reason: str) -> None:
+    from app.services.control import get_control_engine
+    from app.services.settings import get_active_profile_id, set_active_profile_id
+
+    if profile_id != get_active_profile_id():
+        set_active_profile_id(profile_id)
+        get_logger().info("schedule switched active profile to %s (%s)", profile_id, reason)
+    get_control_engine().reload()
+
+
+def _push(state: ScheduleState, at: float, kind: str, profile_id: int) -> None:
+    state.sequence += 1
+    heapq.heappush(state.heap, (at, _EVENT_ORDER[kind], state.sequence, kind, profile_id))
+
+
+def _local(timestamp: float, tz: ZoneInfo) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz).replace(tzinfo=None)
+
+
+def _epoch(moment: datetime, tz: ZoneInfo) -> float:
+    return moment.replace(tzinfo=tz).timestamp()
+
+
+_engine = ScheduleEngine()
+
+
+def get_schedule_engine() -> ScheduleEngine:
+    return _engine
+
+
+def start_schedule_engine() -> None:
+    _engine.reload()
+    _engine.start()
+
+
+def shutdown_schedule_engine() -> None:
+    _engine.stop()
@@ -1,7 +1,17 @@
-import glob
 from pathlib import Path
 
 from app.db import get_connection
+from app.services.compression import (
+    compression_mode,
+    distinct_keys,
+    latest_timestamp,
+    reconstruct,
+    reconstructs_linearly,
+    sample_times,
+    store_sample,
+    window_rows,
+)
+from app.services.hardware import glob_paths, read_text
 from app.services.liquidctl import get_liquid_temps
 from app.services.logger import get_logger
 
@@ -84,6 +94,8 @@ def latest_sensor_readings() -> dict[int, float]:
 
 def recent_sensor_readings(limit: int = 24) -> dict[int, list[float]]:
     with get_connection() as conn:
+        if compression_mode() != "off":
+            return _reconstructed_sensor_readings(conn, limit)
         rows = conn.execute(
             """
             SELECT sensor_id, temp_c, created_at
@@ -102,15 +114,9 @@ def recent_sensor_readings(limit: int = 24) -> dict[int, list[float]]:
         return grouped
 
 
-def insert_sensor_reading(sensor_id: int, temp_c: float) -> None:
+def insert_sensor_reading(sensor_id: int, temp_c: float, created_at: str | None = None) -> None:
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO sensor_readings (sensor_id, temp_c)
-            VALUES (?, ?)
-            """,
-            (sensor_id, temp_c),
-        )
+        store_sample(conn, "sensor_readings", {"sensor_id": sensor_id}, {"temp_c": temp_c}, {"temp_c": "temp"}, created_at)
         conn.commit()
 
 
@@ -164,7 +170,7 @@ def _seed_ds18b20_sensors() -> None:
 
 
 def _discover_ds18b20_paths() -> list[Path]:
-    return [Path(path) for path in glob.glob("/sys/bus/w1/devices/28-*")]
+    return [Path(path) for path in glob_paths("/sys/bus/w1/devices/28-*")]
 
 
 def _discover_ds18b20_ids() -> list[str]:
@@ -173,7 +179,7 @@ def _discover_ds18b20_ids() -> list[str]:
 
 def _read_ds18b20_temp(path: Path) -> float | None:
     try:
-        content = path.joinpath("w1_slave").read_text(encoding="utf-8")
+        content = read_text(path.joinpath("w1_slave"))
     except OSError:
         return None
     for line in content.splitlines():
@@ -194,3 +200,19 @@ def refresh_liquid_sensors() -> dict[str, float]:
     if not results:
         get_logger().error("liquidctl status returned no temperatures")
     return results
+
+
+def _reconstructed_sensor_readings(conn, limit: int) -> dict[int, list[float]]:
+    sensor_ids = distinct_keys(conn, "sensor_readings", "sensor_id")
+    ends = [latest_timestamp(conn, "sensor_readings", {"sensor_id": sensor_id}) for sensor_id in sensor_ids]
+    ends = [end_at for end_at in ends if end_at is not None]
+    if not ends or limit <= 0:
+        return {}
+    times = sample_times(max(ends), limit)
+    grouped: dict[int, list[float]] = {}
+    for sensor_id in sensor_ids:
+        rows = window_rows(conn, "sensor_readings", ["temp_c"], times[0], {"sensor_id": sensor_id})
+        points = reconstruct(rows, ["temp_c"], times, reconstructs_linearly())
+        if points:
+            grouped[sensor_id] = [point["temp_c"] for point in points]
+    return grouped
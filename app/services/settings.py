@@ -2,6 +2,7 @@ from app.db import get_connection
 
 FAN_COUNT_KEY = "fan_count"
 ACTIVE_PROFILE_KEY = "active_profile_id"
+BASE_PROFILE_KEY = "base_profile_id"
 DEFAULT_FAN_COUNT = 7
 PUMP_CHANNEL_KEY = "pump_channel"
 
@@ -74,6 +75,20 @@ def set_active_profile_id(profile_id: int | None) -> None:
     set_setting(ACTIVE_PROFILE_KEY, str(profile_id))
 
 
+def get_base_profile_id() -> int | None:
+    value = get_setting(BASE_PROFILE_KEY)
+    if value is None:
+        return get_active_profile_id()
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def set_base_profile_id(profile_id: int | None) -> None:
+    set_setting(BASE_PROFILE_KEY, "" if profile_id is None else str(profile_id))
+
+
 def get_pump_channel() -> int | None:
     value = get_setting(PUMP_CHANNEL_KEY)
     if value in (None, ""):
@@ -0,0 +1,443 @@
+import fnmatch
+import math
+import os
+import random
+import subprocess
+import threading
+import time
+
+from app.services.env import env_float, env_int
+
+SIM_FANS_ENV = "HYDROX_SIM_FANS"
+SIM_DS18B20_ENV = "HYDROX_SIM_DS18B20"
+SIM_SEED_ENV = "HYDROX_SIM_SEED"
+SIM_CELLAR_ENV = "HYDROX_SIM_CELLAR_C"
+SIM_LIQUIDCTL_LATENCY_ENV = "HYDROX_SIM_LIQUIDCTL_LATENCY_MS"
+SIM_COMMAND_LATENCY_ENV = "HYDROX_SIM_COMMAND_LATENCY_MS"
+SIM_W1_DELAY_ENV = "HYDROX_SIM_W1_DELAY_MS"
+
+DEFAULT_SIM_FANS = 7
+DEFAULT_SIM_DS18B20 = 3
+DEFAULT_CELLAR_C = 13.0
+DEFAULT_LIQUIDCTL_LATENCY_MS = 250
+DEFAULT_COMMAND_LATENCY_MS = 20
+DEFAULT_W1_DELAY_MS = 750
+
+PCA_ADDR = 0x70
+OLED_ADDR = 0x3C
+OLED_WIDTH = 128
+OLED_PAGES = 8
+
+_HEAT_WATTS = 18.0
+_LIQUID_CAPACITY = 250.0
+_PASSIVE_LOSS = 0.4
+_FAN_LOSS = 4.0
+_ENCLOSURE_OFFSET = 6.0
+_RPM_TAU_SECONDS = 2.0
+_STEP_SECONDS = 1.0
+
+_simulator = None
+_simulator_lock = threading.Lock()
+
+
+def get_simulator() -> "HardwareSimulator":
+    global _simulator
+    with _simulator_lock:
+        if _simulator is None:
+            _simulator = HardwareSimulator()
+        return _simulator
+
+
+class SimulatedFan:
+    def __init__(self, channel: int, max_rpm: int, stall_percent: int) -> None:
+        self.channel = channel
+        self.max_rpm = max_rpm
+        self.stall_percent = stall_percent
+        self.duty = 20
+        self.rpm = float(self.target_rpm())
+
+    def target_rpm(self) -> float:
+        if self.duty < self.stall_percent:
+            return 0.0
+        ratio = self.duty / 100
+        return self.max_rpm * (0.22 + 0.78 * ratio**1.4)
+
+
+class ThermalModel:
+    def __init__(self, fans: list[SimulatedFan], cellar_c: float, rng: random.Random) -> None:
+        self.fans = fans
+        self.cellar_c = cellar_c
+        self.rng = rng
+        self.liquid_c = cellar_c + _ENCLOSURE_OFFSET + 8.0
+        self.cpu_c = cellar_c + 30.0
+        self.elapsed = 0.0
+
+    def advance(self, seconds: float) -> None:
+        remaining = max(0.0, min(seconds, 3600.0))
+        while remaining > 0:
+            step = min(_STEP_SECONDS, remaining)
+            self._step(step)
+            remaining -= step
+
+    def _step(self, dt: float) -> None:
+        self.elapsed += dt
+        for fan in self.fans:
+            fan.rpm += (fan.target_rpm() - fan.rpm) * min(1.0, dt / _RPM_TAU_SECONDS)
+        airflow = sum(fan.rpm / fan.max_rpm for fan in self.fans) / max(len(self.fans), 1)
+        enclosure_c = self.enclosure_c()
+        loss = (_PASSIVE_LOSS + _FAN_LOSS * airflow) * (self.liquid_c - enclosure_c)
+        self.liquid_c += (_HEAT_WATTS - loss) * dt / _LIQUID_CAPACITY
+        load = 0.5 + 0.5 * math.sin(self.elapsed / 90.0)
+        cpu_target = enclosure_c + 24.0 + 12.0 * load - 6.0 * self.cpu_fan_duty()
+        self.cpu_c += (cpu_target - self.cpu_c) * min(1.0, dt / 20.0)
+
+    def enclosure_c(self) -> float:
+        return self.cellar_c + _ENCLOSURE_OFFSET
+
+    def cpu_fan_duty(self) -> float:
+        if self.cpu_c < 50:
+            return 0.0
+        if self.cpu_c < 60:
+            return 0.3
+        if self.cpu_c < 67.5:
+            return 0.5
+        if self.cpu_c < 75:
+            return 0.7
+        return 1.0
+
+    def cpu_fan_rpm(self) -> int:
+        return int(self.cpu_fan_duty() * 8000)
+
+    def probe_c(self, index: int) -> float:
+        drift = 0.3 * math.sin(self.elapsed / 21600.0 + index)
+        noise = self.rng.gauss(0, 0.02)
+        raw = self.cellar_c + index * 0.4 + drift + noise
+        return round(raw * 16) / 16
+
+
+class SimulatedMux:
+    def __init__(self) -> None:
+        self.mask = 0
+        self.switches = 0
+
+    def select(self, mask: int) -> None:
+        if mask != self.mask:
+            self.switches += 1
+        self.mask = mask
+
+    def channel(self) -> int | None:
+        if self.mask == 0:
+            return None
+        return self.mask.bit_length() - 1
+
+
+class SimulatedPanel:
+    _ARG_COUNTS = {
+        0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0x8D: 1, 0xA8: 1, 0xD3: 1,
+        0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1,
+    }
+
+    def __init__(self, channel: int) -> None:
+        self.channel = channel
+        self.framebuffer = bytearray(OLED_WIDTH * OLED_PAGES)
+        self.contrast = 0xCF
+        self.display_on = False
+        self.col_start = 0
+        self.col_end = OLED_WIDTH - 1
+        self.page_start = 0
+        self.page_end = OLED_PAGES - 1
+        self._col = 0
+        self._page = 0
+        self._pending: list[int] = []
+        self.frames = 0
+        self.command_bytes = 0
+        self.data_bytes = 0
+
+    def command(self, values: list[int]) -> None:
+        self.command_bytes += len(values)
+        for value in values:
+            if self._pending:
+                self._pending.append(value)
+                if len(self._pending) - 1 == self._ARG_COUNTS[self._pending[0]]:
+                    self._apply(self._pending)
+                    self._pending = []
+                continue
+            if value in self._ARG_COUNTS:
+                self._pending = [value]
+                continue
+            self._apply([value])
+
+    def data(self, values: list[int]) -> None:
+        self.data_bytes += len(values)
+        for value in values:
+            self.framebuffer[self._page * OLED_WIDTH + self._col] = value & 0xFF
+            self._col += 1
+            if self._col > self.col_end:
+                self._col = self.col_start
+                self._page += 1
+                if self._page > self.page_end:
+                    self._page = self.page_start
+
+    def _apply(self, command: list[int]) -> None:
+        op = command[0]
+        if op == 0x21:
+            self.col_start = command[1] % OLED_WIDTH
+            self.col_end = command[2] % OLED_WIDTH
+            self._col = self.col_start
+            self.frames += 1
+        elif op == 0x22:
+            self.page_start = command[1] % OLED_PAGES
+            self.page_end = command[2] % OLED_PAGES
+            self._page = self.page_start
+        elif op == 0x81:
+            self.contrast = command[1]
+        elif op == 0xAE:
+            self.display_on = False
+        elif op == 0xAF:
+            self.display_on = True
+        elif 0xB0 <= op <= 0xB7:
+            self._page = op - 0xB0
+        elif op <= 0x0F:
+            self._col = (self._col & 0xF0) | op
+        elif op <= 0x1F:
+            self._col = (self._col & 0x0F) | ((op & 0x0F) << 4)
+
+    def image(self):
+        from PIL import Image
+
+        image = Image.new("1", (OLED_WIDTH, OLED_PAGES * 8))
+        pixels = image.load()
+        for page in range(OLED_PAGES):
+            for col in range(OLED_WIDTH):
+                byte = self.framebuffer[page * OLED_WIDTH + col]
+                if not byte:
+                    continue
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        pixels[col, page * 8 + bit] = 1
+        return image
+
+    def stats(self) -> dict:
+        return {
+            "channel": self.channel,
+            "frames": self.frames,
+            "command_bytes": self.command_bytes,
+            "data_bytes": self.data_bytes,
+            "display_on": self.display_on,
+            "contrast": self.contrast,
+        }
+
+
+class SimulatedSMBus:
+    def __init__(self, simulator: "HardwareSimulator", bus: int) -> None:
+        self.simulator = simulator
+        self.bus = bus
+
+    def __enter__(self) -> "SimulatedSMBus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        return None
+
+    def write_byte(self, address: int, value: int) -> None:
+        with self.simulator.lock:
+            if address == PCA_ADDR:
+                self.simulator.mux.select(value)
+                return
+        raise OSError(121, "Remote I/O error")
+
+    def write_i2c_block_data(self, address: int, register: int, data: list[int]) -> None:
+        with self.simulator.lock:
+            if address != OLED_ADDR:
+                raise OSError(121, "Remote I/O error")
+            panel = self.simulator.selected_panel()
+            if panel is None:
+                raise OSError(121, "Remote I/O error")
+            if register == 0x00:
+                panel.command(list(data))
+            else:
+                panel.data(list(data))
+
+
+class HardwareSimulator:
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.rng = random.Random(env_int(SIM_SEED_ENV, 1337))
+        fan_count = max(1, env_int(SIM_FANS_ENV, DEFAULT_SIM_FANS))
+        self.fans = {
+            channel: SimulatedFan(
+                channel,
+                max_rpm=int(1700 + self.rng.randint(-150, 150)),
+                stall_percent=self.rng.randint(8, 14),
+            )
+            for channel in range(1, fan_count + 1)
+        }
+        self.model = ThermalModel(
+            list(self.fans.values()),
+            env_float(SIM_CELLAR_ENV, DEFAULT_CELLAR_C),
+            self.rng,
+        )
+        probe_count = max(0, env_int(SIM_DS18B20_ENV, DEFAULT_SIM_DS18B20))
+        self.probes = [f"28-00000{index:07x}" for index in range(0xA1B2C3, 0xA1B2C3 + probe_count)]
+        self.liquidctl_latency = env_int(SIM_LIQUIDCTL_LATENCY_ENV, DEFAULT_LIQUIDCTL_LATENCY_MS) / 1000
+        self.command_latency = env_int(SIM_COMMAND_LATENCY_ENV, DEFAULT_COMMAND_LATENCY_MS) / 1000
+        self.w1_delay = env_int(SIM_W1_DELAY_ENV, DEFAULT_W1_DELAY_MS) / 1000
+        self.mux = SimulatedMux()
+        self.panels: dict[int, SimulatedPanel] = {}
+        self._clock = time.monotonic()
+
+    def advance(self) -> None:
+        now = time.monotonic()
+        self.model.advance(now - self._clock)
+        self._clock = now
+
+    def run_command(self, cmd: list[str]) -> subprocess.CompletedProcess:
+        if not cmd:
+            raise FileNotFoundError("empty command")
+        name = os.path.basename(cmd[0])
+        args = list(cmd[1:])
+        handler = {
+            "liquidctl": self._liquidctl,
+            "vcgencmd": self._vcgencmd,
+            "sensors": self._sensors,
+            "iw": self._iw,
+            "wpa_cli": self._wpa_cli,
+        }.get(name)
+        if handler is None:
+            raise FileNotFoundError(cmd[0])
+        latency = self.liquidctl_latency if name == "liquidctl" else self.command_latency
+        if latency > 0:
+            time.sleep(latency * (0.8 + 0.4 * self.rng.random()))
+        with self.lock:
+            self.advance()
+            code, stdout, stderr = handler(args)
+        return subprocess.CompletedProcess(cmd, code, stdout, stderr)
+
+    def read_text(self, path: str) -> str:
+        if path.startswith("/sys/bus/w1/devices/") and path.endswith("/w1_slave"):
+            if self.w1_delay > 0:
+                time.sleep(self.w1_delay)
+        with self.lock:
+            self.advance()
+            reader = self._files().get(path)
+            if reader is None:
+                raise FileNotFoundError(path)
+            return reader()
+
+    def glob(self, pattern: str) -> list[str]:
+        depth = pattern.count("/")
+        candidates = set()
+        for path in self._files():
+            parts = path.split("/")
+            for end in range(2, len(parts) + 1):
+                candidates.add("/".join(parts[:end]))
+        return sorted(
+            path for path in candidates if path.count("/") == depth and fnmatch.fnmatchcase(path, pattern)
+        )
+
+    def smbus(self, bus: int) -> SimulatedSMBus:
+        return SimulatedSMBus(self, bus)
+
+    def selected_panel(self) -> SimulatedPanel | None:
+        channel = self.mux.channel()
+        if channel is None:
+            return None
+        panel = self.panels.get(channel)
+        if panel is None:
+            panel = SimulatedPanel(channel)
+            self.panels[channel] = panel
+        return panel
+
+    def panel_image(self, channel: int):
+        with self.lock:
+            panel = self.panels.get(channel)
+            return panel.image() if panel else None
+
+    def panel_stats(self) -> list[dict]:
+        with self.lock:
+            return [panel.stats() for _, panel in sorted(self.panels.items())]
+
+    def _files(self) -> dict:
+        files = {
+            "/sys/class/thermal/thermal_zone0/temp": lambda: f"{int(self.model.cpu_c * 1000)}\n",
+            "/sys/devices/platform/cooling_fan/hwmon/hwmon2/fan1_input": lambda: f"{self.model.cpu_fan_rpm()}\n",
+            "/sys/class/hwmon/hwmon2/fan1_input": lambda: f"{self.model.cpu_fan_rpm()}\n",
+            "/sys/class/hwmon/hwmon2/name": lambda: "cooling_fan\n",
+            "/sys/class/hwmon/hwmon0/name": lambda: "cpu_thermal\n",
+            "/sys/class/hwmon/hwmon0/temp1_input": lambda: f"{int(self.model.cpu_c * 1000)}\n",
+        }
+        for index, probe in enumerate(self.probes):
+            files[f"/sys/bus/w1/devices/{probe}/w1_slave"] = self._w1_reader(index)
+        return files
+
+    def _w1_reader(self, index: int):
+        def read() -> str:
+            millis = int(self.model.probe_c(index) * 1000)
+            raw = "72 01 4b 46 7f ff 0e 10 57"
+            return f"{raw} : crc=57 YES\n{raw} t={millis}\n"
+
+        return read
+
+    def _liquidctl(self, args: list[str]) -> tuple[int, str, str]:
+        if args[:1] == ["list"]:
+            return 0, "Device #0: Aquacomputer Octo\n", ""
+        if args[:1] == ["status"]:
+            lines = ["Aquacomputer Octo"]
+            lines.append(f"├── Sensor 1          {self.model.liquid_c:6.1f}  °C")
+            lines.append(f"├── Sensor 2          {self.model.liquid_c - 0.8:6.1f}  °C")
+            for channel, fan in sorted(self.fans.items()):
+                lines.append(f"├── Fan {channel} speed       {int(fan.rpm):6d}  rpm")
+                lines.append(f"├── Fan {channel} power       {fan.duty / 100 * 1.8:6.2f}  W")
+            lines.append("└── Voltage             12.07  V")
+            return 0, "\n".join(lines) + "\n", ""
+        if len(args) == 4 and args[0] == "set" and args[2] == "speed":
+            try:
+                channel = int(args[1].replace("fan", ""))
+                duty = int(args[3])
+            except ValueError:
+                return 1, "", f"ERROR: invalid arguments {' '.join(args)}"
+            fan = self.fans.get(channel)
+            if fan is None or not 0 <= duty <= 100:
+                return 1, "", f"ERROR: invalid channel or duty {' '.join(args)}"
+            fan.duty = duty
+            return 0, "", ""
+        return 1, "", f"ERROR: unsupported liquidctl command {' '.join(args)}"
+
+    def _vcgencmd(self, args: list[str]) -> tuple[int, str, str]:
+        if args == ["measure_temp"]:
+            return 0, f"temp={self.model.cpu_c:.1f}'C\n", ""
+        if args == ["get_throttled"]:
+            return 0, "throttled=0x0\n", ""
+        if args[:1] == ["measure_clock"]:
+            return 0, "frequency(0)=2400000000\n", ""
+        return 1, "", "error=2 error_msg=\"Command not registered\""
+
+    def _sensors(self, args: list[str]) -> tuple[int, str, str]:
+        nvme_c = self.model.enclosure_c() + 21.0 + self.rng.gauss(0, 0.2)
+        output = (
+            "cpu_thermal-virtual-0\n"
+            "Adapter: Virtual device\n"
+            f"temp1:        +{self.model.cpu_c:.1f}°C\n"
+            "\n"
+            "nvme-pci-0100\n"
+            "Adapter: PCI adapter\n"
+            f"Composite:    +{nvme_c:.1f}°C  (low  = -273.1°C, high = +81.8°C)\n"
+            "\n"
+        )
+        return 0, output, ""
+
+    def _iw(self, args: list[str]) -> tuple[int, str, str]:
+        signal = -55 + int(self.rng.gauss(0, 2))
+        output = (
+            "Connected to 00:11:22:33:44:55 (on wlan0)\n"
+            "\tSSID: cellar\n"
+            "\tfreq: 5180\n"
+            f"\tsignal: {signal} dBm\n"
+        )
+        return 0, output, ""
+
+    def _wpa_cli(self, args: list[str]) -> tuple[int, str, str]:
+        return 0, f"RSSI={-55 + int(self.rng.gauss(0, 2))}\nLINKSPEED=433\n", ""
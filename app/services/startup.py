@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from app.services.logger import get_logger
+
+_lock = threading.Lock()
+_phases: list[dict] = []
+_began_at: float | None = None
+_ready_at: float | None = None
+_first_response_at: float | None = None
+_warmed_at: float | None = None
+
+
+def _process_started() -> float:
+    try:
+        with open("/proc/self/stat", "rb") as handle:
+            start_ticks = int(handle.read().rsplit(b")", 1)[1].split()[19])
+        with open("/proc/uptime", "rb") as handle:
+            uptime = float(handle.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return time.monotonic()
+    return time.monotonic() - max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+_STARTED = _process_started()
+
+
+@contextmanager
+def startup_phase(name: str, background: bool = False):
+    global _began_at
+    started = time.monotonic()
+    if _began_at is None and not background:
+        _began_at = started
+    try:
+        yield
+    finally:
+        elapsed = time.monotonic() - started
+        with _lock:
+            _phases.append({"name": name, "ms": round(elapsed * 1000, 1), "background": background})
+
+
+def mark_ready() -> None:
+    global _ready_at
+    with _lock:
+        _ready_at = time.monotonic()
+        imported_at = _began_at if _began_at is not None else _ready_at
+        _phases.insert(0, {"name": "interpreter+imports", "ms": _elapsed_ms(imported_at), "background": False})
+    get_logger().info("startup ready in %.0f ms since process start", _elapsed_ms(_ready_at))
+
+
+def mark_first_response() -> None:
+    global _first_response_at
+    if _first_response_at is None:
+        _first_response_at = time.monotonic()
+
+
+def run_warmup(steps: list[tuple[str, Callable[[], None]]]) -> None:
+    threading.Thread(target=_warmup, args=(steps,), name="startup-warmup", daemon=True).start()
+
+
+def startup_report() -> dict:
+    with _lock:
+        return {
+            "ready_ms": _elapsed_ms(_ready_at),
+            "first_response_ms": _elapsed_ms(_first_response_at),
+            "warm_ms": _elapsed_ms(_warmed_at),
+            "phases": [dict(phase) for phase in _phases],
+        }
+
+
+def _warmup(steps: list[tuple[str, Callable[[], None]]]) -> None:
+    global _warmed_at
+    logger = get_logger()
+    for name, step in steps:
+        try:
+            with startup_phase(name, background=True):
+                step()
+        except Exception:
+            logger.exception("startup step %s failed", name)
+    with _lock:
+        _warmed_at = time.monotonic()
+        summary = ", ".join(f"{phase['name']} {phase['ms']:.0f} ms" for phase in _phases)
+    logger.info("startup warm in %.0f ms (%s)", _elapsed_ms(_warmed_at), summary)
+
+
+def _elapsed_ms(at: float | None) -> float | None:
+    return round((at - _STARTED) * 1000, 1) if at is not None else None
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from app.services import telemetry
+from app.services.governor import scaled
+from app.services.instrumentation import increment
+from app.services.logger import get_logger
+from app.services.system_status import get_status_payload
+
+HISTORY_EVENTS = 64
+RETRY_MILLISECONDS = 5000
+DASHBOARD_KEY = re.compile(r"^(cpu_temp|ambient_temp|pump_percent|cpu_fan_rpm|fan_\d+_rpm|sensor_\d+)$")
+
+_lock = threading.Lock()
+_broadcaster: "Broadcaster | None" = None
+_status: dict | None = None
+_status_version = 0
+_COALESCE_SECONDS = 0.25
+_STATUS_SECONDS = 10
+_KEEPALIVE_SECONDS = 15
+_KEEPALIVE = b": keepalive\n\n"
+
+
+class Broadcaster:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._changed: set[str] = set()
+        self._changed_at = 0.0
+        self._stopping = False
+        self._clients = 0
+        self._sequence = 0
+        self._events: deque[tuple[int, bytes]] = deque(maxlen=HISTORY_EVENTS)
+        self._status_version = 0
+        self._status_at = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ready: asyncio.Event | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        telemetry.subscribe(self._on_telemetry)
+        self._thread.start()
+
+    def stop(self) -> None:
+        telemetry.unsubscribe(self._on_telemetry)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join(timeout=2)
+
+    def attach(self) -> tuple[int, bytes]:
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            if self._loop is not loop:
+                self._loop = loop
+                self._ready = asyncio.Event()
+            self._clients += 1
+            self._condition.notify()
+            return self._sequence, self._snapshot_event()
+
+    def detach(self) -> None:
+        with self._condition:
+            self._clients -= 1
+
+    def ready(self) -> asyncio.Event:
+        return self._ready
+
+    def since(self, sequence: int) -> tuple[int, list[bytes] | None]:
+        with self._condition:
+            if sequence == self._sequence:
+                return sequence, []
+            if not self._events or self._events[0][0] > sequence + 1:
+                return self._sequence, None
+            return self._sequence, [event for number, event in self._events if number > sequence]
+
+    def snapshot_event(self) -> tuple[int, bytes]:
+        with self._condition:
+            return self._sequence, self._snapshot_event()
+
+    def status(self) -> dict:
+        with self._condition:
+            return {"clients": self._clients, "sequence": self._sequence, "buffered": len(self._events)}
+
+    def _run(self) -> None:
+        logger = get_logger()
+        while True:
+            with self._condition:
+                while not self._stopping and self._wait_seconds(time.monotonic()) != 0:
+                    self._condition.wait(self._wait_seconds(time.monotonic()))
+                if self._stopping:
+                    break
+                now = time.monotonic()
+                changed = set()
+                if self._changed and now - self._changed_at >= scaled(_COALESCE_SECONDS):
+                    changed, self._changed = self._changed, set()
+                check_status = self._clients > 0 and now - self._status_at >= _STATUS_SECONDS
+                if check_status:
+                    self._status_at = now
+            try:
+                if changed:
+                    self._publish_delta(changed)
+                if check_status:
+                    self._publish_status()
+            except Exception:
+                logger.exception("telemetry stream tick failed")
+
+    def _wait_seconds(self, now: float) -> float | None:
+        waits = []
+        if self._changed:
+            waits.append(self._changed_at + scaled(_COALESCE_SECONDS) - now)
+        if self._clients > 0:
+            waits.append(self._status_at + _STATUS_SECONDS - now)
+        if not waits:
+            return None
+        return max(0.0, min(waits))
+
+    def _on_telemetry(self, changed: set[str]) -> None:
+        changed = {key for key in changed if dashboard_key(key)}
+        if not changed:
+            return
+        with self._condition:
+            if not self._changed:
+                self._changed_at = time.monotonic()
+            self._changed |= changed
+            self._condition.notify()
+
+    def _publish_delta(self, changed: set[str]) -> None:
+        readings = telemetry.snapshot()
+        values = {key: readings[key] for key in sorted(changed) if key in readings}
+        if values:
+            self._broadcast("delta", {"values": values})
+
+    def _publish_status(self) -> None:
+        version, status = current_status()
+        with self._condition:
+            unchanged = version == self._status_version
+            self._status_version = version
+        if not unchanged:
+            self._broadcast("status", status)
+
+    def _broadcast(self, name: str, payload: dict) -> None:
+        with self._condition:
+            self._sequence += 1
+            self._events.append((self._sequence, _encode(name, self._sequence, payload)))
+            loop = self._loop
+        increment(f"stream.{name}_events")
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        ready, self._ready = self._ready, asyncio.Event()
+        ready.set()
+
+    def _snapshot_event(self) -> bytes:
+        readings = telemetry.snapshot()
+        payload = {"values": {key: value for key, value in readings.items() if dashboard_key(key)}, "status": _status}
+        return _encode("snapshot", self._sequence, payload)
+
+
+async def stream_events(disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[bytes]:
+    broadcaster = _get_broadcaster()
+    sequence, snapshot = broadcaster.attach()
+    increment("stream.connects")
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode() + snapshot
+        while not await disconnected():
+            ready = broadcaster.ready()
+            sequence, events = broadcaster.since(sequence)
+            if events is None:
+                increment("stream.resyncs")
+                sequence, snapshot = broadcaster.snapshot_event()
+                yield snapshot
+                continue
+            if events:
+                yield b"".join(events)
+                continue
+            try:
+                await asyncio.wait_for(ready.wait(), _KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield _KEEPALIVE
+    finally:
+        broadcaster.detach()
+
+
+def dashboard_key(key: str) -> bool:
+    return DASHBOARD_KEY.match(key) is not None
+
+
+def current_status() -> tuple[int, dict]:
+    global _status, _status_version
+    status = _status_payload()
+    with _lock:
+        if status != _status:
+            _status = status
+            _status_version += 1
+        return _status_version, _status
+
+
+def stream_status() -> dict:
+    broadcaster = _broadcaster
+    return broadcaster.status() if broadcaster is not None else {"clients": 0, "sequence": 0, "buffered": 0}
+
+
+def shutdown_stream() -> None:
+    global _broadcaster
+    with _lock:
+        broadcaster, _broadcaster = _broadcaster, None
+    if broadcaster is not None:
+        broadcaster.stop()
+
+
+def _get_broadcaster() -> Broadcaster:
+    global _broadcaster
+    with _lock:
+        if _broadcaster is None:
+            _broadcaster = Broadcaster()
+            _broadcaster.start()
+        return _broadcaster
+
+
+def _status_payload() -> dict:
+    payload = get_status_payload()
+    wifi = payload["wifi"]
+    liquidctl = payload["liquidctl"]
+    return {
+        "liquidctl": liquidctl,
+        "wifi": wifi,
+        "ok": liquidctl == "Connected" and wifi.get("percent") is not None,
+    }
+
+
+def _encode(name: str, sequence: int, payload: dict) -> bytes:
+    data = json.dumps({"seq": sequence, **payload}, separators=(",", ":"))
+    return f"id: {sequence}\nevent: {name}\ndata: {data}\n\n".encode()
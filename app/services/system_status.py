@@ -1,31 +1,31 @@
 import json
 import os
 import shutil
-import subprocess
+import threading
 import time
 import urllib.error
 import urllib.request
 from pathlib import Path
 
-from app.services.liquidctl import has_liquidctl_devices
+from app.services.governor import scaled, under_pressure
+from app.services.hardware import hardware_mode, run_command
+from app.services.instrumentation import timed
+from app.services.liquidctl import device_snapshot, has_liquidctl_devices
 from app.services.logger import get_logger
 
 
-def _read_proc(path: str) -> str:
-    return Path(path).read_text(encoding="utf-8").strip()
-
-
-def get_uptime() -> str:
-    try:
-        raw = _read_proc("/proc/uptime").split()[0]
-        total_seconds = int(float(raw))
-    except (OSError, ValueError, IndexError):
-        return "unknown"
-    return _format_duration(total_seconds)
-
+STATUS_REFRESH_SECONDS = 5
+LIQUIDCTL_STALE_SECONDS = 30
+LIQUIDCTL_PROBE_SECONDS = 60
 
 _IMAGE_START: float | None = None
 _WIFI_CACHE: dict | None = None
+_collector_lock = threading.Lock()
+_collector: "StatusCollector | None" = None
+
+
+def _read_proc(path: str) -> str:
+    return Path(path).read_text(encoding="utf-8").strip()
 
 
 def set_image_start_time(epoch_seconds: float) -> None:
@@ -73,27 +73,33 @@ def _meminfo_value(lines: list[str], key: str) -> int | None:
     return None
 
 
-def get_liquidctl_status() -> str:
+def get_liquidctl_status(probe: bool = True) -> str | None:
+    devices = device_snapshot()
+    if devices is not None and time.monotonic() - devices[1] <= LIQUIDCTL_STALE_SECONDS:
+        return "Connected" if devices[0] else "Not connected"
+    if not probe:
+        return None
     try:
         return "Connected" if has_liquidctl_devices() else "Not connected"
     except Exception:
         return "unknown"
 
 
-def get_cpu_usage() -> str:
+def get_cpu_usage(previous: tuple[int, int] | None) -> tuple[str, tuple[int, int] | None]:
     try:
-        total_1, idle_1 = _read_cpu_times()
-        time.sleep(0.1)
-        total_2, idle_2 = _read_cpu_times()
+        current = _read_cpu_times()
     except OSError:
-        return "unknown"
-    delta_total = total_2 - total_1
-    delta_idle = idle_2 - idle_1
+        return "unknown", None
+    if previous is None:
+        return "unknown", current
+    total_1, idle_1 = previous
+    delta_total = current[0] - total_1
+    delta_idle = current[1] - idle_1
     if delta_total <= 0:
-        return "unknown"
+        return "unknown", current
     busy = max(delta_total - delta_idle, 0)
     percent = busy / delta_total * 100
-    return f"{percent:.1f}%"
+    return f"{percent:.1f}%", current
 
 
 def _read_cpu_times() -> tuple[int, int]:
@@ -318,12 +324,7 @@ def _read_wifi_exporter(interface: str) -> dict | None:
 def _read_wpa_signal(interface: str) -> dict | None:
     socket_path = os.getenv("HYDROX_WIFI_WPA_PATH", "/host-run/wpa_supplicant")
     try:
-        result = subprocess.run(
-            ["wpa_cli", "-p", socket_path, "-i", interface, "signal_poll"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_command(["wpa_cli", "-p", socket_path, "-i", interface, "signal_poll"])
     except FileNotFoundError:
         _log_wifi_once("_wifi_wpa_missing_logged", "wifi strength unavailable: wpa_cli not installed")
         return None
@@ -354,12 +355,7 @@ def _read_wpa_signal(interface: str) -> dict | None:
 
 def _read_iw_signal(interface: str) -> dict | None:
     try:
-        result = subprocess.run(
-            ["iw", "dev", interface, "link"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_command(["iw", "dev", interface, "link"])
     except FileNotFoundError:
         _log_wifi_once("_wifi_iw_missing_logged", "wifi strength unavailable: iw not installed")
         return None
@@ -418,14 +414,89 @@ def _signal_to_percent(signal_dbm: int) -> int:
     return int(max(0, min(100, normalized)))
 
 
+class StatusCollector:
+    def __init__(self) -> None:
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._cpu_times: tuple[int, int] | None = None
+        self._probed_at: float | None = None
+        self._values: dict = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self.collect(probe=False)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join(timeout=2)
+
+    def payload(self) -> dict:
+        with self._lock:
+            values = dict(self._values)
+        booted_at = values.pop("booted_at", None)
+        return {
+            "status": "Ok",
+            "host_uptime": _format_duration(int(time.time() - booted_at)) if booted_at else "unknown",
+            "image_uptime": get_image_uptime(),
+            **values,
+            "hardware": hardware_mode(),
+        }
+
+    def collect(self, probe: bool = True) -> None:
+        cpu, self._cpu_times = get_cpu_usage(self._cpu_times)
+        now = time.monotonic()
+        probe = probe and not under_pressure() and (self._probed_at is None or now - self._probed_at >= LIQUIDCTL_PROBE_SECONDS)
+        liquidctl = get_liquidctl_status(probe)
+        if probe and liquidctl is not None:
+            self._probed_at = now
+        values = {
+            "booted_at": _boot_time(),
+            "cpu": cpu,
+            "memory": get_memory_usage(),
+            "disk_data": get_disk_usage("/data"),
+            "liquidctl": liquidctl or self._values.get("liquidctl", "unknown"),
+            "wifi": get_wifi_strength(),
+        }
+        with self._lock:
+            self._values = values
+
+    def _run(self) -> None:
+        while not self._stopping.wait(scaled(STATUS_REFRESH_SECONDS)):
+            try:
+                with timed("status.collect"):
+                    self.collect()
+            except Exception:
+                get_logger().exception("status collector tick failed")
+
+
 def get_status_payload() -> dict:
-    return {
-        "status": "Ok",
-        "host_uptime": get_uptime(),
-        "image_uptime": get_image_uptime(),
-        "cpu": get_cpu_usage(),
-        "memory": get_memory_usage(),
-        "disk_data": get_disk_usage("/data"),
-        "liquidctl": get_liquidctl_status(),
-        "wifi": get_wifi_strength(),
-    }
+    return _get_collector().payload()
+
+
+def start_status_collector() -> None:
+    _get_collector()
+
+
+def shutdown_status_collector() -> None:
+    global _collector
+    with _collector_lock:
+        collector, _collector = _collector, None
+    if collector is not None:
+        collector.stop()
+
+
+def _get_collector() -> StatusCollector:
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = StatusCollector()
+            _collector.start()
+        return _collector
+
+
+def _boot_time() -> float | None:
+    try:
+        return time.time() - float(_read_proc("/proc/uptime").split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections.abc import Callable
+
+from app.services.logger import get_logger
+
+_lock = threading.Lock()
+_values: dict[str, float] = {}
+_updated_at: dict[str, float] = {}
+_version = 0
+_subscribers: list[Callable[[set[str]], None]] = []
+
+
+def publish(values: dict[str, float | None]) -> None:
+    global _version
+    now = time.time()
+    changed: set[str] = set()
+    with _lock:
+        for key, value in values.items():
+            if value is None:
+                continue
+            if _values.get(key) != value:
+                _values[key] = value
+                changed.add(key)
+            _updated_at[key] = now
+        if changed:
+            _version += 1
+        subscribers = list(_subscribers) if changed else []
+    for callback in subscribers:
+        try:
+            callback(changed)
+        except Exception:
+            get_logger().exception("telemetry subscriber failed")
+
+
+def subscribe(callback: Callable[[set[str]], None]) -> None:
+    with _lock:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[set[str]], None]) -> None:
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def latest(key: str, max_age: float | None = None) -> float | None:
+    with _lock:
+        if max_age is not None and time.time() - _updated_at.get(key, 0.0) > max_age:
+            return None
+        return _values.get(key)
+
+
+def snapshot(max_age: float | None = None) -> dict[str, float]:
+    with _lock:
+        if max_age is None:
+            return dict(_values)
+        cutoff = time.time() - max_age
+        return {key: value for key, value in _values.items() if _updated_at.get(key, 0.0) >= cutoff}
+
+
+def updated_at(key: str) -> float | None:
+    with _lock:
+        return _updated_at.get(key)
+
+
+def version() -> int:
+    with _lock:
+        return _version
@@ -42,6 +42,7 @@ const refreshStatus = async () => {
     updateText("memory", data.memory ?? "unknown");
     updateText("disk_data", data.disk_data ?? "unknown");
     updateText("liquidctl", data.liquidctl ?? "unknown");
+    updateText("hardware", data.hardware ?? "unknown");
     updateText("wifi_interface", data.wifi?.interface ?? "wlan0");
     renderWifi(data.wifi);
   } catch (err) {
@@ -49,5 +50,317 @@ const refreshStatus = async () => {
   }
 };
 
+const formatMs = (value) => {
+  if (value === null || value === undefined) {
+    return "--";
+  }
+  if (value >= 1000) {
+    return `${(value / 1000).toFixed(2)} s`;
+  }
+  return `${value >= 10 ? value.toFixed(0) : value.toFixed(2)} ms`;
+};
+
+const formatAge = (seconds) => {
+  if (seconds === null || seconds === undefined) {
+    return "never";
+  }
+  if (seconds < 60) {
+    return `${Math.round(seconds)}s ago`;
+  }
+  if (seconds < 3600) {
+    return `${Math.round(seconds / 60)}m ago`;
+  }
+  return `${Math.round(seconds / 3600)}h ago`;
+};
+
+const renderPerformance = (data) => {
+  const rows = document.querySelector("[data-perf-rows]");
+  if (!rows) {
+    return;
+  }
+  const metrics = data.metrics || [];
+  if (!metrics.length) {
+    rows.innerHTML = '<tr><td colspan="8">Collecting samples…</td></tr>';
+  } else {
+    rows.innerHTML = metrics
+      .map((metric) => {
+        const failing =
+          metric.last_error_age !== null &&
+          (metric.last_success_age === null || metric.last_error_age < metric.last_success_age);
+        const title = metric.last_error ? ` title="${metric.last_error.replace(/"/g, "&quot;")}"` : "";
+        return `
+          <tr class="${failing ? "perf-row--error" : ""}"${title}>
+            <td>${metric.name}</td>
+            <td>${metric.count}</td>
+            <td>${metric.errors}</td>
+            <td>${metric.timeouts}</td>
+            <td>${formatMs(metric.p50_ms)}</td>
+            <td>${formatMs(metric.p95_ms)}</td>
+            <td>${formatMs(metric.max_ms)}</td>
+            <td>${formatAge(metric.last_success_age)}</td>
+          </tr>
+        `;
+      })
+      .join("");
+  }
+  const counters = document.querySelector("[data-perf-counters]");
+  if (counters) {
+    const entries = Object.entries(data.counters || {});
+    counters.textContent = entries.map(([name, value]) => `${name}: ${value}`).join(" · ");
+  }
+  const uptime = document.querySelector("[data-perf-uptime]");
+  if (uptime && data.uptime_seconds !== undefined) {
+    uptime.textContent = `Last ${formatAge(data.uptime_seconds).replace(" ago", "")}`;
+  }
+};
+
+const refreshPerformance = async () => {
+  try {
+    const response = await fetch("/api/admin/performance");
+    if (!response.ok) {
+      return;
+    }
+    renderPerformance(await response.json());
+  } catch (err) {
+    // Silent: avoid spam on transient API failures.
+  }
+};
+
+const renderGovernor = (data) => {
+  const field = (name) => document.querySelector(`[data-governor-field="${name}"]`);
+  const setField = (name, value) => {
+    const el = field(name);
+    if (el) {
+      el.textContent = value;
+    }
+  };
+  setField("level", data.level ?? "unknown");
+  setField("reasons", data.reasons && data.reasons.length ? data.reasons.join(", ") : "none");
+  setField("loop_lag_ms", `${data.loop_lag_ms ?? 0} ms`);
+  const dot = document.querySelector("[data-governor-dot]");
+  if (dot) {
+    dot.classList.toggle("status-dot--ok", data.level === "normal");
+  }
+  const multiplier = document.querySelector("[data-governor-multiplier]");
+  if (multiplier) {
+    multiplier.textContent = `Intervals x${data.multiplier ?? 1}`;
+  }
+  const rows = document.querySelector("[data-governor-transitions]");
+  if (!rows) {
+    return;
+  }
+  const transitions = data.transitions || [];
+  if (!transitions.length) {
+    rows.innerHTML = '<tr><td colspan="3">No transitions since start.</td></tr>';
+    return;
+  }
+  rows.innerHTML = transitions
+    .map(
+      (transition) => `
+        <tr>
+          <td>${formatAge(Date.now() / 1000 - transition.at)}</td>
+          <td>${transition.from} → ${transition.to}</td>
+          <td>${transition.reasons.length ? transition.reasons.join(", ") : "recovered"}</td>
+        </tr>
+      `
+    )
+    .join("");
+};
+
+const refreshGovernor = async () => {
+  try {
+    const response = await fetch("/api/admin/governor");
+    if (!response.ok) {
+      return;
+    }
+    renderGovernor(await response.json());
+  } catch (err) {
+    // Silent: avoid spam on transient API failures.
+  }
+};
+
+const controlHold = (channel, data) => {
+  const hold = (data.rpm_holds || {})[channel];
+  if (hold) {
+    return `${hold.target_rpm} RPM (${hold.rpm ?? "-"} now)`;
+  }
+  return (data.held || []).includes(Number(channel)) ? "manual" : "-";
+};
+
+const renderControl = (data) => {
+  const profile = document.querySelector("[data-control-profile]");
+  if (profile) {
+    profile.textContent = data.profile_name || "No active profile";
+  }
+  const engine = document.querySelector('[data-control-field="engine"]');
+  if (engine) {
+    engine.textContent = `${data.paused ? "paused" : "running"} at ${data.hz} Hz`;
+  }
+  const actuation = data.actuation || {};
+  const limits = document.querySelector('[data-control-field="limits"]');
+  if (limits) {
+    limits.textContent = `±${actuation.hysteresis}%, ${actuation.dwell_seconds}s dwell, ${actuation.slew_per_second}%/s slew`;
+  }
+  const rows = document.querySelector("[data-control-channels]");
+  if (!rows) {
+    return;
+  }
+  const channels = actuation.channels || {};
+  const names = [...new Set([...Object.keys(channels), ...Object.keys(data.rpm_holds || {})])].sort(
+    (a, b) => Number(a) - Number(b)
+  );
+  if (!names.length) {
+    rows.innerHTML = '<tr><td colspan="5">No commands sent yet.</td></tr>';
+    return;
+  }
+  rows.innerHTML = names
+    .map((channel) => {
+      const state = channels[channel] || {};
+      const hold = (data.rpm_holds || {})[channel];
+      return `
+        <tr>
+          <td>Fan ${channel}</td>
+          <td>${state.duty ?? hold?.duty ?? "-"}%</td>
+          <td>${state.target ?? "-"}%</td>
+          <td>${state.suppressed ?? 0}</td>
+          <td>${controlHold(channel, data)}</td>
+        </tr>
+      `;
+    })
+    .join("");
+};
+
+const refreshControl = async () => {
+  try {
+    const response = await fetch("/api/admin/control");
+    if (!response.ok) {
+      return;
+    }
+    renderControl(await response.json());
+  } catch (err) {
+    // Silent: avoid spam on transient API failures.
+  }
+};
+
+const HOST_PALETTE = ["#38bdf8", "#22c55e", "#f97316", "#a855f7", "#eab308", "#f472b6", "#14b8a6"];
+const HOST_CPU_SERIES = /^cpu(\d*|_iowait)_percent$/;
+
+const hostLabel = (name) => {
+  if (name === "cpu_percent") {
+    return "CPU";
+  }
+  if (name === "cpu_iowait_percent") {
+    return "I/O wait";
+  }
+  return `Core ${name.replace("cpu", "").replace("_percent", "")}`;
+};
+
+const hostPoints = (values) => {
+  const step = values.length > 1 ? 460 / (values.length - 1) : 0;
+  return values
+    .map((value, index) => `${(40 + index * step).toFixed(1)},${(210 - (Math.min(Math.max(value, 0), 100) / 100) * 190).toFixed(1)}`)
+    .join(" ");
+};
+
+const renderHostGrid = () => {
+  const grid = document.querySelector("[data-host-grid]");
+  const labels = document.querySelector("[data-host-labels]");
+  if (!grid || !labels || grid.childElementCount) {
+    return;
+  }
+  const lines = [];
+  const text = [];
+  [0, 25, 50, 75, 100].forEach((percent) => {
+    const y = 210 - (percent / 100) * 190;
+    lines.push(`<line x1="40" y1="${y}" x2="500" y2="${y}" />`);
+    text.push(`<text x="34" y="${y + 3}" text-anchor="end">${percent}</text>`);
+  });
+  grid.innerHTML = lines.join("");
+  labels.innerHTML = text.join("");
+};
+
+const formatHostLatest = (series) => {
+  const latest = (name) => {
+    const values = series[name];
+    return values && values.length ? values[values.length - 1] : null;
+  };
+  const parts = [];
+  const loads = ["load_1", "load_5", "load_15"].map(latest);
+  if (loads.every((value) => value !== null)) {
+    parts.push(`load: ${loads.map((value) => value.toFixed(2)).join(" / ")}`);
+  }
+  const memory = latest("mem_available_mb");
+  if (memory !== null) {
+    parts.push(`mem available: ${memory.toFixed(0)} MB`);
+  }
+  Object.keys(series)
+    .filter((name) => /^cpufreq\d+_mhz$/.test(name))
+    .forEach((name) => parts.push(`${name.replace("_mhz", "")}: ${latest(name)} MHz`));
+  const throttled = latest("throttled");
+  if (throttled !== null) {
+    parts.push(`throttled: 0x${Math.round(throttled).toString(16)}`);
+  }
+  Object.keys(series)
+    .filter((name) => /^disk_.+_read_kbps$/.test(name))
+    .forEach((name) => {
+      const disk = name.slice(5, -"_read_kbps".length);
+      const written = latest(`disk_${disk}_write_kbps`);
+      const busy = latest(`disk_${disk}_busy_percent`);
+      parts.push(`${disk}: ${latest(name).toFixed(0)} / ${(written ?? 0).toFixed(0)} kB/s r/w, ${(busy ?? 0).toFixed(0)}% busy`);
+    });
+  return parts.length ? parts.join(" · ") : "Collecting samples…";
+};
+
+const renderHost = (series) => {
+  renderHostGrid();
+  const cpuSeries = Object.keys(series)
+    .filter((name) => HOST_CPU_SERIES.test(name))
+    .sort((a, b) => a.localeCompare(b, undefined, { numeric: true }));
+  const lines = document.querySelector("[data-host-lines]");
+  if (lines) {
+    lines.innerHTML = cpuSeries
+      .map((name, index) => {
+        const width = name === "cpu_percent" ? 2.5 : 1.5;
+        const color = HOST_PALETTE[index % HOST_PALETTE.length];
+        return `<polyline points="${hostPoints(series[name])}" fill="none" stroke="${color}" stroke-width="${width}" />`;
+      })
+      .join("");
+  }
+  const legend = document.querySelector("[data-host-legend]");
+  if (legend) {
+    legend.innerHTML = cpuSeries
+      .map(
+        (name, index) =>
+          `<span class="legend__item" style="--legend-color: ${HOST_PALETTE[index % HOST_PALETTE.length]}"><span class="legend__swatch"></span>${hostLabel(name)}</span>`
+      )
+      .join("");
+  }
+  const latest = document.querySelector("[data-host-latest]");
+  if (latest) {
+    latest.textContent = formatHostLatest(series);
+  }
+};
+
+const refreshHost = async () => {
+  try {
+    const response = await fetch("/api/host/recent?limit=24");
+    if (!response.ok) {
+      return;
+    }
+    const data = await response.json();
+    renderHost(data.series || {});
+  } catch (err) {
+    // Silent: avoid spam on transient API failures.
+  }
+};
+
 refreshStatus();
+refreshPerformance();
+refreshHost();
+refreshGovernor();
+refreshControl();
 setInterval(refreshStatus, 5000);
+setInterval(refreshPerformance, 5000);
+setInterval(refreshHost, 5000);
+setInterval(refreshGovernor, 5000);
+setInterval(refreshControl, 5000);
@@ -1,4 +1,11 @@
 const statusDot = document.querySelector('[data-status-dot]');
+const STREAM_EVENTS = ['snapshot', 'delta', 'status'];
+
+const setStatusDot = (ok) => {
+  if (statusDot) {
+    statusDot.classList.toggle('brand__dot--ok', ok);
+  }
+};
 
 const updateStatusDot = async () => {
   if (!statusDot) {
@@ -13,11 +20,39 @@ const updateStatusDot = async () => {
     const ok = data.status === 'Ok';
     const liquidctlOk = data.liquidctl === 'Connected';
     const wifiOk = data.wifi?.percent !== null && data.wifi?.percent !== undefined;
-    statusDot.classList.toggle('brand__dot--ok', ok && liquidctlOk && wifiOk);
+    setStatusDot(ok && liquidctlOk && wifiOk);
   } catch (error) {
     // Ignore transient failures.
   }
 };
 
-updateStatusDot();
-setInterval(updateStatusDot, 10000);
+const startPolling = () => {
+  updateStatusDot();
+  setInterval(updateStatusDot, 10000);
+  document.dispatchEvent(new CustomEvent('hydrox:stream-closed'));
+};
+
+const connectStream = () => {
+  if (!window.EventSource) {
+    startPolling();
+    return;
+  }
+  const source = new EventSource('/api/stream');
+  STREAM_EVENTS.forEach((name) => {
+    source.addEventListener(name, (event) => {
+      const payload = JSON.parse(event.data);
+      const status = name === 'snapshot' ? payload.status : name === 'status' ? payload : null;
+      if (status) {
+        setStatusDot(status.ok);
+      }
+      document.dispatchEvent(new CustomEvent(`hydrox:${name}`, { detail: payload }));
+    });
+  });
+  source.addEventListener('error', () => {
+    if (source.readyState === EventSource.CLOSED) {
+      startPolling();
+    }
+  });
+};
+
+connectStream();
@@ -12,6 +12,7 @@ const fanChart = document.querySelector('[data-chart="fan"]');
 const wifiValue = document.querySelector('[data-wifi-value]');
 const wifiSub = document.querySelector('[data-wifi-sub]');
 const wifiGauge = document.querySelector('[data-wifi-gauge]');
+const liquidctlStatus = document.querySelector('[data-liquidctl-status]');
 
 const fanPalette = ['#38bdf8', '#818cf8', '#f472b6', '#22c55e', '#eab308', '#f97316', '#a855f7'];
 const fanTiles = document.querySelectorAll('[data-fan-channel]');
@@ -19,6 +20,17 @@ const sensorTiles = document.querySelectorAll('[data-sensor-id]');
 let latestTempSeries = [];
 let latestFanSeries = {};
 let latestTempLabels = [];
+let tempHistory = {};
+let tempSensors = [];
+const liveValues = {};
+let snapshotVersion = null;
+const HISTORY_LIMIT = 24;
+const CPU_FAN_MAX_RPM = 8000;
+const fanMaxRpm = new Map(
+  Array.from(fanTiles)
+    .filter((tile) => tile.getAttribute('data-fan-max-rpm'))
+    .map((tile) => [tile.getAttribute('data-fan-channel'), Number.parseInt(tile.getAttribute('data-fan-max-rpm'), 10)])
+);
 
 const fanModal = document.getElementById('fan-modal');
 const fanModalFan = fanModal?.querySelector('[data-modal-fan]');
@@ -222,84 +234,66 @@ const buildPoints = (series, min, max) => {
   return points.join(' ');
 };
 
-const refreshMetrics = async () => {
-  try {
-    const response = await fetch('/api/metrics/latest', { cache: 'no-store' });
-    if (response.ok) {
-      const data = await response.json();
-      metricEls.forEach((el) => {
-        const key = el.getAttribute('data-metric');
-        const value = data[key];
-        setMetricValue(el, value);
-      });
+const applyMetrics = (data) => {
+  metricEls.forEach((el) => {
+    const key = el.getAttribute('data-metric');
+    if (key in data) {
+      setMetricValue(el, data[key]);
     }
-  } catch (error) {
-    // Ignore transient fetch failures.
-  }
+  });
 };
 
-const refreshTrend = async () => {
-  try {
-    const response = await fetch('/api/temperature/recent?limit=24', { cache: 'no-store' });
-    if (!response.ok) {
+const renderTrend = () => {
+  const series = tempHistory;
+  const sensorMeta = tempSensors;
+  const sensorNameMap = new Map(sensorMeta.map((sensor) => [String(sensor.id), sensor.name]));
+  const cpu = series.cpu || [];
+  const ambient = series.ambient || [];
+  const tempSeries = [];
+  if (cpu.length > 1) {
+    tempSeries.push({ key: 'cpu', label: 'CPU', values: cpu, color: 'var(--accent)' });
+  }
+  if (ambient.length > 1) {
+    tempSeries.push({ key: 'ambient', label: '970 Pro SSD', values: ambient, color: 'var(--alert)' });
+  }
+  sensorMeta.forEach((sensor, index) => {
+    const key = `sensor_${sensor.id}`;
+    const values = series[key] || [];
+    if (values.length < 2) {
       return;
     }
-    const payload = await response.json();
-    const series = payload.series || {};
-    const sensorMeta = payload.sensors || [];
-    const sensorNameMap = new Map(sensorMeta.map((sensor) => [String(sensor.id), sensor.name]));
-    const cpu = series.cpu || [];
-    const ambient = series.ambient || [];
-    const tempSeries = [];
-    if (cpu.length > 1) {
-      tempSeries.push({ key: 'cpu', label: 'CPU', values: cpu, color: 'var(--accent)' });
-    }
-    if (ambient.length > 1) {
-      tempSeries.push({ key: 'ambient', label: '970 Pro SSD', values: ambient, color: 'var(--alert)' });
-    }
-    sensorMeta.forEach((sensor, index) => {
-      const key = `sensor_${sensor.id}`;
-      const values = series[key] || [];
-      if (values.length < 2) {
-        return;
-      }
-      const label = sensorNameMap.get(String(sensor.id)) || `Sensor ${sensor.id}`;
-      const color = tempPalette[index % tempPalette.length];
-      tempSeries.push({ key, label, values, color });
-    });
-    if (!tempSeries.length) {
+    const label = sensorNameMap.get(String(sensor.id)) || `Sensor ${sensor.id}`;
+    const color = tempPalette[index % tempPalette.length];
+    tempSeries.push({ key, label, values, color });
+  });
+  if (!tempSeries.length) {
+    return;
+  }
+  const allTemps = tempSeries.flatMap((item) => item.values);
+  const min = Math.min(...allTemps);
+  const max = Math.max(...allTemps);
+  const padding = Math.max((max - min) * 0.1, 0.5);
+  const rangeMin = min - padding;
+  const rangeMax = max + padding;
+  drawGrid(rangeMin, rangeMax);
+  const lines = Array.from(document.querySelectorAll('[data-temp-line]'));
+  lines.forEach((line) => {
+    const key = line.getAttribute('data-temp-line');
+    if (!key) {
       return;
     }
-    const allTemps = tempSeries.flatMap((item) => item.values);
-    const min = Math.min(...allTemps);
-    const max = Math.max(...allTemps);
-    const padding = Math.max((max - min) * 0.1, 0.5);
-    const rangeMin = min - padding;
-    const rangeMax = max + padding;
-    drawGrid(rangeMin, rangeMax);
-    const lines = Array.from(document.querySelectorAll('[data-temp-line]'));
-    lines.forEach((line) => {
-      const key = line.getAttribute('data-temp-line');
-      if (!key) {
-        return;
-      }
-      const match = tempSeries.find((item) => item.key === key);
-      if (!match) {
-        line.setAttribute('points', '');
-        return;
-      }
-      line.setAttribute('points', buildPoints(match.values, rangeMin, rangeMax));
-      if (match.color) {
-        line.setAttribute('stroke', match.color);
-      }
-    });
-    applyTempPalette(tempSeries);
-    updateTempLegend(tempSeries);
-    latestTempSeries = tempSeries;
-    latestTempLabels = payload.labels || [];
-  } catch (error) {
-    // Ignore transient fetch failures.
-  }
+    const match = tempSeries.find((item) => item.key === key);
+    if (!match) {
+      line.setAttribute('points', '');
+      return;
+    }
+    line.setAttribute('points', buildPoints(match.values, rangeMin, rangeMax));
+    if (match.color) {
+      line.setAttribute('stroke', match.color);
+    }
+  });
+  applyTempPalette(tempSeries);
+  latestTempSeries = tempSeries;
 };
 
 const drawGrid = (min, max) => {
@@ -348,127 +342,129 @@ const drawFanGrid = () => {
   fanLabels.innerHTML = labelEls.join('');
 };
 
-const refreshFanChart = async () => {
-  try {
-    const response = await fetch('/api/fans/percent?limit=24', { cache: 'no-store' });
-    if (!response.ok) {
+const renderFanChart = () => {
+  const series = latestFanSeries;
+  const fanLines = Array.from(document.querySelectorAll('[id^="fan-"][id$="-line"]'));
+  fanLines.forEach((line) => {
+    const id = line.getAttribute('id');
+    const key = id ? id.replace('-', '_').replace('-line', '') : '';
+    const values = series[key];
+    if (!values || values.length < 2) {
+      line.setAttribute('points', '');
       return;
     }
-    const data = await response.json();
-    const series = data.series || {};
-    latestFanSeries = series;
-    const fanLines = Array.from(document.querySelectorAll('[id^="fan-"][id$="-line"]'));
-    fanLines.forEach((line) => {
-      const id = line.getAttribute('id');
-      const key = id ? id.replace('-', '_').replace('-line', '') : '';
-      const values = series[key];
-      if (!values || values.length < 2) {
-        line.setAttribute('points', '');
-        return;
-      }
-      line.setAttribute('points', buildPoints(values, 0, 100));
-    });
+    line.setAttribute('points', buildPoints(values, 0, 100));
+  });
 
-    const cpuLine = document.getElementById('cpu-fan-line');
-    if (cpuLine) {
-      const cpuSeries = series.cpu_fan;
-      if (cpuSeries && cpuSeries.length > 1) {
-        cpuLine.setAttribute('points', buildPoints(cpuSeries, 0, 100));
-      }
+  const cpuLine = document.getElementById('cpu-fan-line');
+  if (cpuLine) {
+    const cpuSeries = series.cpu_fan;
+    if (cpuSeries && cpuSeries.length > 1) {
+      cpuLine.setAttribute('points', buildPoints(cpuSeries, 0, 100));
     }
-    const pumpLine = document.getElementById('pump-line');
-    if (pumpLine) {
-      const pumpSeries = series.pump;
-      if (pumpSeries && pumpSeries.length > 1) {
-        pumpLine.setAttribute('points', buildPoints(pumpSeries, 0, 100));
-      }
+  }
+  const pumpLine = document.getElementById('pump-line');
+  if (pumpLine) {
+    const pumpSeries = series.pump;
+    if (pumpSeries && pumpSeries.length > 1) {
+      pumpLine.setAttribute('points', buildPoints(pumpSeries, 0, 100));
     }
-  } catch (error) {
-    // Ignore transient fetch failures.
   }
 };
 
-const refreshFanTiles = async () => {
-  if (!fanTiles.length) {
-    return;
-  }
-  try {
-    const response = await fetch('/api/fans/latest', { cache: 'no-store' });
-    if (!response.ok) {
+const applyFanTiles = (rpmMap) => {
+  fanTiles.forEach((tile) => {
+    const channel = tile.getAttribute('data-fan-channel');
+    const valueEl = tile.querySelector('.fan-tile__value');
+    const subEl = tile.querySelector('.fan-tile__sub');
+    if (!channel || !valueEl || !subEl) {
       return;
     }
-    const data = await response.json();
-    const readings = data.fans || [];
-    const rpmMap = new Map(readings.map((row) => [String(row.channel_index), row.rpm]));
-    fanTiles.forEach((tile) => {
-      const channel = tile.getAttribute('data-fan-channel');
-      const valueEl = tile.querySelector('.fan-tile__value');
-      const subEl = tile.querySelector('.fan-tile__sub');
-      if (!channel || !valueEl || !subEl) {
-        return;
-      }
-      const rpm = rpmMap.get(channel);
-      if (rpm === undefined) {
-        valueEl.textContent = '-- RPM';
-        subEl.textContent = 'Awaiting live feed';
-        return;
-      }
-      valueEl.textContent = `${rpm} RPM`;
-      subEl.textContent = 'Live fan RPM';
-    });
-  } catch (error) {
-    // Ignore transient fetch failures.
-  }
+    const rpm = rpmMap.get(channel);
+    if (rpm === undefined) {
+      valueEl.textContent = '-- RPM';
+      subEl.textContent = 'Awaiting live feed';
+      return;
+    }
+    valueEl.textContent = `${rpm} RPM`;
+    subEl.textContent = 'Live fan RPM';
+  });
 };
 
-const refreshSensors = async () => {
-  if (!sensorTiles.length) {
-    return;
-  }
-  try {
-    const response = await fetch('/api/sensors/latest', { cache: 'no-store' });
-    if (!response.ok) {
+const applySensorTiles = (valueMap) => {
+  sensorTiles.forEach((tile) => {
+    const sensorId = tile.getAttribute('data-sensor-id');
+    const valueEl = tile.querySelector('.fan-tile__value');
+    if (!sensorId || !valueEl || !valueMap.has(sensorId)) {
       return;
     }
-    const data = await response.json();
-    const readings = data.sensors || [];
-    const valueMap = new Map(readings.map((row) => [String(row.id), row.value]));
-    sensorTiles.forEach((tile) => {
-      const sensorId = tile.getAttribute('data-sensor-id');
-      const valueEl = tile.querySelector('.fan-tile__value');
-      if (!sensorId || !valueEl) {
-        return;
-      }
-      const value = valueMap.get(sensorId);
-      valueEl.textContent = value ?? '--';
-    });
-  } catch (error) {
-    // Ignore transient fetch failures.
-  }
+    valueEl.textContent = valueMap.get(sensorId) ?? '--';
+  });
 };
 
-const refreshWifi = async () => {
+const applyWifi = (wifi) => {
   if (!wifiValue || !wifiSub || !wifiGauge) {
     return;
   }
+  if (wifi.percent === null || wifi.percent === undefined) {
+    wifiValue.textContent = '--';
+    wifiSub.textContent = 'unknown';
+    wifiGauge.style.setProperty('--wifi-percent', 0);
+    return;
+  }
+  const percent = Math.max(0, Math.min(100, wifi.percent));
+  wifiValue.textContent = `${percent}%`;
+  const dbm = wifi.signal_dbm !== null && wifi.signal_dbm !== undefined ? `${wifi.signal_dbm} dBm · ` : '';
+  wifiSub.textContent = `${dbm}${wifi.label || ''}`.trim();
+  wifiGauge.style.setProperty('--wifi-percent', percent);
+};
+
+const applyStatus = (status) => {
+  applyWifi(status.wifi || {});
+  if (liquidctlStatus && status.liquidctl) {
+    liquidctlStatus.textContent = status.liquidctl;
+  }
+};
+
+const applySnapshot = (data) => {
+  applyMetrics(data.metrics || {});
+  const rpmMap = new Map();
+  (data.fans || []).forEach((fan) => {
+    if (fan.rpm !== null) {
+      rpmMap.set(String(fan.channel_index), fan.rpm);
+    }
+  });
+  applyFanTiles(rpmMap);
+  applySensorTiles(
+    new Map(
+      (data.sensors || []).map((sensor) => [
+        String(sensor.id),
+        sensor.temp_c === null ? null : formatSensorTemp(sensor.temp_c, sensor.unit),
+      ])
+    )
+  );
+  applyStatus(data);
+  const temperature = data.temperature || {};
+  tempHistory = temperature.series || {};
+  tempSensors = temperature.sensors || [];
+  latestTempLabels = temperature.labels || [];
+  renderTrend();
+  latestFanSeries = (data.fan_percent || {}).series || {};
+  renderFanChart();
+};
+
+const refreshSnapshot = async () => {
   try {
-    const response = await fetch('/api/admin/status', { cache: 'no-store' });
+    const response = await fetch('/api/dashboard/snapshot', { cache: 'no-cache' });
     if (!response.ok) {
       return;
     }
     const data = await response.json();
-    const wifi = data.wifi || {};
-    if (wifi.percent === null || wifi.percent === undefined) {
-      wifiValue.textContent = '--';
-      wifiSub.textContent = 'unknown';
-      wifiGauge.style.setProperty('--wifi-percent', 0);
+    if (data.version === snapshotVersion) {
       return;
     }
-    const percent = Math.max(0, Math.min(100, wifi.percent));
-    wifiValue.textContent = `${percent}%`;
-    const dbm = wifi.signal_dbm !== null && wifi.signal_dbm !== undefined ? `${wifi.signal_dbm} dBm · ` : '';
-    wifiSub.textContent = `${dbm}${wifi.label || ''}`.trim();
-    wifiGauge.style.setProperty('--wifi-percent', percent);
+    snapshotVersion = data.version;
+    applySnapshot(data);
   } catch (error) {
     // Ignore transient fetch failures.
   }
@@ -677,6 +673,85 @@ const updateLegends = () => {
   }
 };
 
+const fanPercent = (rpm, maxRpm) => Math.min((rpm / maxRpm) * 100, 100);
+
+const formatSensorTemp = (tempC, unit) => {
+  if ((unit || '').toUpperCase() === 'F') {
+    return `${((tempC * 9) / 5 + 32).toFixed(1)}°F`;
+  }
+  return `${tempC.toFixed(1)}°C`;
+};
+
+const applyLiveValues = () => {
+  const metrics = {};
+  ['cpu_temp', 'ambient_temp', 'pump_percent'].forEach((key) => {
+    if (key in liveValues) {
+      metrics[key] = liveValues[key];
+    }
+  });
+  if ('cpu_fan_rpm' in liveValues) {
+    metrics.cpu_fan_percent = Math.max(0, Math.min(100, Math.round(fanPercent(liveValues.cpu_fan_rpm, CPU_FAN_MAX_RPM))));
+  }
+  applyMetrics(metrics);
+  const rpmMap = new Map();
+  fanTiles.forEach((tile) => {
+    const channel = tile.getAttribute('data-fan-channel');
+    const rpm = liveValues[`fan_${channel}_rpm`];
+    if (rpm !== undefined) {
+      rpmMap.set(channel, rpm);
+    }
+  });
+  applyFanTiles(rpmMap);
+  const valueMap = new Map();
+  sensorTiles.forEach((tile) => {
+    const sensorId = tile.getAttribute('data-sensor-id');
+    const tempC = liveValues[`sensor_${sensorId}`];
+    if (tempC !== undefined) {
+      valueMap.set(sensorId, formatSensorTemp(tempC, tile.getAttribute('data-sensor-unit')));
+    }
+  });
+  applySensorTiles(valueMap);
+};
+
+const pushHistory = (history, key, value) => {
+  const values = history[key] || [];
+  values.push(value);
+  history[key] = values.slice(-HISTORY_LIMIT);
+};
+
+const appendHistory = (values) => {
+  let tempChanged = false;
+  let fanChanged = false;
+  Object.entries(values).forEach(([key, value]) => {
+    if (key === 'cpu_temp' || key === 'ambient_temp') {
+      pushHistory(tempHistory, key.replace('_temp', ''), value);
+      tempChanged = true;
+    } else if (key.startsWith('sensor_')) {
+      pushHistory(tempHistory, key, value);
+      tempChanged = true;
+    } else if (key === 'cpu_fan_rpm') {
+      pushHistory(latestFanSeries, 'cpu_fan', fanPercent(value, CPU_FAN_MAX_RPM));
+      fanChanged = true;
+    } else if (key === 'pump_percent') {
+      pushHistory(latestFanSeries, 'pump', value);
+      fanChanged = true;
+    } else {
+      const match = key.match(/^fan_(\d+)_rpm$/);
+      const maxRpm = match ? fanMaxRpm.get(match[1]) : null;
+      if (maxRpm) {
+        pushHistory(latestFanSeries, `fan_${match[1]}`, fanPercent(value, maxRpm));
+        fanChanged = true;
+      }
+    }
+  });
+  if (tempChanged) {
+    renderTrend();
+  }
+  if (fanChanged) {
+    renderFanChart();
+  }
+};
+
 const attachTooltip = (chart, tooltipEl, getSeries, unit) => {
   if (!chart || !tooltipEl) {
     return;
@@ -715,12 +790,6 @@ applyFanPalette();
 applyTempPalette([]);
 drawFanGrid();
 updateLegends();
-refreshMetrics();
-refreshTrend();
-refreshFanChart();
-refreshFanTiles();
-refreshSensors();
-refreshWifi();
 attachTooltip(
   tempChart,
   tempTooltip,
@@ -755,12 +824,30 @@ attachTooltip(
   },
   '%'
 );
-setInterval(() => {
-  refreshMetrics();
-  refreshTrend();
-  refreshFanChart();
-  refreshFanTiles();
-  refreshSensors();
-  refreshWifi();
-  updateLegends();
-}, 2000);
+
+document.addEventListener('hydrox:snapshot', (event) => {
+  Object.keys(liveValues).forEach((key) => delete liveValues[key]);
+  Object.assign(liveValues, event.detail.values || {});
+  applyLiveValues();
+  if (event.detail.status) {
+    applyStatus(event.detail.status);
+  }
+  refreshSnapshot();
+});
+
+document.addEventListener('hydrox:delta', (event) => {
+  const values = event.detail.values || {};
+  Object.assign(liveValues, values);
+  applyLiveValues();
+  appendHistory(values);
+});
+
+document.addEventListener('hydrox:status', (event) => {
+  applyStatus(event.detail);
+});
+
+document.addEventListener('hydrox:stream-closed', () => {
+  setInterval(refreshSnapshot, 10000);
+});
+
+refreshSnapshot();
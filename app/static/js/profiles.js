@@ -0,0 +1,113 @@
+const replayForm = document.querySelector("[data-replay-form]");
+const replayState = document.querySelector("[data-replay-state]");
+const replayError = document.querySelector("[data-replay-error]");
+const replaySummary = document.querySelector("[data-replay-summary]");
+const replayTable = document.querySelector("[data-replay-table]");
+const replayRows = document.querySelector("[data-replay-rows]");
+
+const toLocalInput = (date) => {
+  const pad = (value) => String(value).padStart(2, "0");
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}T${pad(date.getHours())}:${pad(date.getMinutes())}`;
+};
+
+const formatPercent = (fraction) => `${(fraction * 100).toFixed(1)}%`;
+
+const formatHours = (seconds) => `${(seconds / 3600).toFixed(1)} h`;
+
+const showReplayError = (message) => {
+  if (!replayError) {
+    return;
+  }
+  replayError.textContent = message || "";
+  replayError.hidden = !message;
+};
+
+const replayRow = (cells) => {
+  const row = document.createElement("tr");
+  cells.forEach((value) => {
+    const cell = document.createElement("td");
+    cell.textContent = String(value);
+    row.appendChild(cell);
+  });
+  return row;
+};
+
+const renderReplay = (result) => {
+  const inputs = Object.entries(result.inputs || {})
+    .map(([key, coverage]) => `${key} ${formatPercent(coverage)}`)
+    .join(" · ");
+  replaySummary.textContent = `${result.profile_name}: ${result.start} → ${result.end}, ${result.samples} samples in ${result.elapsed_seconds}s · inputs ${inputs || "none"}`;
+  replayRows.replaceChildren(
+    ...(result.fans || []).map((fan) => {
+      if (!fan.duty) {
+        const row = replayRow([fan.name, "No input history in range"]);
+        row.lastElementChild.colSpan = 8;
+        return row;
+      }
+      const above = Object.fromEntries(fan.above.map((item) => [item.threshold, item]));
+      const rpm = fan.rpm ? `${fan.rpm.mean} / ${fan.rpm.max}` : "--";
+      return replayRow([
+        fan.name,
+        formatPercent(fan.coverage),
+        `${fan.duty.mean}%`,
+        `${fan.duty.p95}%`,
+        `${fan.duty.max}%`,
+        above[50] ? formatHours(above[50].seconds) : "--",
+        above[80] ? formatHours(above[80].seconds) : "--",
+        fan.changes,
+        rpm,
+      ]);
+    }),
+  );
+  replayTable.hidden = false;
+};
+
+const pollReplay = async (jobId) => {
+  try {
+    const response = await fetch(`/api/replay/${jobId}`);
+    const data = await response.json();
+    if (!response.ok || data.state === "error") {
+      replayState.textContent = "Failed";
+      showReplayError(data.error || "Replay failed.");
+      return;
+    }
+    if (data.state === "running") {
+      replayState.textContent = `Running ${data.elapsed_seconds}s`;
+      setTimeout(() => pollReplay(jobId), 1000);
+      return;
+    }
+    replayState.textContent = "Done";
+    renderReplay(data.result);
+  } catch (err) {
+    setTimeout(() => pollReplay(jobId), 2000);
+  }
+};
+
+if (replayForm) {
+  const now = new Date();
+  const start = replayForm.querySelector("[data-replay-start]");
+  const end = replayForm.querySelector("[data-replay-end]");
+  if (start && !start.value) {
+    start.value = toLocalInput(new Date(now.getTime() - 7 * 86400 * 1000));
+  }
+  if (end && !end.value) {
+    end.value = toLocalInput(now);
+  }
+  replayForm.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    showReplayError("");
+    replayState.textContent = "Queued";
+    try {
+      const response = await fetch("/api/replay", { method: "POST", body: new FormData(replayForm) });
+      const data = await response.json();
+      if (!response.ok || !data.ok) {
+        replayState.textContent = "Failed";
+        showReplayError(data.error || "Replay failed.");
+        return;
+      }
+      pollReplay(data.job_id);
+    } catch (err) {
+      replayState.textContent = "Failed";
+    }
+  });
+}
@@ -1,6 +1,7 @@
 const chainForms = document.querySelectorAll('[data-chain-form]');
 const chainLists = document.querySelectorAll('[data-chain-list]');
 const libraryCards = document.querySelectorAll('[data-screen-card]');
+const livePreviews = document.querySelectorAll('[data-oled-preview]');
 
 const dragState = {
   screenId: null,
@@ -165,3 +166,24 @@ document.addEventListener('dragend', () => {
   dragState.draggedItem = null;
   dragState.sourceType = null;
 });
+
+const refreshLivePreviews = () => {
+  livePreviews.forEach((image) => {
+    const source = image.getAttribute('src').split('?')[0];
+    image.setAttribute('src', `${source}?t=${Date.now()}`);
+  });
+};
+
+livePreviews.forEach((image) => {
+  image.addEventListener('load', () => {
+    image.hidden = false;
+  });
+  image.addEventListener('error', () => {
+    image.hidden = true;
+  });
+});
+
+if (livePreviews.length) {
+  refreshLivePreviews();
+  setInterval(refreshLivePreviews, 5000);
+}
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.harness import prepare_environment
+
+DEFAULT_CACHE_DIR = ".bench-cache"
+DEFAULT_RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Hydrox microbenchmarks for the sampler, storage, OLED and API hot paths.",
+    )
+    parser.add_argument("--groups", default="all", help="Comma-separated groups to run (default: all).")
+    parser.add_argument("--sizes", default="day,month,year", help="Synthetic history sizes for query benchmarks.")
+    parser.add_argument("--interval", type=int, default=5, help="Synthetic sample interval in seconds.")
+    parser.add_argument("--fans", type=int, default=3, help="Fan channels in the synthetic datasets.")
+    parser.add_argument("--sensors", type=int, default=2, help="DS18B20 sensors in the synthetic datasets.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Where synthetic datasets are cached.")
+    parser.add_argument("--work-dir", default=None, help="Scratch directory for temporary databases.")
+    parser.add_argument("--query-budget", type=float, default=2.0, help="Seconds spent per query case.")
+    parser.add_argument(
+        "--max-materialized-rows",
+        type=int,
+        default=2_000_000,
+        help="Skip queries that fetch a whole table when it holds more rows than this.",
+    )
+    parser.add_argument("--output", default=None, help="Result JSON path (default: benchmarks/results/<commit>.json).")
+    parser.add_argument("--compare", default=None, help="Baseline result JSON to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed median slowdown ratio (0.25 = 25%%).")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore slowdowns smaller than this.")
+    args = parser.parse_args(argv)
+    args.sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    args.work_dir = prepare_environment(args.work_dir)
+
+    from benchmarks.compare import compare_results, has_regressions, load_results, print_comparison
+    from benchmarks.harness import run_case, run_metadata
+    from benchmarks.suites import CASE_BUILDERS, GROUPS
+
+    groups = GROUPS if args.groups == "all" else [group.strip() for group in args.groups.split(",")]
+    unknown = [group for group in groups if group not in CASE_BUILDERS]
+    if unknown:
+        print(f"unknown benchmark groups: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    meta = run_metadata()
+    meta["options"] = {
+        "sizes": args.sizes,
+        "interval": args.interval,
+        "fans": args.fans,
+        "sensors": args.sensors,
+    }
+    results: dict[str, dict] = {}
+    started = time.perf_counter()
+    for group in groups:
+        for case in CASE_BUILDERS[group](args):
+            result = run_case(case)
+            results[case.name] = result
+            if "skipped" in result:
+                print(f"{case.name:<48} skipped: {result['skipped']}", flush=True)
+            else:
+                print(
+                    f"{case.name:<48} median {result['median_ms']:>10.3f} ms  p95 {result['p95_ms']:>10.3f} ms"
+                    f"  ({result['runs']} runs)",
+                    flush=True,
+                )
+    meta["duration_seconds"] = round(time.perf_counter() - started, 2)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{meta['commit'][:12]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    payload = {"meta": meta, "results": results}
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+    print(f"wrote {output}")
+
+    if args.compare:
+        rows = compare_results(load_results(args.compare), payload, args.threshold, args.min_delta_ms)
+        print_comparison(rows)
+        if has_regressions(rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import argparse
+import json
+import sys
+
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 0.05
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[dict]:
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in sorted(current.get("results", {}).items()):
+        base = base_results.get(name)
+        if not base or "median_ms" not in base or "median_ms" not in result:
+            continue
+        base_ms = base["median_ms"]
+        new_ms = result["median_ms"]
+        ratio = new_ms / base_ms if base_ms > 0 else None
+        delta_ms = new_ms - base_ms
+        if ratio is None:
+            status = "new"
+        elif ratio > 1 + threshold and delta_ms > min_delta_ms:
+            status = "regression"
+        elif ratio < 1 - threshold and -delta_ms > min_delta_ms:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": base_ms,
+                "current_ms": new_ms,
+                "ratio": round(ratio, 3) if ratio is not None else None,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def print_comparison(rows: list[dict], stream=sys.stdout) -> None:
+    width = max([len(row["name"]) for row in rows] + [4])
+    print(f"{'case':<{width}}  {'base ms':>10}  {'new ms':>10}  {'ratio':>7}  status", file=stream)
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "--"
+        print(
+            f"{row['name']:<{width}}  {row['baseline_ms']:>10.3f}  {row['current_ms']:>10.3f}  {ratio:>7}  {row['status']}",
+            file=stream,
+        )
+
+
+def has_regressions(rows: list[dict]) -> bool:
+    return any(row["status"] == "regression" for row in rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two Hydrox benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args(argv)
+    rows = compare_results(
+        load_results(args.baseline), load_results(args.current), args.threshold, args.min_delta_ms
+    )
+    print_comparison(rows)
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
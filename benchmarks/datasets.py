@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import time
+
+from benchmarks.harness import use_database
+
+DATASET_VERSION = 2
+DATASET_SECONDS = {
+    "day": 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+
+def dataset_path(cache_dir: str, size: str, interval: int, fans: int, sensors: int) -> str:
+    name = f"{size}-{interval}s-{fans}f-{sensors}s-v{DATASET_VERSION}.db"
+    return os.path.join(cache_dir, name)
+
+
+def ensure_dataset(cache_dir: str, size: str, interval: int, fans: int, sensors: int) -> tuple[str, int]:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = dataset_path(cache_dir, size, interval, fans, sensors)
+    samples = DATASET_SECONDS[size] // interval
+    if not os.path.exists(path):
+        tmp_path = f"{path}.building"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"building {size} dataset ({samples} samples per series) at {path}", flush=True)
+        started = time.perf_counter()
+        _build(tmp_path, samples, interval, fans, sensors)
+        os.replace(tmp_path, path)
+        print(f"built {size} dataset in {time.perf_counter() - started:.1f}s", flush=True)
+    return path, samples
+
+
+def empty_database(path: str) -> str:
+    from app.db import init_db
+    from app.services.fans import seed_fans_if_empty
+    from app.services.sensors import seed_sensors_if_empty
+    from app.services.settings import seed_settings_if_empty
+
+    if os.path.exists(path):
+        os.remove(path)
+    use_database(path)
+    init_db()
+    seed_settings_if_empty()
+    seed_fans_if_empty()
+    seed_sensors_if_empty()
+    return path
+
+
+def _build(path: str, samples: int, interval: int, fans: int, sensors: int) -> None:
+    from app.db import init_db
+    from app.services.fans import seed_fans_if_empty
+    from app.services.settings import set_fan_count, seed_settings_if_empty
+
+    use_database(path)
+    init_db()
+    seed_settings_if_empty()
+    set_fan_count(fans)
+    seed_fans_if_empty()
+    start = int(time.time()) - samples * interval
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("UPDATE fan_channels SET max_rpm = 1800")
+        for index in range(1, sensors + 1):
+            conn.execute(
+                """
+                INSERT INTO sensors (kind, source_id, name, default_name, unit)
+                VALUES ('ds18b20', ?, ?, ?, 'C')
+                """,
+                (f"28-bench{index:06d}", f"Rack {index}", f"DS18B20 28-bench{index:06d}"),
+            )
+        sensor_ids = [row[0] for row in conn.execute("SELECT id FROM sensors ORDER BY id")]
+        seq = "WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < :last)"
+        stamp = "strftime('%Y-%m-%d %H:%M:%S', :start + n * :interval, 'unixepoch')"
+        params = {"last": samples - 1, "start": start, "interval": interval}
+        conn.execute(
+            f"""
+            {seq}
+            INSERT INTO metrics (cpu_temp, ambient_temp, fan_rpm, pump_percent, created_at)
+            SELECT 40.0 + (n % 600) / 100.0, 35.0 + (n % 300) / 100.0, 900 + n % 50, 40, {stamp}
+            FROM seq
+            """,
+            params,
+        )
+        conn.execute(
+            f"""
+            {seq}
+            INSERT INTO cpu_fan_readings (rpm, created_at)
+            SELECT (n / 720) % 2 * 2400, {stamp}
+            FROM seq
+            """,
+            params,
+        )
+        for channel in range(1, fans + 1):
+            conn.execute(
+                f"""
+                {seq}
+                INSERT INTO fan_readings (channel_index, rpm, created_at)
+                SELECT :channel, 800 + (n * :channel) % 40, {stamp}
+                FROM seq
+                """,
+                {**params, "channel": channel},
+            )
+        for sensor_id in sensor_ids:
+            conn.execute(
+                f"""
+                {seq}
+                INSERT INTO sensor_readings (sensor_id, temp_c, created_at)
+                SELECT :sensor_id, 13.0 + ((n / 360) % 8) * 0.0625, {stamp}
+                FROM seq
+                """,
+                {**params, "sensor_id": sensor_id},
+            )
+        conn.commit()
+    finally:
+        conn.close()
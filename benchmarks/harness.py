@@ -0,0 +1,98 @@
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+BENCH_ENV_DEFAULTS = {
+    "HYDROX_HARDWARE": "sim",
+    "HYDROX_SIM_LIQUIDCTL_LATENCY_MS": "0",
+    "HYDROX_SIM_COMMAND_LATENCY_MS": "0",
+    "HYDROX_SIM_W1_DELAY_MS": "0",
+    "HYDROX_SIM_FANS": "3",
+    "HYDROX_SIM_DS18B20": "2",
+}
+
+
+@dataclass
+class BenchCase:
+    name: str
+    fn: Callable[[], object]
+    group: str
+    setup: Callable[[], None] | None = None
+    budget_seconds: float = 1.0
+    min_runs: int = 3
+    max_runs: int = 500
+    meta: dict = field(default_factory=dict)
+    skip_reason: str | None = None
+
+
+def prepare_environment(work_dir: str | None = None) -> str:
+    work_dir = work_dir or tempfile.mkdtemp(prefix="hydrox-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+    for key, value in BENCH_ENV_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+    os.environ.setdefault("HYDROX_LOG_PATH", os.path.join(work_dir, "hydrox.log"))
+    os.environ.setdefault("HYDROX_DB_PATH", os.path.join(work_dir, "hydrox.db"))
+    return work_dir
+
+
+def use_database(path: str) -> None:
+    os.environ["HYDROX_DB_PATH"] = path
+
+
+def run_case(case: BenchCase) -> dict:
+    if case.skip_reason:
+        return {"group": case.group, "skipped": case.skip_reason, **case.meta}
+    if case.setup is not None:
+        case.setup()
+    case.fn()
+    durations: list[float] = []
+    started = time.perf_counter()
+    while len(durations) < case.max_runs:
+        begin = time.perf_counter()
+        case.fn()
+        durations.append(time.perf_counter() - begin)
+        if len(durations) >= case.min_runs and time.perf_counter() - started >= case.budget_seconds:
+            break
+    return summarize(durations, case.group, case.meta)
+
+
+def summarize(durations: list[float], group: str, meta: dict | None = None) -> dict:
+    ordered = sorted(durations)
+    median = statistics.median(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "group": group,
+        "runs": len(ordered),
+        "median_ms": round(median * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "ops_per_s": round(1 / median, 2) if median > 0 else None,
+        **(meta or {}),
+    }
+
+
+def run_metadata() -> dict:
+    return {
+        "commit": _git(["rev-parse", "HEAD"]),
+        "branch": _git(["rev-parse", "--abbrev-ref", "HEAD"]),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "hardware": os.getenv("HYDROX_HARDWARE", "real"),
+    }
+
+
+def _git(args: list[str]) -> str:
+    try:
+        result = subprocess.run(["git"] + args, capture_output=True, text=True, check=False)
+    except FileNotFoundError:
+        return "unknown"
+    return result.stdout.strip() or "unknown"
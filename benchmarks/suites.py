@@ -0,0 +1,231 @@
+import json
+import os
+
+from benchmarks.datasets import empty_database, ensure_dataset
+from benchmarks.harness import BenchCase, use_database
+
+GROUPS = ("parsing", "sampler", "storage", "queries", "oled", "api")
+
+API_ENDPOINTS = (
+    "/api/metrics/latest",
+    "/api/metrics/recent?limit=24",
+    "/api/temperature/recent?limit=24",
+    "/api/sensors/latest",
+    "/api/fans/percent?limit=24",
+    "/api/fans/latest",
+    "/api/dashboard/snapshot",
+    "/api/admin/status",
+    "/api/host/recent?limit=24",
+    "/api/calibration/status",
+)
+
+OLED_TEMPLATE = "CPU {{cpu_temp}} | Fan {{fan1_rpm}} ({{fan1_percent}}) | {{rack_1}}"
+
+
+def parsing_cases(options) -> list[BenchCase]:
+    from app.services.liquidctl import get_fan_rpms, get_liquid_temps
+
+    return [
+        BenchCase("parsing.get_fan_rpms", get_fan_rpms, "parsing"),
+        BenchCase("parsing.get_liquid_temps", get_liquid_temps, "parsing"),
+    ]
+
+
+def sampler_cases(options) -> list[BenchCase]:
+    from app.services import daemon
+
+    tick_db = os.path.join(options.work_dir, "sampler.db")
+
+    def setup() -> None:
+        empty_database(tick_db)
+
+    return [
+        BenchCase("sampler.tick", lambda: daemon.run_sampler_tick(1), "sampler", setup=setup),
+        BenchCase("sampler.cpu_tick", daemon.cpu_tick, "sampler", setup=setup),
+        BenchCase("sampler.fan_tick", daemon.fan_tick, "sampler", setup=setup),
+        BenchCase("sampler.sensor_tick", lambda: daemon.sensor_tick(1), "sampler", setup=setup),
+        BenchCase("sampler.wifi_tick", daemon.wifi_tick, "sampler", setup=setup),
+        BenchCase("sampler.host_tick", daemon.host_tick, "sampler", setup=setup),
+    ]
+
+
+def storage_cases(options) -> list[BenchCase]:
+    from app.services.fan_metrics import insert_cpu_fan_reading, insert_fan_reading
+    from app.services.ingest import ingest_body
+    from app.services.metrics import insert_metrics
+    from app.services.sensors import insert_sensor_reading
+
+    insert_db = os.path.join(options.work_dir, "inserts.db")
+    ingest_lines = b"\n".join(
+        json.dumps({"series": f"rack_{index % 8}", "ts": None, "value": 12.5}).encode() for index in range(1000)
+    )
+
+    def setup() -> None:
+        empty_database(insert_db)
+
+    return [
+        BenchCase(
+            "storage.insert_metrics",
+            lambda: insert_metrics(42.0, 38.5, 950, 40),
+            "storage",
+            setup=setup,
+        ),
+        BenchCase(
+            "storage.insert_fan_reading",
+            lambda: insert_fan_reading(1, 950),
+            "storage",
+            setup=setup,
+        ),
+        BenchCase(
+            "storage.insert_cpu_fan_reading",
+            lambda: insert_cpu_fan_reading(2400),
+            "storage",
+            setup=setup,
+        ),
+        BenchCase(
+            "storage.insert_sensor_reading",
+            lambda: insert_sensor_reading(1, 13.0625),
+            "storage",
+            setup=setup,
+        ),
+        BenchCase(
+            "storage.ingest_1000_points",
+            lambda: ingest_body(ingest_lines, "ndjson"),
+            "storage",
+            setup=setup,
+        ),
+    ]
+
+
+def query_cases(options) -> list[BenchCase]:
+    from app.services.fan_metrics import latest_fan_readings, recent_cpu_fan_readings, recent_fan_readings
+    from app.services.metrics import latest_metrics, recent_metrics
+    from app.services.sensors import latest_sensor_readings, recent_sensor_readings
+
+    cases: list[BenchCase] = []
+    for size in options.sizes:
+        path, samples = ensure_dataset(options.cache_dir, size, options.interval, options.fans, options.sensors)
+        sensor_rows = samples * options.sensors
+        queries = [
+            ("latest_metrics", latest_metrics, samples, False),
+            ("recent_metrics", lambda: recent_metrics(limit=24), samples, False),
+            ("latest_fan_readings", latest_fan_readings, samples * options.fans, False),
+            ("recent_fan_readings", lambda: recent_fan_readings(24), samples * options.fans, False),
+            ("recent_cpu_fan_readings", lambda: recent_cpu_fan_readings(24), samples, False),
+            ("latest_sensor_readings", latest_sensor_readings, sensor_rows, False),
+            ("recent_sensor_readings", lambda: recent_sensor_readings(24), sensor_rows, True),
+        ]
+        for name, fn, rows, materializes in queries:
+            cases.append(
+                BenchCase(
+                    f"queries.{size}.{name}",
+                    fn,
+                    "queries",
+                    setup=lambda path=path: use_database(path),
+                    budget_seconds=options.query_budget,
+                    meta={"dataset": size, "rows": rows},
+                    skip_reason=(
+                        f"fetches all {rows} rows (limit {options.max_materialized_rows})"
+                        if materializes and rows > options.max_materialized_rows
+                        else None
+                    ),
+                )
+            )
+    return cases
+
+
+def oled_cases(options) -> list[BenchCase]:
+    from PIL import ImageDraw
+
+    from app.services.hardware import open_oled_device
+    from app.services.oled import I2C_BUS, OLED_ADDR, FrameRenderer, pack_pages, select_oled_channel
+    from app.services import telemetry
+    from app.services.oled_manager import PlaylistScreen, draw_screen
+    from app.services.oled_templates import ANY_SENSOR, build_token_values, compile_template, token_series
+
+    path, _ = ensure_dataset(options.cache_dir, "day", options.interval, options.fans, options.sensors)
+    use_database(path)
+    template = compile_template(OLED_TEMPLATE)
+    values = build_token_values()
+    select_oled_channel(5)
+    renderer = FrameRenderer(open_oled_device(I2C_BUS, OLED_ADDR))
+    frame = renderer.new_frame()
+    ImageDraw.Draw(frame).text((0, 24), template.render(values), fill=255)
+    renderer.render(frame)
+
+    screen = PlaylistScreen(
+        compile_template("{{cpu_temp}}"), template, "DejaVu Sans Mono", "DejaVu Sans Mono", 16, 12, 15
+    )
+    shifts = iter(range(1 << 62))
+
+    def render_changed() -> None:
+        renderer.render(renderer.new_frame())
+        renderer.render(frame)
+
+    def publish_live() -> None:
+        select_oled_channel(5)
+        telemetry.publish(
+            {
+                token_series(name): value.value
+                for name, value in values.items()
+                if value.kind != "percent" or name == "pump_percent"
+                if token_series(name) != ANY_SENSOR
+            }
+        )
+
+    def screen_frame() -> None:
+        values = build_token_values(screen.sources())
+        screen_image = renderer.new_frame()
+        draw_screen(screen_image, screen, screen.title.render(values), screen.value.render(values), (next(shifts) % 3, 0))
+        renderer.render(screen_image)
+
+    return [
+        BenchCase("oled.build_token_map", build_token_values, "oled", setup=lambda: use_database(path)),
+        BenchCase(
+            "oled.build_cpu_temp_tokens",
+            lambda: build_token_values(compile_template("{{cpu_temp}}").sources),
+            "oled",
+            setup=lambda: use_database(path),
+        ),
+        BenchCase("oled.compile_template", lambda: compile_template(OLED_TEMPLATE), "oled"),
+        BenchCase("oled.render_template", lambda: template.render(values), "oled"),
+        BenchCase("oled.pack_pages", lambda: pack_pages(frame), "oled"),
+        BenchCase("oled.render_unchanged", lambda: renderer.render(frame), "oled"),
+        BenchCase("oled.render_changed", render_changed, "oled", setup=lambda: select_oled_channel(5)),
+        BenchCase("oled.screen_frame", screen_frame, "oled", setup=publish_live),
+    ]
+
+
+def api_cases(options) -> list[BenchCase]:
+    from app.main import app
+    from benchmarks.asgi import ASGIClient
+
+    path, _ = ensure_dataset(options.cache_dir, "day", options.interval, options.fans, options.sensors)
+    client = ASGIClient(app)
+    cases = []
+    for endpoint in API_ENDPOINTS:
+        def call(endpoint=endpoint) -> None:
+            status, _, _ = client.get(endpoint)
+            if status != 200:
+                raise RuntimeError(f"{endpoint} returned {status}")
+
+        cases.append(
+            BenchCase(
+                f"api.{endpoint.split('?', 1)[0].removeprefix('/api/').replace('/', '.')}",
+                call,
+                "api",
+                setup=lambda: use_database(path),
+                meta={"dataset": "day"},
+            )
+        )
+    return cases
+
+
+CASE_BUILDERS = {
+    "parsing": parsing_cases,
+    "sampler": sampler_cases,
+    "storage": storage_cases,
+    "queries": query_cases,
+    "oled": oled_cases,
+    "api": api_cases,
+}
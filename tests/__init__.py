@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="hydrox-tests-")
+os.environ.setdefault("HYDROX_DB_PATH", os.path.join(_scratch, "hydrox.db"))
+os.environ.setdefault("HYDROX_LOG_PATH", os.path.join(_scratch, "hydrox.log"))
+os.environ.setdefault("HYDROX_HARDWARE", "sim")
@@ -0,0 +1,132 @@
+import unittest
+from unittest import mock
+
+from app.services.compression import (
+    DEFAULT_HEARTBEAT_SECONDS,
+    SAMPLE_SECONDS,
+    SeriesState,
+    _offer,
+    format_timestamp,
+    reconstruct,
+)
+
+START = 1_700_000_000.0
+
+
+class OfferDeadbandTest(unittest.TestCase):
+    def test_first_sample_is_inserted(self):
+        action, state, promoted = _offer(None, "deadband", START, (20.0,), (0.5,))
+        self.assertEqual(action, "insert")
+        self.assertEqual((state.anchor_at, state.anchor), (START, (20.0,)))
+        self.assertIsNone(promoted)
+
+    def test_sample_inside_band_becomes_pending(self):
+        _, state, _ = _offer(None, "deadband", START, (20.0,), (0.5,))
+        action, state, _ = _offer(state, "deadband", START + 5, (20.3,), (0.5,))
+        self.assertEqual(action, "insert")
+        self.assertEqual((state.anchor, state.pending_at, state.pending), ((20.0,), START + 5, (20.3,)))
+
+    def test_pending_row_is_updated_in_place(self):
+        state = SeriesState(START, (20.0,), pending_id=7, pending_at=START + 5, pending=(20.3,))
+        action, state, _ = _offer(state, "deadband", START + 10, (20.1,), (0.5,))
+        self.assertEqual(action, "update")
+        self.assertEqual((state.anchor_at, state.pending_at), (START, START + 10))
+
+    def test_sample_outside_band_moves_anchor(self):
+        state = SeriesState(START, (20.0,), pending_id=7, pending_at=START + 5, pending=(20.3,))
+        action, state, _ = _offer(state, "deadband", START + 10, (21.0,), (0.5,))
+        self.assertEqual(action, "update")
+        self.assertEqual((state.anchor_at, state.anchor, state.pending_id), (START + 10, (21.0,), None))
+
+    def test_heartbeat_moves_anchor(self):
+        _, state, _ = _offer(None, "deadband", START, (20.0,), (0.5,))
+        _, state, _ = _offer(state, "deadband", START + DEFAULT_HEARTBEAT_SECONDS, (20.0,), (0.5,))
+        self.assertEqual(state.anchor_at, START + DEFAULT_HEARTBEAT_SECONDS)
+
+    def test_none_to_value_leaves_band(self):
+        _, state, _ = _offer(None, "deadband", START, (None,), (0.5,))
+        _, state, _ = _offer(state, "deadband", START + 5, (20.0,), (0.5,))
+        self.assertEqual(state.anchor, (20.0,))
+
+    def test_out_of_order_sample_is_backfilled(self):
+        _, state, _ = _offer(None, "deadband", START, (20.0,), (0.5,))
+        action, next_state, _ = _offer(state, "deadband", START - 5, (25.0,), (0.5,))
+        self.assertEqual(action, "backfill")
+        self.assertIs(next_state, state)
+
+
+class OfferSwingingDoorTest(unittest.TestCase):
+    def offer(self, state, at, value):
+        action, state, promoted = _offer(state, "swinging_door", START + at, (value,), (0.5,))
+        if state.pending_at == START + at:
+            state.pending_id = 1
+        return action, state, promoted
+
+    def test_linear_ramp_stays_in_corridor(self):
+        _, state, _ = self.offer(None, 0, 20.0)
+        for step in range(1, 6):
+            action, state, _ = self.offer(state, step * 5, 20.0 + step)
+        self.assertEqual(action, "update")
+        self.assertEqual(state.anchor_at, START)
+        self.assertLessEqual(state.low[0], state.high[0])
+
+    def test_corner_promotes_fitted_pending(self):
+        _, state, _ = self.offer(None, 0, 20.0)
+        _, state, _ = self.offer(state, 5, 21.0)
+        _, state, _ = self.offer(state, 10, 22.0)
+        action, state, promoted = self.offer(state, 15, 15.0)
+        self.assertEqual(action, "promote")
+        self.assertEqual(promoted, (22.0,))
+        self.assertEqual((state.anchor_at, state.anchor), (START + 10, (22.0,)))
+        self.assertEqual((state.pending_at, state.pending), (START + 15, (15.0,)))
+
+    def test_second_sample_opens_corridor_as_new_row(self):
+        _, state, _ = _offer(None, "swinging_door", START, (20.0,), (0.5,))
+        action, state, promoted = _offer(state, "swinging_door", START + 5, (30.0,), (0.5,))
+        self.assertEqual(action, "insert")
+        self.assertIsNone(promoted)
+        self.assertEqual((state.anchor_at, state.pending), (START, (30.0,)))
+
+
+class ReconstructTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict("os.environ", {"HYDROX_COMPRESSION": "deadband"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def rows(self, *points):
+        return [{"created_at": format_timestamp(at), "value": value} for at, value in points]
+
+    def test_step_holds_previous_value(self):
+        rows = self.rows((START, 10), (START + 20, 30))
+        points = reconstruct(rows, ["value"], [START + 5, START + 20], linear=False)
+        self.assertEqual([point["value"] for point in points], [10, 30])
+
+    def test_linear_interpolates_and_keeps_ints(self):
+        rows = self.rows((START, 10), (START + 20, 30))
+        points = reconstruct(rows, ["value"], [START + 5, START + 10], linear=True)
+        self.assertEqual([point["value"] for point in points], [15, 20])
+        self.assertIsInstance(points[0]["value"], int)
+
+    def test_skips_times_before_first_row(self):
+        rows = self.rows((START, 10))
+        points = reconstruct(rows, ["value"], [START - 5, START], linear=False)
+        self.assertEqual([point["created_at"] for point in points], [format_timestamp(START)])
+
+    def test_skips_times_past_max_gap(self):
+        rows = self.rows((START, 10))
+        limit = DEFAULT_HEARTBEAT_SECONDS + 3 * SAMPLE_SECONDS
+        points = reconstruct(rows, ["value"], [START + limit, START + limit + SAMPLE_SECONDS], linear=False)
+        self.assertEqual(len(points), 1)
+
+    def test_none_values_are_not_interpolated(self):
+        rows = self.rows((START, None), (START + 20, 30))
+        points = reconstruct(rows, ["value"], [START + 10], linear=True)
+        self.assertIsNone(points[0]["value"])
+
+    def test_empty_rows(self):
+        self.assertEqual(reconstruct([], ["value"], [START], linear=True), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import unittest
+
+import numpy as np
+
+from app.services.control import compile_profile, pump_min_percent
+
+
+def compiled(curve, fans=(1, 2), pump_channel=None):
+    profile = {"id": 1, "name": "test", "curve_json": json.dumps(curve)}
+    return compile_profile(profile, [{"channel_index": channel} for channel in fans], pump_channel)
+
+
+RAMP = [{"temp": 30, "fan": 20}, {"temp": 70, "fan": 100}]
+
+
+class CompiledProfileDutiesTest(unittest.TestCase):
+    def test_interpolates_each_channel_on_its_own_curve(self):
+        profile = compiled({"fan_1": RAMP, "fan_2": [{"temp": 10, "fan": 40}, {"temp": 20, "fan": 60}]})
+        self.assertEqual(profile.evaluate({"cpu_temp": 50.0}), {1: 60, 2: 60})
+        self.assertEqual(profile.evaluate({"cpu_temp": 15.0}), {1: 20, 2: 50})
+
+    def test_clamps_outside_the_curve(self):
+        profile = compiled({"fan_1": RAMP})
+        self.assertEqual(profile.evaluate({"cpu_temp": 10.0}), {1: 20})
+        self.assertEqual(profile.evaluate({"cpu_temp": 95.0}), {1: 100})
+
+    def test_evaluates_many_rows_at_once(self):
+        profile = compiled({"fan_1": RAMP})
+        duties = profile.duties(np.array([[30.0], [50.0], [70.0]]))
+        self.assertEqual(duties[:, 0].tolist(), [20, 60, 100])
+
+    def test_missing_input_marks_channel_unavailable(self):
+        profile = compiled({"fan_1": RAMP, "fan_2": {"input": "ambient_temp", "points": RAMP}})
+        self.assertEqual(profile.duties(profile.readings({"cpu_temp": 50.0})).tolist(), [[60, -1]])
+        self.assertEqual(profile.evaluate({"cpu_temp": 50.0}), {1: 60})
+
+    def test_weighted_input_ignores_missing_members(self):
+        source = {"weighted": {"cpu_temp": 3, "ambient_temp": 1}}
+        profile = compiled({"fan_1": {"input": source, "points": RAMP}})
+        self.assertEqual(profile.evaluate({"cpu_temp": 60.0, "ambient_temp": 20.0}), {1: 60})
+        self.assertEqual(profile.evaluate({"ambient_temp": 50.0}), {1: 60})
+
+    def test_max_and_min_inputs(self):
+        profile = compiled(
+            {
+                "fan_1": {"input": {"max": ["cpu_temp", "ambient_temp"]}, "points": RAMP},
+                "fan_2": {"input": {"min": ["cpu_temp", "ambient_temp"]}, "points": RAMP},
+            }
+        )
+        self.assertEqual(profile.evaluate({"cpu_temp": 70.0, "ambient_temp": 30.0}), {1: 100, 2: 20})
+        self.assertEqual(profile.evaluate({"ambient_temp": 50.0}), {1: 60, 2: 60})
+
+    def test_pump_channel_keeps_its_floor(self):
+        profile = compiled({"fan_1": [{"temp": 30, "fan": 0}, {"temp": 70, "fan": 100}]}, fans=(1,), pump_channel=1)
+        self.assertEqual(profile.evaluate({"cpu_temp": 20.0}), {1: pump_min_percent()})
+
+    def test_inactive_channels_are_dropped(self):
+        profile = compiled({"fan_1": RAMP, "fan_3": RAMP}, fans=(1,))
+        self.assertEqual(profile.channels, (1,))
+
+
+if __name__ == "__main__":
+    unittest.main()
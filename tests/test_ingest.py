@@ -0,0 +1,72 @@
+import unittest
+
+from app.services.ingest import (
+    MAX_AGE_SECONDS,
+    MAX_FUTURE_SECONDS,
+    MAX_POINTS,
+    MAX_REPORTED_ERRORS,
+    IngestResult,
+    _validate,
+)
+
+NOW = 1_700_000_000.0
+
+
+def validate(items):
+    result = IngestResult()
+    return _validate(items, result, NOW), result
+
+
+class ValidateTest(unittest.TestCase):
+    def test_accepts_objects_and_triples(self):
+        points, result = validate([{"series": "probe.a", "ts": NOW - 5, "value": 1}, ["probe/b", NOW, 2.5]])
+        self.assertEqual(points, [(0, "probe.a", NOW - 5, 1.0), (1, "probe/b", NOW, 2.5)])
+        self.assertEqual(result.rejected, 0)
+
+    def test_missing_ts_uses_now(self):
+        points, _ = validate([{"series": "probe", "value": 3}, ["probe", None, 4]])
+        self.assertEqual([point[2] for point in points], [NOW, NOW])
+
+    def test_skips_placeholders_without_rejecting(self):
+        points, result = validate([None, ["probe", NOW, 1]])
+        self.assertEqual([point[0] for point in points], [1])
+        self.assertEqual(result.rejected, 0)
+
+    def test_rejects_bad_points_with_their_index(self):
+        items = [
+            "probe",
+            ["probe", NOW],
+            {"series": "", "ts": NOW, "value": 1},
+            {"series": "bad name", "ts": NOW, "value": 1},
+            {"series": "x" * 65, "ts": NOW, "value": 1},
+            {"series": 5, "ts": NOW, "value": 1},
+            ["probe", NOW, "1"],
+            ["probe", NOW, True],
+            ["probe", NOW, float("nan")],
+            ["probe", NOW, float("inf")],
+            ["probe", NOW, 10**400],
+            ["probe", "yesterday", 1],
+            ["probe", NOW + MAX_FUTURE_SECONDS + 1, 1],
+            ["probe", NOW - MAX_AGE_SECONDS - 1, 1],
+        ]
+        points, result = validate(items)
+        self.assertEqual(points, [])
+        self.assertEqual(result.rejected, len(items))
+        self.assertEqual([error["index"] for error in result.errors], list(range(len(items))))
+
+    def test_accepts_window_edges(self):
+        points, _ = validate([["probe", NOW + MAX_FUTURE_SECONDS, 1], ["probe", NOW - MAX_AGE_SECONDS, 1]])
+        self.assertEqual(len(points), 2)
+
+    def test_limits_reported_errors(self):
+        _, result = validate([["bad name", NOW, 1]] * 50)
+        self.assertEqual(result.rejected, 50)
+        self.assertEqual(len(result.errors), MAX_REPORTED_ERRORS)
+
+    def test_rejects_oversized_batches(self):
+        with self.assertRaises(ValueError):
+            validate([None] * (MAX_POINTS + 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from app.services.schedule import CRON_DAY_NAMES, MONTH_NAMES, _parse_cron_field, parse_cron
+
+
+def minutes(raw):
+    return _parse_cron_field(raw, "minute", 0, 59, {})
+
+
+class ParseCronFieldTest(unittest.TestCase):
+    def test_star_covers_the_range(self):
+        self.assertEqual(minutes("*"), set(range(60)))
+
+    def test_lists_ranges_and_steps(self):
+        self.assertEqual(minutes("5,10-12"), {5, 10, 11, 12})
+        self.assertEqual(minutes("*/15"), {0, 15, 30, 45})
+        self.assertEqual(minutes("10-20/5"), {10, 15, 20})
+
+    def test_stepped_value_runs_to_the_end(self):
+        self.assertEqual(minutes("50/5"), {50, 55})
+
+    def test_names(self):
+        self.assertEqual(_parse_cron_field("mon-fri", "day of week", 0, 7, CRON_DAY_NAMES), {1, 2, 3, 4, 5})
+        self.assertEqual(_parse_cron_field("JAN,dec", "month", 1, 12, MONTH_NAMES), {1, 12})
+
+    def test_rejects_invalid_fields(self):
+        for raw in ("", "1,,2", "5,", "/5", "60", "-1", "x", "20-10", "*/0", "*/x", "1-"):
+            with self.subTest(raw=raw):
+                with self.assertRaises(ValueError):
+                    minutes(raw)
+
+
+
+class ParseCronTest(unittest.TestCase):
+    def test_sunday_is_zero_or_seven(self):
+        self.assertEqual(parse_cron("0 8 * * 7").weekdays, frozenset({0}))
+        self.assertEqual(parse_cron("0 8 * * 0,7").weekdays, frozenset({0}))
+
+    def test_aliases(self):
+        spec = parse_cron("@daily")
+        self.assertEqual((spec.minutes, spec.hours), ((0,), (0,)))
+
+    def test_requires_five_fields(self):
+        with self.assertRaises(ValueError):
+            parse_cron("0 8 * *")
+
+
+if __name__ == "__main__":
+    unittest.main()